@@ -271,6 +271,14 @@ class ExportBVH(bpy.types.Operator, ExportHelper):
         description="Sort the children of each bone alphabetically",
         default=False,
     )
+    use_action_only: BoolProperty(
+        name="Action Only",
+        description=(
+            "Compute the pose from the armature's Action, instead of evaluating the scene for every frame. "
+            "Much faster for long animations, when nothing else (constraints, drivers, NLA) affects the pose"
+        ),
+        default=False,
+    )
 
     @classmethod
     def poll(cls, context):
@@ -363,6 +371,8 @@ class BVH_PT_export_animation(bpy.types.Panel):
         col.prop(operator, "frame_start", text="Frame Start")
         col.prop(operator, "frame_end", text="End")
 
+        layout.prop(operator, "use_action_only")
+
 
 def menu_func_import(self, context):
     self.layout.operator(ImportBVH.bl_idname, text="Motion Capture (.bvh)")
@@ -2,7 +2,213 @@
 #
 # SPDX-License-Identifier: GPL-2.0-or-later
 
-import bpy
+from math import pi
+
+import numpy as np
+from bpy_extras import anim_utils
+
+from .import_bvh import euler_to_matrices
+
+# The motion is computed for this many frames at once,
+# to limit the memory used for long animations.
+FRAME_CHUNK_SIZE = 1000
+
+# Indices of the axes (i, j, k) and parity, for each euler rotation order, see: `RotOrderInfo` in Blender.
+_EULER_ORDER_INFO = {
+    'XYZ': ((0, 1, 2), False),
+    'XZY': ((0, 2, 1), True),
+    'YXZ': ((1, 0, 2), True),
+    'YZX': ((1, 2, 0), False),
+    'ZXY': ((2, 0, 1), False),
+    'ZYX': ((2, 1, 0), True),
+}
+
+
+def _compatible_eulers(eulers, prev_eulers):
+    """Wrap the (bones, 3) euler rotations by 360 degrees to be closer to the previous ones, like Blender's
+    ``compatible_eul()``."""
+    eulers = eulers.copy()
+    deul = eulers - prev_eulers
+    eulers -= np.where(deul > pi, np.floor(deul / (2.0 * pi) + 0.5) * (2.0 * pi), 0.0)
+    eulers += np.where(deul < -pi, np.floor(-deul / (2.0 * pi) + 0.5) * (2.0 * pi), 0.0)
+    deul = eulers - prev_eulers
+
+    # An axis rotating more than 180 degrees while the others rotate less than 90 degrees.
+    for i, j, k in ((0, 1, 2), (1, 2, 0), (2, 0, 1)):
+        flip = (np.abs(deul[:, i]) > pi) & (np.abs(deul[:, j]) < pi / 2.0) & (np.abs(deul[:, k]) < pi / 2.0)
+        eulers[flip, i] -= np.copysign(2.0 * pi, deul[flip, i])
+    return eulers
+
+
+def _matrices_to_compatible_eulers(matrices, orders, prev_eulers):
+    """Convert (frames, bones, 3, 3) rotation matrices to euler rotations, like ``Matrix.to_euler(order, prev)``.
+
+    :arg orders: The euler rotation order for each bone.
+    :arg prev_eulers: The (bones, 3) euler rotations of the frame before the first one.
+    :return: The (frames, bones, 3) euler rotations, each one compatible with the one of the previous frame.
+    """
+    num_frames, num_bones = matrices.shape[:2]
+    bones = np.arange(num_bones)
+    axes = np.array([_EULER_ORDER_INFO[order][0] for order in orders]).T
+    parity = np.array([_EULER_ORDER_INFO[order][1] for order in orders])
+    i, j, k = axes
+
+    # Normalized and transposed, so that indexing matches Blender's column-major matrices.
+    mat = (matrices / np.linalg.norm(matrices, axis=-2, keepdims=True)).swapaxes(-1, -2)
+
+    # Both possible euler rotations for each matrix, see: `mat3_normalized_to_eulo2()`.
+    cy = np.hypot(mat[:, bones, i, i], mat[:, bones, i, j])
+    not_degenerate = cy > 0.0000375
+    eulers1 = np.empty((num_frames, num_bones, 3))
+    eulers2 = np.empty((num_frames, num_bones, 3))
+    eulers1[:, bones, i] = np.where(
+        not_degenerate,
+        np.arctan2(mat[:, bones, j, k], mat[:, bones, k, k]),
+        np.arctan2(-mat[:, bones, k, j], mat[:, bones, j, j]),
+    )
+    eulers1[:, bones, j] = np.arctan2(-mat[:, bones, i, k], cy)
+    eulers1[:, bones, k] = np.where(not_degenerate, np.arctan2(mat[:, bones, i, j], mat[:, bones, i, i]), 0.0)
+    eulers2[:, bones, i] = np.where(
+        not_degenerate,
+        np.arctan2(-mat[:, bones, j, k], -mat[:, bones, k, k]),
+        eulers1[:, bones, i],
+    )
+    eulers2[:, bones, j] = np.where(not_degenerate, np.arctan2(-mat[:, bones, i, k], -cy), eulers1[:, bones, j])
+    eulers2[:, bones, k] = np.where(
+        not_degenerate,
+        np.arctan2(-mat[:, bones, i, j], -mat[:, bones, i, i]),
+        eulers1[:, bones, k],
+    )
+    eulers1[:, parity] *= -1.0
+    eulers2[:, parity] *= -1.0
+
+    # Which of both is used depends on the previous frame, so this can only be done for one frame after the other.
+    eulers = np.empty((num_frames, num_bones, 3))
+    for frame_i in range(num_frames):
+        compat1 = _compatible_eulers(eulers1[frame_i], prev_eulers)
+        compat2 = _compatible_eulers(eulers2[frame_i], prev_eulers)
+        use_compat2 = np.abs(compat1 - prev_eulers).sum(axis=1) > np.abs(compat2 - prev_eulers).sum(axis=1)
+        eulers[frame_i] = prev_eulers = np.where(use_compat2[:, np.newaxis], compat2, compat1)
+    return eulers
+
+
+def _quaternions_to_matrices(quats):
+    """Convert (..., 4) quaternions to (..., 3, 3) rotation matrices, normalizing them first."""
+    length = np.linalg.norm(quats, axis=-1, keepdims=True)
+    # Quaternions without length don't rotate.
+    quats = np.where(length > 0.0, quats / np.where(length > 0.0, length, 1.0), (1.0, 0.0, 0.0, 0.0))
+    w, x, y, z = np.moveaxis(quats, -1, 0)
+    return np.stack((
+        1.0 - 2.0 * (y * y + z * z), 2.0 * (x * y - z * w), 2.0 * (x * z + y * w),
+        2.0 * (x * y + z * w), 1.0 - 2.0 * (x * x + z * z), 2.0 * (y * z - x * w),
+        2.0 * (x * z - y * w), 2.0 * (y * z + x * w), 1.0 - 2.0 * (x * x + y * y),
+    ), axis=-1).reshape(*quats.shape[:-1], 3, 3)
+
+
+def _action_only_unsupported_reason(obj):
+    """Return why the pose of the armature can't be computed from its own Action only, or None when it can."""
+    anim_data = obj.animation_data
+    if anim_data is None or anim_data.action is None:
+        return "it has no Action"
+    if anim_data.drivers:
+        return "it has drivers"
+    if anim_data.use_nla and any(not track.mute for track in anim_data.nla_tracks):
+        return "it uses the NLA"
+    if anim_data.action_influence != 1.0:
+        return "its Action influence is not 1"
+    for pose_bone in obj.pose.bones:
+        if pose_bone.constraints:
+            return "bone %r has constraints" % pose_bone.name
+        bone = pose_bone.bone
+        if (
+                bone.inherit_scale != 'FULL' or
+                not bone.use_inherit_rotation or
+                not bone.use_local_location or
+                bone.use_relative_parent
+        ):
+            return "bone %r doesn't fully inherit the transform of its parent" % pose_bone.name
+    return None
+
+
+def _pose_matrices_from_action(obj, bone_names, parent_indices, frames):
+    """Compute the (frames, bones, 4, 4) pose matrices of the bones from the F-curves of the armature's Action.
+
+    This is what evaluating the armature at each frame results in, as long as nothing but the Action affects the
+    pose, see: `_action_only_unsupported_reason()`.
+    """
+    from bpy.utils import escape_identifier
+
+    channelbag = anim_utils.animdata_get_channelbag_for_assigned_slot(obj.animation_data)
+    fcurves = {} if channelbag is None else {
+        (fcurve.data_path, fcurve.array_index): fcurve
+        for fcurve in channelbag.fcurves
+    }
+
+    num_frames = len(frames)
+    num_bones = len(bone_names)
+
+    def channel_values(pose_bone, prop_name):
+        # The property value of the pose bone for each frame, taken from the F-curves when animated.
+        data_path = 'pose.bones["%s"].%s' % (escape_identifier(pose_bone.name), prop_name)
+        values = np.empty((num_frames, len(getattr(pose_bone, prop_name))))
+        values[:] = getattr(pose_bone, prop_name)
+        for index in range(values.shape[1]):
+            fcurve = fcurves.get((data_path, index))
+            if fcurve is not None and not fcurve.mute:
+                values[:, index] = [fcurve.evaluate(frame) for frame in frames]
+        return values
+
+    pose_mats = np.empty((num_frames, num_bones, 4, 4))
+    for bone_i, bone_name in enumerate(bone_names):
+        pose_bone = obj.pose.bones[bone_name]
+        bone = pose_bone.bone
+
+        # The local transform of the pose bone, see: `BKE_pchan_to_mat4()`.
+        rotation_mode = pose_bone.rotation_mode
+        if rotation_mode == 'QUATERNION':
+            rot_mats = _quaternions_to_matrices(channel_values(pose_bone, "rotation_quaternion"))
+        elif rotation_mode == 'AXIS_ANGLE':
+            axis_angle = channel_values(pose_bone, "rotation_axis_angle")
+            axis_length = np.linalg.norm(axis_angle[:, 1:], axis=1, keepdims=True)
+            axis = axis_angle[:, 1:] / np.where(axis_length > 0.0, axis_length, 1.0)
+            half_angle = axis_angle[:, :1] / 2.0
+            rot_mats = _quaternions_to_matrices(np.hstack((np.cos(half_angle), np.sin(half_angle) * axis)))
+        else:
+            rot_mats = euler_to_matrices(channel_values(pose_bone, "rotation_euler"), rotation_mode)
+
+        chan_mats = np.zeros((num_frames, 4, 4))
+        chan_mats[:, :3, :3] = rot_mats * channel_values(pose_bone, "scale")[:, np.newaxis, :]
+        chan_mats[:, 3, 3] = 1.0
+        # Action channels don't break chains.
+        if not bone.use_connect:
+            chan_mats[:, :3, 3] = channel_values(pose_bone, "location")
+
+        # pose_mat = parent_pose_mat @ offset_from_parent @ chan_mat, see: `BKE_armature_mat_bone_to_pose()`.
+        rest_mat = np.array(bone.matrix_local)
+        parent_i = parent_indices[bone_i]
+        if parent_i == -1:
+            pose_mats[:, bone_i] = rest_mat @ chan_mats
+        else:
+            offset_mat = np.linalg.inv(np.array(bone.parent.matrix_local)) @ rest_mat
+            pose_mats[:, bone_i] = pose_mats[:, parent_i] @ offset_mat @ chan_mats
+
+    return pose_mats
+
+
+def _pose_matrices_from_scene(scene, obj, bone_names, frames):
+    """Get the (frames, bones, 4, 4) pose matrices of the bones, evaluating the scene at each frame."""
+    pose_bones = obj.pose.bones
+    pose_bone_indices = [pose_bones.find(bone_name) for bone_name in bone_names]
+
+    pose_mats = np.empty((len(frames), len(bone_names), 4, 4))
+    pose_mats_all = np.empty(len(pose_bones) * 16, dtype=np.float32)
+    for frame_i, frame in enumerate(frames):
+        scene.frame_set(frame)
+        pose_bones.foreach_get("matrix", pose_mats_all)
+        # Matrices are read in column-major order.
+        pose_mats[frame_i] = pose_mats_all.reshape(-1, 4, 4)[pose_bone_indices].swapaxes(-1, -2)
+
+    return pose_mats
 
 
 def write_armature(
@@ -14,6 +220,7 @@ def write_armature(
         rotate_mode='NATIVE',
         root_transform_only=False,
         sort_children_by_names=False,
+        use_action_only=False,
 ):
 
     def ensure_rot_order(rot_order_str):
@@ -21,9 +228,6 @@ def write_armature(
             rot_order_str = "XYZ"
         return rot_order_str
 
-    from mathutils import Matrix, Euler
-    from math import degrees
-
     file = open(filepath, "w", encoding="utf8", newline="\n")
 
     obj = context.object
@@ -136,141 +340,84 @@ def write_armature(
 
         file.write("}\n")
 
-    # redefine bones as sorted by serialized_names
-    # so we can write motion
-
-    class DecoratedBone:
-        __slots__ = (
-            # Bone name, used as key in many places.
-            "name",
-            "parent",  # decorated bone parent, set in a later loop
-            # Blender armature bone.
-            "rest_bone",
-            # Blender pose bone.
-            "pose_bone",
-            # Blender pose matrix.
-            "pose_mat",
-            # Blender rest matrix (armature space).
-            "rest_arm_mat",
-            # Blender rest matrix (local space).
-            "rest_local_mat",
-            # Pose_mat inverted.
-            "pose_imat",
-            # Rest_arm_mat inverted.
-            "rest_arm_imat",
-            # Rest_local_mat inverted.
-            "rest_local_imat",
-            # Last used euler to preserve euler compatibility in between keyframes.
-            "prev_euler",
-            # Is the bone disconnected to the parent bone?
-            "skip_position",
-            "rot_order",
-            "rot_order_str",
-            # Needed for the euler order when converting from a matrix.
-            "rot_order_str_reverse",
-        )
-
-        _eul_order_lookup = {
-            'XYZ': (0, 1, 2),
-            'XZY': (0, 2, 1),
-            'YXZ': (1, 0, 2),
-            'YZX': (1, 2, 0),
-            'ZXY': (2, 0, 1),
-            'ZYX': (2, 1, 0),
-        }
-
-        def __init__(self, bone_name):
-            self.name = bone_name
-            self.rest_bone = arm.bones[bone_name]
-            self.pose_bone = obj.pose.bones[bone_name]
-
-            if rotate_mode == "NATIVE":
-                self.rot_order_str = ensure_rot_order(self.pose_bone.rotation_mode)
-            else:
-                self.rot_order_str = rotate_mode
-            self.rot_order_str_reverse = self.rot_order_str[::-1]
-
-            self.rot_order = DecoratedBone._eul_order_lookup[self.rot_order_str]
-
-            self.pose_mat = self.pose_bone.matrix
-
-            # mat = self.rest_bone.matrix  # UNUSED
-            self.rest_arm_mat = self.rest_bone.matrix_local
-            self.rest_local_mat = self.rest_bone.matrix
-
-            # inverted mats
-            self.pose_imat = self.pose_mat.inverted()
-            self.rest_arm_imat = self.rest_arm_mat.inverted()
-            self.rest_local_imat = self.rest_local_mat.inverted()
-
-            self.parent = None
-            self.prev_euler = Euler((0.0, 0.0, 0.0), self.rot_order_str_reverse)
-            self.skip_position = ((self.rest_bone.use_connect or root_transform_only) and self.rest_bone.parent)
-
-        def update_posedata(self):
-            self.pose_mat = self.pose_bone.matrix
-            self.pose_imat = self.pose_mat.inverted()
-
-        def __repr__(self):
-            if self.parent:
-                return "[\"%s\" child on \"%s\"]\n" % (self.name, self.parent.name)
-            else:
-                return "[\"%s\" root bone]\n" % (self.name)
-
-    bones_decorated = [DecoratedBone(bone_name) for bone_name in serialized_names]
-
-    # Assign parents
-    bones_decorated_dict = {dbone.name: dbone for dbone in bones_decorated}
-    for dbone in bones_decorated:
-        parent = dbone.rest_bone.parent
-        if parent:
-            dbone.parent = bones_decorated_dict[parent.name]
-    del bones_decorated_dict
-    # finish assigning parents
+    # Rest data of the bones, in the order they are written.
+    rest_bones = [arm.bones[bone_name] for bone_name in serialized_names]
+    bone_indices = {bone_name: bone_i for bone_i, bone_name in enumerate(serialized_names)}
+    parent_indices = np.array([
+        bone_indices[rest_bone.parent.name] if rest_bone.parent else -1
+        for rest_bone in rest_bones
+    ], dtype=np.intp)
+    has_parent = parent_indices != -1
+
+    # Rest matrices (armature space).
+    rest_arm_mats = np.array([rest_bone.matrix_local for rest_bone in rest_bones])
+    rest_arm_imats = np.linalg.inv(rest_arm_mats)
+    rest_heads = np.array([rest_bone.head_local for rest_bone in rest_bones])
+    # The location of the head relative to the head of the parent (or the armature for root bones).
+    rest_head_offsets = np.array([
+        rest_bone.head_local - rest_bone.parent.head_local if rest_bone.parent else rest_bone.head
+        for rest_bone in rest_bones
+    ])
+
+    if rotate_mode == "NATIVE":
+        rot_order_strs = [ensure_rot_order(obj.pose.bones[bone_name].rotation_mode) for bone_name in serialized_names]
+    else:
+        rot_order_strs = [rotate_mode] * len(serialized_names)
+    # Needed for the euler order when converting from a matrix.
+    rot_order_strs_reverse = [rot_order_str[::-1] for rot_order_str in rot_order_strs]
+
+    # The motion data columns, as indices in the (X/Y/Z position, X/Y/Z rotation) channels of all bones.
+    columns = []
+    for bone_i, (rest_bone, rot_order_str) in enumerate(zip(rest_bones, rot_order_strs)):
+        # Is the bone disconnected to the parent bone?
+        if not ((rest_bone.use_connect or root_transform_only) and rest_bone.parent):
+            columns += [bone_i * 6, bone_i * 6 + 1, bone_i * 6 + 2]
+        columns += [bone_i * 6 + 3 + "XYZ".index(axis) for axis in rot_order_str]
+    row_format = "%.6f " * len(columns) + "\n"
 
     scene = context.scene
     frame_current = scene.frame_current
 
+    if use_action_only and (reason := _action_only_unsupported_reason(obj)):
+        print("BVH Export: evaluating the scene for each frame, as %s" % reason)
+        use_action_only = False
+
     file.write("MOTION\n")
     file.write("Frames: %d\n" % (frame_end - frame_start + 1))
     file.write("Frame Time: %.6f\n" % (1.0 / (scene.render.fps / scene.render.fps_base)))
 
-    for frame in range(frame_start, frame_end + 1):
-        scene.frame_set(frame)
-
-        for dbone in bones_decorated:
-            dbone.update_posedata()
-
-        for dbone in bones_decorated:
-            trans = Matrix.Translation(dbone.rest_bone.head_local)
-            itrans = Matrix.Translation(-dbone.rest_bone.head_local)
-
-            if dbone.parent:
-                mat_final = dbone.parent.rest_arm_mat @ dbone.parent.pose_imat @ dbone.pose_mat @ dbone.rest_arm_imat
-                mat_final = itrans @ mat_final @ trans
-                loc = mat_final.to_translation() + (dbone.rest_bone.head_local - dbone.parent.rest_bone.head_local)
-            else:
-                mat_final = dbone.pose_mat @ dbone.rest_arm_imat
-                mat_final = itrans @ mat_final @ trans
-                loc = mat_final.to_translation() + dbone.rest_bone.head
+    # Last used eulers to preserve euler compatibility in between keyframes.
+    prev_eulers = np.zeros((len(rest_bones), 3))
 
-            # keep eulers compatible, no jumping on interpolation.
-            rot = mat_final.to_euler(dbone.rot_order_str_reverse, dbone.prev_euler)
+    frames = range(frame_start, frame_end + 1)
+    for chunk_start in range(0, len(frames), FRAME_CHUNK_SIZE):
+        chunk_frames = frames[chunk_start:chunk_start + FRAME_CHUNK_SIZE]
 
-            if not dbone.skip_position:
-                file.write("%.6f %.6f %.6f " % (loc * global_scale)[:])
+        if use_action_only:
+            pose_mats = _pose_matrices_from_action(obj, serialized_names, parent_indices, chunk_frames)
+        else:
+            pose_mats = _pose_matrices_from_scene(scene, obj, serialized_names, chunk_frames)
+
+        # mat_final = parent_rest_arm_mat @ parent_pose_imat @ pose_mat @ rest_arm_imat
+        # (without the parent matrices for root bones).
+        mats_final = pose_mats @ rest_arm_imats
+        parents = parent_indices[has_parent]
+        mats_final[:, has_parent] = (
+            rest_arm_mats[parents] @ np.linalg.inv(pose_mats[:, parents]) @ mats_final[:, has_parent]
+        )
 
-            file.write(
-                "%.6f %.6f %.6f " % (
-                    degrees(rot[dbone.rot_order[0]]),
-                    degrees(rot[dbone.rot_order[1]]),
-                    degrees(rot[dbone.rot_order[2]]),
-                )
-            )
+        # The translation of: Matrix.Translation(-head) @ mat_final @ Matrix.Translation(head)
+        locs = (
+            np.einsum('fbij,bj->fbi', mats_final[..., :3, :3], rest_heads) + mats_final[..., :3, 3] - rest_heads +
+            rest_head_offsets
+        )
 
-            dbone.prev_euler = rot
+        # keep eulers compatible, no jumping on interpolation.
+        rots = _matrices_to_compatible_eulers(mats_final[..., :3, :3], rot_order_strs_reverse, prev_eulers)
+        prev_eulers = rots[-1]
 
-        file.write("\n")
+        channels = np.concatenate((locs * global_scale, np.degrees(rots)), axis=2).reshape(len(chunk_frames), -1)
+        file.write("".join(row_format % tuple(row) for row in channels[:, columns].tolist()))
 
     file.close()
 
@@ -287,6 +434,7 @@ def save(
         rotate_mode="NATIVE",
         root_transform_only=False,
         sort_children_by_names=False,
+        use_action_only=False,
 ):
     write_armature(
         context, filepath,
@@ -296,6 +444,7 @@ def save(
         rotate_mode=rotate_mode,
         root_transform_only=root_transform_only,
         sort_children_by_names=sort_children_by_names,
+        use_action_only=use_action_only,
     )
 
     return {'FINISHED'}
@@ -2,9 +2,10 @@
 #
 # SPDX-License-Identifier: GPL-2.0-or-later
 
-from math import radians, ceil
+from math import ceil
 
 import bpy
+import numpy as np
 from bpy.app.translations import pgettext_tip as tip_
 from mathutils import Vector, Euler, Matrix
 from bpy_extras import anim_utils
@@ -35,7 +36,7 @@ class BVH_Node:
         'rot_order',
         # Same as above but a string 'XYZ' format..
         'rot_order_str',
-        # A list one tuple's one for each frame: (locx, locy, locz, rotx, roty, rotz),
+        # A (frames, 6) float array, one row for each frame: (locx, locy, locz, rotx, roty, rotz),
         # euler rotation ALWAYS stored xyz order, even when native used.
         'anim_data',
         # Convenience function, bool, same as: (channels[0] != -1 or channels[1] != -1 or channels[2] != -1).
@@ -76,9 +77,9 @@ class BVH_Node:
 
         self.children = []
 
-        # List of 6 length tuples: (lx, ly, lz, rx, ry, rz)
+        # Rows of: (lx, ly, lz, rx, ry, rz)
         # even if the channels aren't used they will just be zero.
-        self.anim_data = [(0, 0, 0, 0, 0, 0)]
+        self.anim_data = np.zeros((1, 6))
 
     def __repr__(self):
         return (
@@ -99,16 +100,18 @@ def sorted_nodes(bvh_nodes):
 def read_bvh(context, file_path, rotate_mode='XYZ', global_scale=1.0):
     # File loading stuff
     # Open the file for importing
-    file = open(file_path, 'r')
-
-    # Separate into a list of lists, each line a list of words.
-    file_lines = file.readlines()
-    # Non standard carriage returns?
-    if len(file_lines) == 1:
-        file_lines = file_lines[0].split('\r')
-
-    # Split by white-space.
-    file_lines = [ll for ll in [l.split() for l in file_lines] if ll]
+    with open(file_path, 'r') as file:
+        # Also splits on non standard carriage returns.
+        file_lines = [l for l in file.read().splitlines() if l and not l.isspace()]
+
+    # Only the hierarchy is split into a list of lists, each line a list of words.
+    # The motion data, which is the bulk of the file, is parsed in one go after it.
+    motion_line_idx = next(
+        (i for i, l in enumerate(file_lines) if l.strip().lower() == 'motion'),
+        len(file_lines),
+    )
+    motion_lines = file_lines[motion_line_idx + 3:]
+    file_lines = [l.split() for l in file_lines[:motion_line_idx + 3]]
 
     # Create hierarchy as empties
     if file_lines[0][0].lower() == 'hierarchy':
@@ -267,31 +270,23 @@ def read_bvh(context, file_path, rotate_mode='XYZ', global_scale=1.0):
     # second life expects it, which isn't to spec.
     bvh_nodes_list = sorted_nodes(bvh_nodes)
 
-    while lineIdx < len(file_lines):
-        line = file_lines[lineIdx]
-        for bvh_node in bvh_nodes_list:
-            # for bvh_node in bvh_nodes_serial:
-            lx = ly = lz = rx = ry = rz = 0.0
-            channels = bvh_node.channels
-            anim_data = bvh_node.anim_data
-            if channels[0] != -1:
-                lx = global_scale * float(line[channels[0]])
-
-            if channels[1] != -1:
-                ly = global_scale * float(line[channels[1]])
+    # A (frames, channels) array of the motion data, one row for each line.
+    motion = _read_bvh_motion(motion_lines, channelIndex + 1)
 
-            if channels[2] != -1:
-                lz = global_scale * float(line[channels[2]])
+    for bvh_node in bvh_nodes_list:
+        channels = bvh_node.channels
+        # The first row is the rest pose.
+        anim_data = np.zeros((len(motion) + 1, 6))
 
-            if channels[3] != -1 or channels[4] != -1 or channels[5] != -1:
+        for axis_i in range(3):
+            if channels[axis_i] != -1:
+                anim_data[1:, axis_i] = global_scale * motion[:, channels[axis_i]]
 
-                rx = radians(float(line[channels[3]]))
-                ry = radians(float(line[channels[4]]))
-                rz = radians(float(line[channels[5]]))
+        if bvh_node.has_rot:
+            anim_data[1:, 3:] = np.radians(motion[:, channels[3:]])
 
-            # Done importing motion data #
-            anim_data.append((lx, ly, lz, rx, ry, rz))
-        lineIdx += 1
+        # Done importing motion data #
+        bvh_node.anim_data = anim_data
 
     # Assign children
     for bvh_node in bvh_nodes_list:
@@ -334,6 +329,77 @@ def read_bvh(context, file_path, rotate_mode='XYZ', global_scale=1.0):
     return bvh_nodes, bvh_frame_time, bvh_frame_count
 
 
+def _read_bvh_motion(motion_lines, num_channels):
+    """Return the motion data as (frames, channels) float array, parsing all lines at once."""
+    try:
+        motion = np.fromstring("\n".join(motion_lines), sep=" ")
+    except ValueError:
+        # Values that can't be parsed, handled below.
+        motion = np.empty(0)
+    if motion.size == len(motion_lines) * num_channels:
+        return motion.reshape(len(motion_lines), num_channels)
+
+    # Lines with extra values, or values that can't be parsed (an exception is raised for them).
+    return np.array([line.split()[:num_channels] for line in motion_lines], dtype=np.float64).reshape(
+        len(motion_lines), num_channels)
+
+
+def euler_to_matrices(eulers, order):
+    """Return the (frames, 3, 3) rotation matrices of the (frames, 3) euler rotations, like ``Euler.to_matrix()``."""
+    cos, sin = np.cos(eulers), np.sin(eulers)
+    matrices = np.empty((len(eulers), 3, 3))
+    matrices[:] = np.identity(3)
+    for axis in order:
+        axis_i = 'XYZ'.index(axis)
+        # The two other axes, in cyclic order.
+        j, k = (axis_i + 1) % 3, (axis_i + 2) % 3
+        axis_matrices = np.zeros((len(eulers), 3, 3))
+        axis_matrices[:, axis_i, axis_i] = 1.0
+        axis_matrices[:, j, j] = axis_matrices[:, k, k] = cos[:, axis_i]
+        axis_matrices[:, k, j] = sin[:, axis_i]
+        axis_matrices[:, j, k] = -sin[:, axis_i]
+        # The first axis of the order is applied first.
+        matrices = axis_matrices @ matrices
+    return matrices
+
+
+def _matrices_to_quaternions(matrices):
+    """Return the (frames, 4) quaternions of the (frames, 3, 3) rotation matrices, like ``Matrix.to_quaternion()``.
+
+    This uses the same method as Blender, so that it results in the same quaternion out of the two possible ones
+    (with a non-negative W).
+    """
+    m = matrices
+    trace = np.stack((
+        1.0 + m[:, 0, 0] + m[:, 1, 1] + m[:, 2, 2],
+        1.0 + m[:, 0, 0] - m[:, 1, 1] - m[:, 2, 2],
+        1.0 - m[:, 0, 0] + m[:, 1, 1] - m[:, 2, 2],
+        1.0 - m[:, 0, 0] - m[:, 1, 1] + m[:, 2, 2],
+    ), axis=1)
+    # The quaternion component to compute from the trace, choosing the largest one for precision.
+    largest = np.where(
+        m[:, 2, 2] < 0.0,
+        np.where(m[:, 0, 0] > m[:, 1, 1], 1, 2),
+        np.where(m[:, 0, 0] < -m[:, 1, 1], 3, 0),
+    )
+    # The other components, multiplied by the largest one (times 4).
+    products = np.stack((
+        # W, X, Y, Z times W.
+        trace[:, 0], m[:, 2, 1] - m[:, 1, 2], m[:, 0, 2] - m[:, 2, 0], m[:, 1, 0] - m[:, 0, 1],
+        # W, X, Y, Z times X.
+        m[:, 2, 1] - m[:, 1, 2], trace[:, 1], m[:, 1, 0] + m[:, 0, 1], m[:, 0, 2] + m[:, 2, 0],
+        # W, X, Y, Z times Y.
+        m[:, 0, 2] - m[:, 2, 0], m[:, 1, 0] + m[:, 0, 1], trace[:, 2], m[:, 2, 1] + m[:, 1, 2],
+        # W, X, Y, Z times Z.
+        m[:, 1, 0] - m[:, 0, 1], m[:, 0, 2] + m[:, 2, 0], m[:, 2, 1] + m[:, 1, 2], trace[:, 3],
+    ), axis=1).reshape(-1, 4, 4)
+    quats = products[np.arange(len(m)), largest]
+    # Ensure W is non-negative for a canonical result.
+    quats[quats[:, 0] < 0.0] *= -1.0
+    quats /= np.linalg.norm(quats, axis=1, keepdims=True)
+    return quats
+
+
 def bvh_node_dict2objects(context, bvh_name, bvh_nodes, rotate_mode='NATIVE', frame_start=1, IMPORT_LOOP=False):
 
     if frame_start < 1:
@@ -382,9 +448,7 @@ def bvh_node_dict2objects(context, bvh_name, bvh_nodes, rotate_mode='NATIVE', fr
     for name, bvh_node in bvh_nodes.items():
         obj = bvh_node.temp
 
-        for frame_current in range(len(bvh_node.anim_data)):
-
-            lx, ly, lz, rx, ry, rz = bvh_node.anim_data[frame_current]
+        for frame_current, (lx, ly, lz, rx, ry, rz) in enumerate(bvh_node.anim_data.tolist()):
 
             if bvh_node.has_loc:
                 obj.delta_location = Vector((lx, ly, lz)) - bvh_node.rest_head_world
@@ -538,13 +602,9 @@ def bvh_node_dict2armature(
         bone_name = bvh_node.temp  # may not be the same name as the bvh_node, could have been shortened.
         pose_bone = pose_bones[bone_name]
         rest_bone = arm_data.bones[bone_name]
-        bone_rest_matrix = rest_bone.matrix_local.to_3x3()
-
-        bone_rest_matrix_inv = Matrix(bone_rest_matrix)
-        bone_rest_matrix_inv.invert()
+        bone_rest_matrix = np.array(rest_bone.matrix_local.to_3x3())
+        bone_rest_matrix_inv = np.linalg.inv(bone_rest_matrix)
 
-        bone_rest_matrix_inv.resize_4x4()
-        bone_rest_matrix.resize_4x4()
         bvh_node.temp = (pose_bone, bone, bone_rest_matrix, bone_rest_matrix_inv)
 
         if 0 == num_frame:
@@ -558,97 +618,73 @@ def bvh_node_dict2armature(
         num_frame = num_frame - skip_frame
 
     # Create a shared time axis for all animation curves.
-    time = [float(frame_start)] * num_frame
+    # The keyframe coordinates are (time, value) pairs, the value column is
+    # filled in for each curve, which is then written with a single `foreach_set`.
+    coords = np.empty((num_frame, 2), dtype=np.float32)
     if use_fps_scale:
         dt = scene.render.fps * bvh_frame_time
-        for frame_i in range(1, num_frame):
-            time[frame_i] += float(frame_i) * dt
+        coords[:, 0] = float(frame_start) + np.arange(num_frame) * dt
     else:
-        for frame_i in range(1, num_frame):
-            time[frame_i] += float(frame_i)
+        coords[:, 0] = float(frame_start) + np.arange(num_frame)
 
     # print("bvh_frame_time = %f, dt = %f, num_frame = %d"
     #      % (bvh_frame_time, dt, num_frame]))
 
+    def add_curves(data_path, values, group_name):
+        # For each column of values (location x, y, z, euler angle x, y, z or quaternion w, x, y, z).
+        for axis_i in range(values.shape[1]):
+            curve = channelbag.fcurves.new(data_path=data_path, index=axis_i, group_name=group_name)
+            keyframe_points = curve.keyframe_points
+            keyframe_points.add(num_frame)
+
+            coords[:, 1] = values[:, axis_i]
+            keyframe_points.foreach_set("co", coords.ravel())
+
     for i, bvh_node in enumerate(bvh_nodes_list):
         pose_bone, bone, bone_rest_matrix, bone_rest_matrix_inv = bvh_node.temp
+        anim_data = bvh_node.anim_data[skip_frame:skip_frame + num_frame]
 
         if bvh_node.has_loc:
             # Not sure if there is a way to query this or access it in the
             # PoseBone structure.
             data_path = 'pose.bones["%s"].location' % escape_identifier(pose_bone.name)
 
-            location = [(0.0, 0.0, 0.0)] * num_frame
-            for frame_i in range(num_frame):
-                bvh_loc = bvh_node.anim_data[frame_i + skip_frame][:3]
-
-                bone_translate_matrix = Matrix.Translation(
-                    Vector(bvh_loc) - bvh_node.rest_head_local)
-                location[frame_i] = (bone_rest_matrix_inv @
-                                     bone_translate_matrix).to_translation()
+            # The translation of: bone_rest_matrix_inv @ Matrix.Translation(bvh_loc - rest_head_local).
+            location = (anim_data[:, :3] - np.array(bvh_node.rest_head_local)) @ bone_rest_matrix_inv.T
 
-            # For each location x, y, z.
-            for axis_i in range(3):
-                curve = channelbag.fcurves.new(data_path=data_path, index=axis_i, group_name=bvh_node.name)
-                keyframe_points = curve.keyframe_points
-                keyframe_points.add(num_frame)
-
-                for frame_i in range(num_frame):
-                    keyframe_points[frame_i].co = (
-                        time[frame_i],
-                        location[frame_i][axis_i],
-                    )
+            add_curves(data_path, location, bvh_node.name)
 
         if bvh_node.has_rot:
-            data_path = None
-            rotate = None
+            # apply rotation order and convert to XYZ
+            # note that the rot_order_str is reversed.
+            bone_rotation_matrices = euler_to_matrices(anim_data[:, 3:], bvh_node.rot_order_str[::-1])
+            bone_rotation_matrices = (
+                bone_rest_matrix_inv @
+                bone_rotation_matrices @
+                bone_rest_matrix
+            )
 
             if 'QUATERNION' == rotate_mode:
-                rotate = [(1.0, 0.0, 0.0, 0.0)] * num_frame
                 data_path = ('pose.bones["%s"].rotation_quaternion' % escape_identifier(pose_bone.name))
+                rotate = _matrices_to_quaternions(bone_rotation_matrices)
             else:
-                rotate = [(0.0, 0.0, 0.0)] * num_frame
                 data_path = ('pose.bones["%s"].rotation_euler' % escape_identifier(pose_bone.name))
-
-            prev_euler = Euler((0.0, 0.0, 0.0))
-            for frame_i in range(num_frame):
-                bvh_rot = bvh_node.anim_data[frame_i + skip_frame][3:]
-
-                # apply rotation order and convert to XYZ
-                # note that the rot_order_str is reversed.
-                euler = Euler(bvh_rot, bvh_node.rot_order_str[::-1])
-                bone_rotation_matrix = euler.to_matrix().to_4x4()
-                bone_rotation_matrix = (
-                    bone_rest_matrix_inv @
-                    bone_rotation_matrix @
-                    bone_rest_matrix
-                )
-
-                if len(rotate[frame_i]) == 4:
-                    rotate[frame_i] = bone_rotation_matrix.to_quaternion()
-                else:
-                    rotate[frame_i] = bone_rotation_matrix.to_euler(
+                # Each euler rotation is chosen to be compatible with the previous one (avoiding jumps in the curves),
+                # so these can't be computed all at once.
+                rotate = np.empty((num_frame, 3))
+                prev_euler = Euler((0.0, 0.0, 0.0))
+                for frame_i, bone_rotation_matrix in enumerate(bone_rotation_matrices.tolist()):
+                    rotate[frame_i] = prev_euler = Matrix(bone_rotation_matrix).to_euler(
                         pose_bone.rotation_mode, prev_euler)
-                    prev_euler = rotate[frame_i]
-
-            # For each euler angle x, y, z (or quaternion w, x, y, z).
-            for axis_i in range(len(rotate[0])):
-                curve = channelbag.fcurves.new(data_path=data_path, index=axis_i, group_name=bvh_node.name)
-                keyframe_points = curve.keyframe_points
-                keyframe_points.add(num_frame)
 
-                for frame_i in range(num_frame):
-                    keyframe_points[frame_i].co = (
-                        time[frame_i],
-                        rotate[frame_i][axis_i],
-                    )
+            add_curves(data_path, rotate, bvh_node.name)
 
+    interpolation_linear = bpy.types.Keyframe.bl_rna.properties['interpolation'].enum_items['LINEAR'].value
     for cu in channelbag.fcurves:
         if IMPORT_LOOP:
             pass  # 2.5 doesn't have cyclic now?
 
-        for bez in cu.keyframe_points:
-            bez.interpolation = 'LINEAR'
+        cu.keyframe_points.foreach_set("interpolation", [interpolation_linear] * len(cu.keyframe_points))
 
     # finally apply matrix
     arm_ob.matrix_world = global_matrix
@@ -4,7 +4,7 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 
 import re
-import xml.dom.minidom
+import xml.etree.ElementTree
 from math import cos, sin, tan, atan2, pi, ceil
 
 import bpy
@@ -16,7 +16,8 @@ from .svg_util import (units,
                        srgb_to_linearrgb,
                        check_points_equal,
                        parse_array_of_floats,
-                       read_float)
+                       read_float,
+                       tokenize_path_data)
 
 #### Common utilities ####
 
@@ -376,6 +377,55 @@ def id_names_from_node(node, ob):
         ob.name = name
         ob.data.name = name
 
+
+SVG_NAMESPACE = 'http://www.w3.org/2000/svg'
+
+
+class SVGElement:
+    """
+    XML element data needed by geometries, which stays valid after the
+    element itself was freed by the incremental parser
+    """
+
+    __slots__ = ('tagName',  # Tag name, without prefix for SVG elements
+                 '_attributes')  # Attributes, with prefix for namespaced ones
+
+    def __init__(self, elem, prefixes):
+        """
+        Initialize element from ElementTree element
+
+        prefixes - mapping from namespace URI to the prefix used for it
+        """
+
+        self.tagName = SVGQualifiedName(elem.tag, prefixes)
+        self._attributes = {SVGQualifiedName(name, prefixes): value for name, value in elem.attrib.items()}
+
+    def getAttribute(self, name):
+        """
+        Get value of attribute, empty string if it is not set
+        """
+
+        return self._attributes.get(name, '')
+
+
+def SVGQualifiedName(name, prefixes):
+    """
+    Convert ElementTree '{namespace}name' to 'prefix:name', like in the file
+    """
+
+    if name[0] != '{':
+        return name
+
+    uri, local_name = name[1:].split('}', 1)
+    if uri == SVG_NAMESPACE:
+        return local_name
+
+    prefix = prefixes.get(uri)
+    if prefix:
+        return prefix + ':' + local_name
+
+    return name
+
 #### SVG path helpers ####
 
 
@@ -395,44 +445,7 @@ class SVGPathData:
         d - the definition of the outline of a shape
         """
 
-        spaces = ' ,\t'
-        commands = {'m', 'l', 'h', 'v', 'c', 's', 'q', '', 't', 'a', 'z'}
-        current_command = ''
-        tokens = []
-
-        i = 0
-        n = len(d)
-        while i < n:
-            c = d[i]
-
-            if c in spaces:
-                pass
-            elif c.lower() in commands:
-                tokens.append(c)
-                current_command = c
-                arg_index = 1
-            elif c in ['-', '.'] or c.isdigit():
-                # Special case for 'a/A' commands.
-                # Arguments 4 and 5 are either 0 or 1 and might not
-                # be separated from the next argument with-space or comma.
-                if current_command.lower() == 'a':
-                    if arg_index % 7 in [4, 5]:
-                        token = d[i]
-                        last_char = i + 1
-                    else:
-                        token, last_char = read_float(d, i)
-                else:
-                    token, last_char = read_float(d, i)
-
-                arg_index += 1
-                tokens.append(token)
-
-                # in most cases len(token) and (last_char - i) are the same
-                # but with white-space or ',' prefix they are not.
-
-                i += (last_char - i) - 1
-
-            i += 1
+        tokens = tokenize_path_data(d)
 
         self._data = tokens
         self._index = 0
@@ -933,9 +946,10 @@ class SVGGeometry:
 
     __slots__ = ('_node',  # XML node for geometry
                  '_context',  # Global SVG context (holds matrices stack, i.e.)
-                 '_creating')  # Flag if geometry is already creating
-    # for this node
-    # need to detect cycles for USE node
+                 '_creating',  # Flag if geometry is already creating
+                 # for this node
+                 # need to detect cycles for USE node
+                 '_instance')  # First object created for geometry, with its rect and matrix
 
     def __init__(self, node, context):
         """
@@ -945,6 +959,7 @@ class SVGGeometry:
         self._node = node
         self._context = context
         self._creating = False
+        self._instance = None
 
         if hasattr(node, 'getAttribute'):
             defs = context['defines']
@@ -1029,13 +1044,43 @@ class SVGGeometry:
 
         pass
 
+    def parseEnd(self):
+        """
+        Finish parsing after all child nodes were parsed
+        """
+
+        pass
+
     def _doCreateGeom(self, instancing):
         """
         Internal handler to create real geometries
+
+        Returns the created object, if any.
         """
 
         pass
 
+    def _createInstance(self):
+        """
+        Create linked duplicate of the object created for this geometry before
+
+        Geometry used more than once (i.e. by USE nodes) only differs by the
+        transformation, as long as the display rectangle is the same.
+        """
+
+        if self._instance is None:
+            return False
+
+        ob, rect, matrix = self._instance
+        if rect != self._context['rect'] or matrix.determinant() == 0.0:
+            return False
+
+        instance = bpy.data.objects.new(ob.name, ob.data)
+        instance.matrix_world = self._context['matrix'] @ matrix.inverted()
+        self._context['collection'].objects.link(instance)
+
+        return True
+
     def getTransformMatrix(self):
         """
         Get matrix created from "transform" attribute
@@ -1062,7 +1107,10 @@ class SVGGeometry:
         if matrix is not None:
             self._pushMatrix(matrix)
 
-        self._doCreateGeom(instancing)
+        if not self._createInstance():
+            ob = self._doCreateGeom(instancing)
+            if ob is not None and self._instance is None:
+                self._instance = (ob, self._context['rect'], self._context['matrix'].copy())
 
         if matrix is not None:
             self._popMatrix()
@@ -1093,23 +1141,28 @@ class SVGGeometryContainer(SVGGeometry):
     def parse(self):
         """
         Parse XML node to memory
+
+        Child nodes are parsed afterwards, with the styles of this container.
         """
 
-        if type(self._node) is xml.dom.minidom.Element:
-            self._styles = SVGParseStyles(self._node, self._context)
+        self._styles = SVGParseStyles(self._node, self._context)
 
         self._pushStyle(self._styles)
 
-        for node in self._node.childNodes:
-            if type(node) is not xml.dom.minidom.Element:
-                continue
-
-            ob = parseAbstractNode(node, self._context)
-            if ob is not None:
-                self._geometries.append(ob)
+    def parseEnd(self):
+        """
+        Finish parsing after all child nodes were parsed
+        """
 
         self._popStyle()
 
+    def appendGeometry(self, geom):
+        """
+        Append parsed child geometry
+        """
+
+        self._geometries.append(geom)
+
     def _doCreateGeom(self, instancing):
         """
         Create real geometries
@@ -1216,6 +1269,8 @@ class SVGGeometryPATH(SVGGeometry):
 
         SVGFinishCurve()
 
+        return ob
+
 
 class SVGGeometryDEFS(SVGGeometryContainer):
     """
@@ -1451,6 +1506,8 @@ class SVGGeometryRECT(SVGGeometry):
 
         SVGFinishCurve()
 
+        return ob
+
 
 class SVGGeometryELLIPSE(SVGGeometry):
     """
@@ -1557,6 +1614,8 @@ class SVGGeometryELLIPSE(SVGGeometry):
 
         SVGFinishCurve()
 
+        return ob
+
 
 class SVGGeometryCIRCLE(SVGGeometryELLIPSE):
     """
@@ -1649,6 +1708,8 @@ class SVGGeometryLINE(SVGGeometry):
 
         SVGFinishCurve()
 
+        return ob
+
 
 class SVGGeometryPOLY(SVGGeometry):
     """
@@ -1726,6 +1787,8 @@ class SVGGeometryPOLY(SVGGeometry):
 
         SVGFinishCurve()
 
+        return ob
+
 
 class SVGGeometryPOLYLINE(SVGGeometryPOLY):
     """
@@ -1809,6 +1872,8 @@ class SVGLoader(SVGGeometryContainer):
     SVG file loader
     """
 
+    __slots__ = ('_filepath',)  # Path of SVG file to load
+
     def getTransformMatrix(self):
         """
         Get matrix created from "transform" attribute
@@ -1830,7 +1895,7 @@ class SVGLoader(SVGGeometryContainer):
         collection = bpy.data.collections.new(name=svg_name)
         scene.collection.children.link(collection)
 
-        node = xml.dom.minidom.parse(filepath)
+        self._filepath = filepath
 
         m = Matrix()
         m = m @ Matrix.Scale(1.0 / 90.0 * 0.3048 / 12.0, 4, Vector((1.0, 0.0, 0.0)))
@@ -1849,7 +1914,41 @@ class SVGLoader(SVGGeometryContainer):
                          'do_colormanage': do_colormanage,
                          'collection': collection}
 
-        super().__init__(node, self._context)
+        super().__init__(None, self._context)
+
+    def parse(self):
+        """
+        Parse SVG file to memory
+
+        Geometries are created while the file is read, the XML elements are
+        freed as soon as they are parsed.
+        """
+
+        prefixes = {'http://www.w3.org/XML/1998/namespace': 'xml'}
+        # Geometries of open elements, None for elements which are ignored.
+        stack = [self]
+
+        self._pushStyle(self._styles)
+
+        for event, elem in xml.etree.ElementTree.iterparse(self._filepath, events=('start-ns', 'start', 'end')):
+            if event == 'start':
+                parent = stack[-1]
+                geom = None
+                if isinstance(parent, SVGGeometryContainer):
+                    geom = parseAbstractNode(SVGElement(elem, prefixes), self._context)
+                    if geom is not None:
+                        parent.appendGeometry(geom)
+                stack.append(geom)
+            elif event == 'end':
+                geom = stack.pop()
+                if geom is not None:
+                    geom.parseEnd()
+                elem.clear()
+            else:
+                prefix, uri = elem
+                prefixes[uri] = prefix
+
+        self._popStyle()
 
 
 svgGeometryClasses = {
@@ -1904,7 +2003,7 @@ def load(operator, context, filepath=""):
     do_colormanage = context.scene.display_settings.display_device != 'NONE'
     try:
         load_svg(context, filepath, do_colormanage)
-    except (xml.parsers.expat.ExpatError, UnicodeEncodeError) as e:
+    except (xml.etree.ElementTree.ParseError, UnicodeEncodeError) as e:
         import traceback
         traceback.print_exc()
 
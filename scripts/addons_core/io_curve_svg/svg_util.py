@@ -51,6 +51,54 @@ def parse_array_of_floats(text):
     return [value_to_float(v[0]) for v in elements]
 
 
+# Path data tokens: a command letter, a number, or a sign/decimal point which does not start a valid number.
+match_path_token = r"[MmLlHhVvCcSsQqTtAaZz]|-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?|-?\.\d+(?:[eE][-+]?\d+)?|[-.]"
+re_path_token = re.compile(match_path_token)
+
+
+def tokenize_path_data(d: str):
+    """
+    Splits SVG path data into a list of tokens (command letters and numbers as strings).
+
+    Any other characters (white-space, commas, stray signs) act as separators. The flags of
+    arc commands are single characters and might not be separated from the next argument.
+    """
+
+    if 'a' not in d and 'A' not in d:
+        tokens = re_path_token.findall(d)
+        if '-' in tokens or '.' in tokens:
+            for match in re_path_token.finditer(d):
+                if match.group(0) in {'-', '.'}:
+                    start = match.start()
+                    raise Exception('Invalid float value near ' + d[start:start + 10])
+        return tokens
+
+    tokens = []
+    is_arc = False
+    arg_index = 0
+    pos = 0
+    search = re_path_token.search
+    while (match := search(d, pos)) is not None:
+        token = match.group(0)
+        pos = match.end()
+        if token.isalpha():
+            is_arc = token in {'a', 'A'}
+            arg_index = 1
+        else:
+            if is_arc and arg_index % 7 in {4, 5}:
+                # Arguments 4 and 5 of arcs are either 0 or 1 and might not
+                # be separated from the next argument with white-space or comma.
+                token = token[0]
+                pos = match.start() + 1
+            elif token in {'-', '.'}:
+                start = match.start()
+                raise Exception('Invalid float value near ' + d[start:start + 10])
+            arg_index += 1
+        tokens.append(token)
+
+    return tokens
+
+
 def read_float(text: str, start_index: int = 0):
     """
     Reads floating point value from a string. Parsing starts at the given index.
@@ -6,9 +6,9 @@
 # XXX Not really nice, but that hack is needed to allow execution of that test
 #     from both automated CTest and by directly running the file manually.
 if __name__ == '__main__':
-    from svg_util import (parse_array_of_floats, read_float, parse_coord,)
+    from svg_util import (parse_array_of_floats, read_float, parse_coord, tokenize_path_data,)
 else:
-    from .svg_util import (parse_array_of_floats, read_float, parse_coord,)
+    from .svg_util import (parse_array_of_floats, read_float, parse_coord, tokenize_path_data,)
 import unittest
 
 
@@ -162,5 +162,36 @@ class ParseCoordTest(unittest.TestCase):
         self.assertEqual(parse_coord("1.2%", 200), 2.4)
 
 
+class TokenizePathDataTest(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(tokenize_path_data(""), [])
+        self.assertEqual(tokenize_path_data(" ,\t\n"), [])
+
+    def test_commands_and_numbers(self):
+        self.assertEqual(tokenize_path_data("M10 20 L30,40z"),
+                         ["M", "10", "20", "L", "30", "40", "z"])
+
+    def test_numbers_without_separator(self):
+        self.assertEqual(tokenize_path_data("m1.5.5-3e2-.1"),
+                         ["m", "1.5", ".5", "-3e2", "-.1"])
+        self.assertEqual(tokenize_path_data("l1+2"), ["l", "1", "2"])
+
+    def test_arc(self):
+        self.assertEqual(tokenize_path_data("a25,25 -30 0,1 50,-25"),
+                         ["a", "25", "25", "-30", "0", "1", "50", "-25"])
+
+    def test_arc_flags_without_separator(self):
+        self.assertEqual(tokenize_path_data("A1 1 0 1150 50"),
+                         ["A", "1", "1", "0", "1", "1", "50", "50"])
+        self.assertEqual(tokenize_path_data("a1 1 0 01.5.5 1 1 0 1020"),
+                         ["a", "1", "1", "0", "0", "1", ".5", ".5", "1", "1", "0", "1", "0", "20"])
+
+    def test_invalid_number(self):
+        with self.assertRaises(Exception):
+            tokenize_path_data("M10 -")
+        with self.assertRaises(Exception):
+            tokenize_path_data("A1 1 0 0 0 .")
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
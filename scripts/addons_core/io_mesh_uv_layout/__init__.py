@@ -26,6 +26,8 @@ if "bpy" in locals():
         importlib.reload(export_uv_eps)
     if "export_uv_png" in locals():
         importlib.reload(export_uv_png)
+    if "export_uv_png_cpu" in locals():
+        importlib.reload(export_uv_png_cpu)
     if "export_uv_svg" in locals():
         importlib.reload(export_uv_svg)
 
@@ -90,6 +92,17 @@ class ExportUVLayout(bpy.types.Operator):
         description="File format to export the UV layout to",
         default='PNG',
     )
+    rasterizer: EnumProperty(
+        name="Rasterizer",
+        items=(
+            ('GPU', "GPU",
+             "Draw the image with the GPU"),
+            ('CPU', "CPU",
+             "Draw the image on the CPU, this also works without a GPU (e.g. in background mode)"),
+        ),
+        description="How the bitmap image of the UV layout is drawn",
+        default='GPU',
+    )
     size: IntVectorProperty(
         name="Size",
         size=2,
@@ -272,6 +285,9 @@ class ExportUVLayout(bpy.types.Operator):
 
     def get_exporter(self):
         if self.mode == 'PNG':
+            if self.rasterizer == 'CPU':
+                from . import export_uv_png_cpu
+                return export_uv_png_cpu.export
             from . import export_uv_png
             return export_uv_png.export
         elif self.mode == 'EPS':
@@ -0,0 +1,258 @@
+# SPDX-FileCopyrightText: 2026 Blender Foundation
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Draws the same image as `export_uv_png`, without using the GPU, so it also works in background mode.
+
+import bpy
+import numpy as np
+
+# Use OIIO if available, else Blender for writing the image.
+try:
+    import OpenImageIO as oiio
+except ImportError:
+    oiio = None
+
+# Number of pixels drawn at once, the image is drawn in tiles of whole rows.
+TILE_PIXELS = 1 << 22
+
+
+def export(filepath, tile, face_data, colors, width, height, opacity):
+    edges = get_edges(tile, face_data, width, height)
+    tile_rows = max(1, TILE_PIXELS // width)
+
+    if oiio:
+        spec = oiio.ImageSpec(width, height, 4, "uint8")
+        image = oiio.ImageOutput.create(filepath)
+        image.open(filepath, spec)
+        for row_start in range(0, height, tile_rows):
+            row_end = min(row_start + tile_rows, height)
+            image.write_scanlines(row_start, row_end, 0, draw_tile(edges, row_start, row_end, width, opacity))
+        image.close()
+        return
+
+    # Blender images always need the full image as floats.
+    pixel_data = np.empty((height, width, 4), dtype=np.float32)
+    for row_start in range(0, height, tile_rows):
+        row_end = min(row_start + tile_rows, height)
+        pixel_data[row_start:row_end] = draw_tile(edges, row_start, row_end, width, opacity)
+    pixel_data *= 1.0 / 255.0
+
+    image = bpy.data.images.new("temp", width, height, alpha=True)
+    image.filepath = filepath
+    image.pixels.foreach_set(pixel_data.ravel())
+    image.save()
+    bpy.data.images.remove(image)
+
+
+def get_edges(tile, face_data, width, height):
+    '''Edges of the polygons in the image (in pixel coordinates), with the index and color of their polygon'''
+    from itertools import chain
+
+    counts = np.fromiter((len(uvs) for uvs, _ in face_data), dtype=np.int64, count=len(face_data))
+    coords = np.fromiter(
+        chain.from_iterable(chain.from_iterable(uvs for uvs, _ in face_data)),
+        dtype=np.float64, count=int(counts.sum()) * 2,
+    ).reshape(-1, 2)
+    coords -= tile
+    coords *= (width, height)
+    # OIIO writes arrays from the left-upper corner.
+    if oiio:
+        coords[:, 1] = height - coords[:, 1]
+
+    # Each polygon is closed by the edge from its last to its first corner.
+    polygon_ends = np.cumsum(counts)
+    polygon_starts = polygon_ends - counts
+    next_corner = np.arange(1, len(coords) + 1)
+    next_corner[polygon_ends[counts > 0] - 1] = polygon_starts[counts > 0]
+
+    # Skip polygons outside of the image, i.e. in other UDIM tiles.
+    is_visible = counts > 0
+    if len(coords):
+        corners_first = polygon_starts[is_visible]
+        coords_min = np.minimum.reduceat(coords, corners_first)
+        coords_max = np.maximum.reduceat(coords, corners_first)
+        is_visible[is_visible] = (
+            np.all(coords_max > -1.0, axis=1) & np.all(coords_min < (width + 1.0, height + 1.0), axis=1)
+        )
+    is_edge_visible = np.repeat(is_visible, counts)
+
+    return (
+        coords[is_edge_visible],
+        coords[next_corner[is_edge_visible]],
+        np.repeat(np.arange(len(face_data)), counts)[is_edge_visible],
+        np.array([color for _, color in face_data], dtype=np.float32).reshape(-1, 3),
+    )
+
+
+def draw_tile(edges, row_start, row_end, width, opacity):
+    # Channels are stored one after the other while drawing.
+    pixels = np.zeros((4, (row_end - row_start) * width), dtype=np.float32)
+    draw_background_colors(pixels, edges, row_start, row_end, width, opacity)
+    draw_lines(pixels, edges, row_start, row_end, width)
+
+    pixels = np.rint(np.clip(pixels, 0.0, 1.0) * 255.0).astype(np.uint8)
+    return pixels.T.reshape(row_end - row_start, width, 4)
+
+
+def draw_background_colors(pixels, edges, row_start, row_end, width, opacity):
+    '''Fill the polygons, blending them in order, like the GPU draws their triangles'''
+    starts, ends, polygon_indices, polygon_colors = edges
+    y_min = np.minimum(starts[:, 1], ends[:, 1])
+    y_max = np.maximum(starts[:, 1], ends[:, 1])
+
+    # Rows with their pixel center in [y_min, y_max) cross the edge, so every row crosses a polygon an even number
+    # of times. Horizontal edges cross no rows.
+    edge_row_start = np.clip(np.ceil(y_min - 0.5), row_start, row_end).astype(np.int64)
+    edge_row_end = np.clip(np.ceil(y_max - 0.5), row_start, row_end).astype(np.int64)
+    edge_rows = edge_row_end - edge_row_start
+    crossing_edges = np.flatnonzero(edge_rows > 0)
+    if len(crossing_edges) == 0:
+        return
+    edge_rows = edge_rows[crossing_edges]
+
+    edge_of_crossing = np.repeat(crossing_edges, edge_rows)
+    rows = np.repeat(edge_row_start[crossing_edges] - np.cumsum(edge_rows) + edge_rows, edge_rows)
+    rows += np.arange(len(rows))
+    start, end = starts[edge_of_crossing], ends[edge_of_crossing]
+    x = start[:, 0] + (rows + 0.5 - start[:, 1]) * (end[:, 0] - start[:, 0]) / (end[:, 1] - start[:, 1])
+    polygon_indices = polygon_indices[edge_of_crossing]
+
+    # Pair up the crossings of each polygon with each row, the pixels in between are inside the polygon.
+    order = np.lexsort((x, rows, polygon_indices))
+    x, rows, polygon_indices = x[order], rows[order], polygon_indices[order]
+    span_start = np.clip(np.ceil(x[0::2] - 0.5), 0, width).astype(np.int64)
+    span_lengths = np.clip(np.ceil(x[1::2] - 0.5), 0, width).astype(np.int64) - span_start
+    spans = np.flatnonzero(span_lengths > 0)
+    if len(spans) == 0:
+        return
+    span_lengths = span_lengths[spans]
+
+    span_pixel_start = (rows[0::2][spans] - row_start) * width + span_start[spans]
+    span_pixel_end = span_pixel_start + span_lengths
+    span_colors = opacity * polygon_colors[polygon_indices[0::2][spans]]
+
+    # Count the polygons covering each pixel, by accumulating +1 at the start and -1 at the end of each span.
+    pixel_counts = np.cumsum(
+        np.bincount(span_pixel_start, minlength=pixels.shape[1] + 1) -
+        np.bincount(span_pixel_end, minlength=pixels.shape[1] + 1)
+    )[:-1]
+    # Blending the polygons covering a pixel in order means each one is faded by the ones drawn after it.
+    fading = (1.0 - opacity) ** np.arange(pixel_counts.max() + 1)
+    pixels[3] = 1.0 - fading[pixel_counts]
+
+    # Spans which don't overlap others are simply filled with their color, also by accumulating the differences.
+    overlaps_before = np.concatenate(((0,), np.cumsum(pixel_counts > 1)))
+    is_span_overlapping = overlaps_before[span_pixel_end] != overlaps_before[span_pixel_start]
+    is_span_single = ~is_span_overlapping
+    for channel in range(3):
+        channel_colors = span_colors[is_span_single, channel]
+        pixels[channel] = np.cumsum(
+            np.bincount(span_pixel_start[is_span_single], weights=channel_colors, minlength=pixels.shape[1] + 1) -
+            np.bincount(span_pixel_end[is_span_single], weights=channel_colors, minlength=pixels.shape[1] + 1)
+        )[:-1]
+
+    if not np.any(is_span_overlapping):
+        return
+
+    # Pixels of overlapping spans are blended one by one.
+    span_pixel_start = span_pixel_start[is_span_overlapping]
+    span_lengths = span_lengths[is_span_overlapping]
+    span_colors = span_colors[is_span_overlapping]
+    pixel_indices = np.repeat(span_pixel_start - np.cumsum(span_lengths) + span_lengths, span_lengths)
+    pixel_indices += np.arange(len(pixel_indices))
+    span_of_pixel = np.repeat(np.arange(len(span_lengths)), span_lengths)
+
+    # Spans are ordered by polygon, so sorting by pixel keeps the order of the polygons covering each pixel.
+    order = np.argsort(pixel_indices, kind='stable')
+    pixel_indices, span_of_pixel = pixel_indices[order], span_of_pixel[order]
+    pixel_counts = np.bincount(pixel_indices, minlength=pixels.shape[1])
+    first_of_pixel = np.cumsum(pixel_counts) - pixel_counts
+    drawn_after = first_of_pixel[pixel_indices] + pixel_counts[pixel_indices] - 1 - np.arange(len(pixel_indices))
+    weights = fading[drawn_after]
+    for channel in range(3):
+        pixels[channel] += np.bincount(
+            pixel_indices, weights=weights * span_colors[span_of_pixel, channel], minlength=pixels.shape[1],
+        )
+
+
+def draw_lines(pixels, edges, row_start, row_end, width):
+    '''Draw the polygon outlines as black anti-aliased lines, one pixel wide, like the poly-line shader'''
+    starts, ends = edges[:2]
+    delta = ends - starts
+    length = np.hypot(delta[:, 0], delta[:, 1])
+
+    # Pixels with their center closer than one pixel to a line are drawn, so only lines reaching that close to
+    # the rows of this tile matter.
+    y_min = np.minimum(starts[:, 1], ends[:, 1])
+    y_max = np.maximum(starts[:, 1], ends[:, 1])
+    lines = np.flatnonzero((length > 0.0) & (y_max > row_start - 1.0) & (y_min < row_end + 1.0))
+    if len(lines) == 0:
+        return
+    starts, delta, length = starts[lines], delta[lines], length[lines]
+
+    # Step along the major axis of each line, taking the pixels around the line across it.
+    x_major = np.abs(delta[:, 0]) >= np.abs(delta[:, 1])
+    major = np.where(x_major, 0, 1)
+    minor = 1 - major
+    lines = np.arange(len(lines))
+    start_major, start_minor = starts[lines, major], starts[lines, minor]
+    delta_major, delta_minor = delta[lines, major], delta[lines, minor]
+    slope = delta_minor / delta_major
+
+    # Limit the steps to the part of the line near this tile.
+    major_lo = np.minimum(start_major, start_major + delta_major) - 1.0
+    major_hi = np.maximum(start_major, start_major + delta_major) + 1.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tile_lo = np.where(x_major, start_major + (row_start - 2.0 - start_minor) / slope, row_start - 2.0)
+        tile_hi = np.where(x_major, start_major + (row_end + 2.0 - start_minor) / slope, row_end + 2.0)
+    tile_lo, tile_hi = np.minimum(tile_lo, tile_hi), np.maximum(tile_lo, tile_hi)
+    # Horizontal lines are near the tile over their whole length.
+    tile_lo[np.isnan(tile_lo)] = -np.inf
+    tile_hi[np.isnan(tile_hi)] = np.inf
+    # Lines stepping along rows only need the columns of the image.
+    tile_lo[x_major] = np.maximum(tile_lo[x_major], -1.0)
+    tile_hi[x_major] = np.minimum(tile_hi[x_major], width + 1.0)
+    step_start = np.ceil(np.maximum(major_lo, tile_lo) - 0.5).astype(np.int64)
+    step_end = np.ceil(np.minimum(major_hi, tile_hi) - 0.5).astype(np.int64)
+    steps = np.maximum(step_end - step_start, 0)
+
+    line_of_step = np.repeat(lines, steps)
+    step_major = np.repeat(step_start - np.cumsum(steps) + steps, steps) + np.arange(int(steps.sum()))
+    step_offset = step_major + 0.5 - start_major[line_of_step]
+    step_minor = start_minor[line_of_step] + step_offset * slope[line_of_step]
+
+    # The distance of a pixel center across the line is its offset along the minor axis, scaled by the cosine of
+    # the angle of the line with the major axis. So the line is less than one pixel away from at most three pixel
+    # centers around it, starting at the first one less than 1 / cosine away.
+    cosine = np.abs(delta_major) / length
+    step_cosine = cosine[line_of_step]
+    pixel_minor = np.ceil(step_minor - 0.5 - 1.0 / step_cosine).astype(np.int64)[:, np.newaxis] + np.arange(3)
+    across = np.abs(pixel_minor + (0.5 - step_minor[:, np.newaxis]))
+    across *= step_cosine[:, np.newaxis]
+    step_of_pixel, pixel_around = np.nonzero(across < 1.0)
+    across = across[step_of_pixel, pixel_around]
+    pixel_minor = pixel_minor[step_of_pixel, pixel_around]
+    pixel_major = step_major[step_of_pixel]
+    line_of_pixel = line_of_step[step_of_pixel]
+
+    # Only pixels with their center next to the line (not beyond its ends) are drawn.
+    along = (
+        step_offset[step_of_pixel] * delta_major[line_of_pixel] +
+        (pixel_minor + 0.5 - start_minor[line_of_pixel]) * delta_minor[line_of_pixel]
+    )
+    is_x_major = x_major[line_of_pixel]
+    pixel_x = np.where(is_x_major, pixel_major, pixel_minor)
+    pixel_y = np.where(is_x_major, pixel_minor, pixel_major)
+    drawn = (
+        (along >= 0.0) & (along <= length[line_of_pixel] ** 2) &
+        (pixel_x >= 0) & (pixel_x < width) & (pixel_y >= row_start) & (pixel_y < row_end)
+    )
+    pixel_indices = (pixel_y[drawn] - row_start) * width + pixel_x[drawn]
+
+    # Black lines only darken the pixels, by the product of the transparency of all lines over them.
+    with np.errstate(divide='ignore'):
+        transparency = np.exp(np.bincount(pixel_indices, weights=np.log(across[drawn]), minlength=pixels.shape[1]))
+
+    pixels[:3] *= transparency
+    pixels[3] = 1.0 - (1.0 - pixels[3]) * transparency
@@ -581,6 +581,16 @@ class ExportFBX(bpy.types.Operator, ExportHelper):
         default=True,
         options={'HIDDEN'},
     )
+    mesh_cache_dir: StringProperty(
+        name="Mesh Cache Directory",
+        description=(
+            "Directory of an on-disk cache of exported mesh geometry, "
+            "meshes unchanged since a previous export using the same settings are copied from the cache "
+            "(disabled when empty)"
+        ),
+        subtype='DIR_PATH',
+        options={'HIDDEN', 'SKIP_PRESET'},
+    )
 
     def draw(self, context):
         layout = self.layout
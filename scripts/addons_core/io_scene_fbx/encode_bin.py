@@ -4,14 +4,16 @@
 
 try:
     from . import data_types
-    from .fbx_utils_threading import MultiThreadedTaskConsumer
+    from .fbx_utils_threading import MultiThreadedTaskConsumer, new_cpu_bound_executor_cm
 except:
     import data_types
-    from fbx_utils_threading import MultiThreadedTaskConsumer
+    from fbx_utils_threading import MultiThreadedTaskConsumer, new_cpu_bound_executor_cm
 
 from struct import pack
 from contextlib import contextmanager
+from collections import deque
 import array
+import os
 import numpy as np
 import zlib
 
@@ -34,6 +36,16 @@ _FOOT_ID = b'\xfa\xbc\xab\x09\xd0\xc8\xd4\x66\xb1\x76\xfb\x83\x1c\xf7\x26\x7e'
 _ELEMS_ID_ALWAYS_BLOCK_SENTINEL = {b"AnimationStack", b"AnimationLayer"}
 
 
+def _insert_compressed_array(props, insert_at, data, length):
+    # zlib.compress releases the GIL, so can be multithreaded.
+    data = zlib.compress(data, 1)
+    comp_len = len(data)
+
+    encoding = 1
+    data = pack('<3I', length, encoding, comp_len) + data
+    props[insert_at] = data
+
+
 class FBXElem:
     __slots__ = (
         "id",
@@ -69,16 +81,7 @@ class FBXElem:
         orig_func = cls._add_compressed_array_helper
         orig_write = cls._write
 
-        def insert_compressed_array(props, insert_at, data, length):
-            # zlib.compress releases the GIL, so can be multithreaded.
-            data = zlib.compress(data, 1)
-            comp_len = len(data)
-
-            encoding = 1
-            data = pack('<3I', length, encoding, comp_len) + data
-            props[insert_at] = data
-
-        with MultiThreadedTaskConsumer.new_cpu_bound_cm(insert_compressed_array) as wrapped_func:
+        with MultiThreadedTaskConsumer.new_cpu_bound_cm(_insert_compressed_array) as wrapped_func:
             try:
                 def _add_compressed_array_helper_multi(self, data, length):
                     # Append a dummy value that will be replaced with the compressed array data later.
@@ -185,8 +188,8 @@ class FBXElem:
         self.props.append(data)
 
     def _add_compressed_array_helper(self, data, length):
-        """Note: This function may be swapped out by enable_multithreading_cm with an equivalent that supports
-        multithreading."""
+        """Note: This function may be swapped out by enable_multithreading_cm or FBXStreamWriter with an equivalent that
+        supports multithreading."""
         data = zlib.compress(data, 1)
         comp_len = len(data)
 
@@ -344,28 +347,34 @@ class FBXElem:
             write(_BLOCK_SENTINEL_DATA)
 
 
-def _write_timedate_hack(elem_root):
+def _write_timedate_hack_elem(elem):
     # perform 2 changes
     # - set the FileID
     # - set the CreationTime
+    # Returns True when `elem` was one of the changed elements.
+    if elem.id == b'FileId':
+        assert elem.props_type[0] == b'R'[0]
+        assert len(elem.props_type) == 1
+        elem.props.clear()
+        elem.props_type.clear()
+
+        elem.add_bytes(_FILE_ID)
+        return True
+    elif elem.id == b'CreationTime':
+        assert elem.props_type[0] == b'S'[0]
+        assert len(elem.props_type) == 1
+        elem.props.clear()
+        elem.props_type.clear()
+
+        elem.add_string(_TIME_ID)
+        return True
+    return False
 
+
+def _write_timedate_hack(elem_root):
     ok = 0
     for elem in elem_root.elems:
-        if elem.id == b'FileId':
-            assert elem.props_type[0] == b'R'[0]
-            assert len(elem.props_type) == 1
-            elem.props.clear()
-            elem.props_type.clear()
-
-            elem.add_bytes(_FILE_ID)
-            ok += 1
-        elif elem.id == b'CreationTime':
-            assert elem.props_type[0] == b'S'[0]
-            assert len(elem.props_type) == 1
-            elem.props.clear()
-            elem.props_type.clear()
-
-            elem.add_string(_TIME_ID)
+        if _write_timedate_hack_elem(elem):
             ok += 1
 
         if ok == 2:
@@ -396,6 +405,31 @@ def init_version(fbx_version):
     _BLOCK_SENTINEL_DATA = (b'\0' * _BLOCK_SENTINEL_LENGTH)
 
 
+def _write_head(write, version):
+    write(_HEAD_MAGIC)
+    write(pack('<I', version))
+
+
+def _write_foot(write, tell, version):
+    write(_FOOT_ID)
+    write(b'\x00' * 4)
+
+    # padding for alignment (values between 1 & 16 observed)
+    # if already aligned to 16, add a full 16 bytes padding.
+    ofs = tell()
+    pad = ((ofs + 15) & ~15) - ofs
+    if pad == 0:
+        pad = 16
+
+    write(b'\0' * pad)
+
+    write(pack('<I', version))
+
+    # unknown magic (always the same)
+    write(b'\0' * 120)
+    write(b'\xf8\x5a\x8c\x6a\xde\xf5\xd9\x7e\xec\xe9\x0c\xe3\x75\x8f\x29\x0b')
+
+
 def write(fn, elem_root, version):
     assert elem_root.id == b''
 
@@ -405,8 +439,7 @@ def write(fn, elem_root, version):
 
         init_version(version)
 
-        write(_HEAD_MAGIC)
-        write(pack('<I', version))
+        _write_head(write, version)
 
         # hack since we don't decode time.
         # ideally we would _not_ modify this data.
@@ -415,20 +448,214 @@ def write(fn, elem_root, version):
         elem_root._calc_offsets_children(tell(), False)
         elem_root._write_children(write, tell, False)
 
-        write(_FOOT_ID)
-        write(b'\x00' * 4)
+        _write_foot(write, tell, version)
+
+
+def elem_is_ready(elem):
+    """Return True when all arrays of `elem` and its children have finished compressing."""
+    for data in elem.props:
+        if data is ...:
+            return False
+    return all(elem_is_ready(sub_elem) for sub_elem in elem.elems)
+
+
+class FBXStreamWriter:
+    """Write an FBX file progressively, instead of building the whole element tree in memory and writing it at the end
+    with `write()`.
+
+    Elements are added to `root` (or to elements opened with `open_elem()`) as usual. `flush()` writes the completed
+    children of an open element to the file and removes them from the tree. Arrays are compressed on separate threads
+    and the compression tasks are waited on in the order they were submitted, so peak memory is bounded by the elements
+    that have not been written yet, rather than by the whole file.
 
-        # padding for alignment (values between 1 & 16 observed)
-        # if already aligned to 16, add a full 16 bytes padding.
-        ofs = tell()
-        pad = ((ofs + 15) & ~15) - ofs
-        if pad == 0:
-            pad = 16
+    Whether an element is the last child of its parent affects how it is written, so the last child of an open element
+    is only written once it is followed by another child or once its parent is closed. Opened elements are assumed not
+    to be the last child of their parent. The end offset of opened elements is back-patched when they are closed.
 
-        write(b'\0' * pad)
+    The output is identical to building the same tree and writing it with `write()`. The file is written to a temporary
+    file next to `fn`, which only replaces `fn` once writing succeeded, so a failed export keeps any existing file."""
 
-        write(pack('<I', version))
+    # Maximum number of arrays being compressed at the same time, before waiting on the oldest one.
+    MAX_PENDING_COMPRESSIONS = 64
+
+    __slots__ = (
+        "root",
+        "_fn",
+        "_fn_tmp",
+        "_version",
+        "_file",
+        "_open_elems",  # Stack of [elem, header_offset, has_written_children].
+        "_executor_cm",
+        "_pending",
+        "_timedate_hack_count",
+        "_orig_compressed_array_helper",
+    )
+
+    def __init__(self, fn, version):
+        self.root = FBXElem(b'')
+        self._fn = fn
+        self._fn_tmp = "%s.%d.tmp" % (fn, os.getpid())
+        self._version = version
+        self._file = None
+        self._open_elems = []
+        self._executor_cm = None
+        self._pending = deque()
+        self._timedate_hack_count = 0
+        self._orig_compressed_array_helper = None
+
+    def __enter__(self):
+        self._file = open(self._fn_tmp, 'wb')
+        init_version(self._version)
+        _write_head(self._file.write, self._version)
+        # The root element is never written itself, only its children.
+        self._open_elems.append([self.root, -1, False])
+
+        self._executor_cm = new_cpu_bound_executor_cm()
+        executor = self._executor_cm.__enter__()
+        if executor is not None:
+            pending = self._pending
+            max_pending = self.MAX_PENDING_COMPRESSIONS
+
+            def _add_compressed_array_helper_stream(elem, data, length):
+                # Append a dummy value that will be replaced with the compressed array data later.
+                elem.props.append(...)
+                insert_at = len(elem.props) - 1
+                pending.append(executor.submit(_insert_compressed_array, elem.props, insert_at, data, length))
+                if len(pending) > max_pending:
+                    pending.popleft().result()
+
+            self._orig_compressed_array_helper = FBXElem._add_compressed_array_helper
+            FBXElem._add_compressed_array_helper = _add_compressed_array_helper_stream
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        is_replaced = False
+        try:
+            try:
+                if exc_type is None:
+                    assert len(self._open_elems) == 1, "All opened elements must be closed"
+                    root, _header_offset, has_written_children = self._open_elems.pop()
+                    self._close_children(root, has_written_children)
+                    if self._timedate_hack_count != 2:
+                        print("Missing fields!")
+                    _write_foot(self._file.write, self._file.tell, self._version)
+            finally:
+                # Waits for any remaining compression tasks.
+                self._executor_cm.__exit__(exc_type, exc_value, traceback)
+                if self._orig_compressed_array_helper is not None:
+                    FBXElem._add_compressed_array_helper = self._orig_compressed_array_helper
+                    self._orig_compressed_array_helper = None
+                self._file.close()
+            if exc_type is None:
+                os.replace(self._fn_tmp, self._fn)
+                is_replaced = True
+        finally:
+            if not is_replaced:
+                # Leave any existing file untouched when the export failed.
+                try:
+                    os.remove(self._fn_tmp)
+                except OSError:
+                    pass
+        return False
+
+    def _wait_ready(self, elem):
+        # Compression tasks are waited on in submission order, which matches the order elements are written in.
+        pending = self._pending
+        while not elem_is_ready(elem):
+            pending.popleft().result()
+
+    def _pop_done(self):
+        pending = self._pending
+        while pending and pending[0].done():
+            pending.popleft().result()
+
+    def _write_elem(self, elem, is_last):
+        f = self._file
+        if len(self._open_elems) == 1 and self._timedate_hack_count != 2:
+            # hack since we don't decode time, see `write()`.
+            if _write_timedate_hack_elem(elem):
+                self._timedate_hack_count += 1
+        elem._calc_offsets(f.tell(), is_last)
+        elem._write(f.write, f.tell, is_last)
+
+    def flush(self, elem, wait=False):
+        """Write the children of the open element `elem` that have finished compressing, in order.
+
+        When `wait` is True, wait for all children (except the last one) to be ready to write."""
+        entry = self._open_elems[-1]
+        assert entry[0] is elem, "Only the most recently opened element can be flushed"
+        # The last child is held back until it's known whether it is the last one.
+        self._flush_entry(entry, len(elem.elems) - 1, wait)
+
+    def _flush_entry(self, entry, count, wait):
+        self._pop_done()
+
+        sub_elems = entry[0].elems
+        written = 0
+        for sub_elem in sub_elems[:count]:
+            if not elem_is_ready(sub_elem):
+                if not wait:
+                    break
+                self._wait_ready(sub_elem)
+            self._write_elem(sub_elem, False)
+            written += 1
+        if written:
+            del sub_elems[:written]
+            entry[2] = True
+
+    def open_elem(self, elem):
+        """Write the header and properties of `elem`, the last child of the most recently opened element, so that its
+        own children can be written with `flush()` as they are completed.
+
+        `elem` must not have any children yet."""
+        parent_entry = self._open_elems[-1]
+        parent = parent_entry[0]
+        assert parent.elems and parent.elems[-1] is elem
+        assert not elem.elems
+
+        # Everything preceding `elem` must be written first.
+        self._flush_entry(parent_entry, len(parent.elems) - 1, True)
+        parent.elems.clear()
+        parent_entry[2] = True
+
+        self._wait_ready(elem)
+        f = self._file
+        write = f.write
+        header_offset = f.tell()
+        props_length = sum(1 + len(data) for data in elem.props)
+        # The end offset is back-patched by `close_elem()`.
+        write(pack(_ELEM_META_FORMAT, 0, len(elem.props), props_length))
+        write(bytes((len(elem.id),)))
+        write(elem.id)
+        for i, data in enumerate(elem.props):
+            write(bytes((elem.props_type[i],)))
+            write(data)
 
-        # unknown magic (always the same)
-        write(b'\0' * 120)
-        write(b'\xf8\x5a\x8c\x6a\xde\xf5\xd9\x7e\xec\xe9\x0c\xe3\x75\x8f\x29\x0b')
+        self._open_elems.append([elem, header_offset, False])
+
+    def close_elem(self, elem):
+        """Write the remaining children of `elem` (opened with `open_elem()`) and back-patch its end offset."""
+        assert len(self._open_elems) > 1 and self._open_elems[-1][0] is elem
+        _elem, header_offset, has_written_children = self._open_elems.pop()
+        self._close_children(elem, has_written_children)
+
+        f = self._file
+        end_offset = f.tell()
+        f.seek(header_offset)
+        f.write(pack(_ELEM_META_FORMAT, end_offset, len(elem.props), sum(1 + len(data) for data in elem.props)))
+        f.seek(end_offset)
+
+    def _close_children(self, elem, has_written_children):
+        # Same logic as `FBXElem._write_children()`, with opened elements never being the last one.
+        sub_elems = elem.elems
+        if sub_elems:
+            elem_last = sub_elems[-1]
+            for sub_elem in sub_elems:
+                self._wait_ready(sub_elem)
+                self._write_elem(sub_elem, (sub_elem is elem_last))
+            sub_elems.clear()
+            has_written_children = True
+        if has_written_children:
+            self._file.write(_BLOCK_SENTINEL_DATA)
+        elif not elem.props or elem.id in _ELEMS_ID_ALWAYS_BLOCK_SENTINEL:
+            self._file.write(_BLOCK_SENTINEL_DATA)
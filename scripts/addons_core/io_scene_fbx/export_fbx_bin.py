@@ -54,6 +54,8 @@ from .fbx_utils import (
     MESH_ATTRIBUTE_SHARP_FACE, MESH_ATTRIBUTE_POSITION, MESH_ATTRIBUTE_MATERIAL_INDEX,
     # Mesh transform helpers.
     vcos_transformed, nors_transformed,
+    # Animation transform helpers.
+    matrices4_inverted_safe, matrices4_decompose_euler_compat,
     # UUID from key.
     get_fbx_uuid_from_key,
     # Key generators.
@@ -845,76 +847,44 @@ def fbx_data_mesh_shapes_elements(root, me_obj, me, scene_data, fbx_me_tmpl, fbx
                                 animatable=True)
 
 
-def fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes):
+def fbx_data_mesh_cache_settings(me_obj, me, scene_data, write_crease, geom_mat_co, geom_mat_no):
     """
-    Write the Mesh (Geometry) data block.
+    Everything besides the mesh data itself that affects the elements written by fbx_data_mesh_geometry_elements.
     """
-    # Ugly helper... :/
-    def _infinite_gen(val):
-        while 1:
-            yield val
-
-    me_key, me, _free = scene_data.data_meshes[me_obj]
-
-    # In case of multiple instances of same mesh, only write it once!
-    if me_key in done_meshes:
-        return
-
-    # No gscale/gmat here, all data are supposed to be in object space.
-    smooth_type = scene_data.settings.mesh_smooth_type
-    write_normals = True  # smooth_type in {'OFF'}
-
-    do_bake_space_transform = me_obj.use_bake_space_transform(scene_data)
-
-    # Vertices are in object space, but we are post-multiplying all transforms with the inverse of the
-    # global matrix, so we need to apply the global matrix to the vertices to get the correct result.
-    geom_mat_co = scene_data.settings.global_matrix if do_bake_space_transform else None
-    # We need to apply the inverse transpose of the global matrix when transforming normals.
-    geom_mat_no = Matrix(scene_data.settings.global_matrix_inv_transposed) if do_bake_space_transform else None
-    if geom_mat_no is not None:
-        # Remove translation & scaling!
-        geom_mat_no.translation = Vector()
-        geom_mat_no.normalize()
+    settings = scene_data.settings
+    me_fbxmaterials_idx = scene_data.mesh_material_indices.get(me)
+    if me_fbxmaterials_idx is not None:
+        materials_idx = (len(me_fbxmaterials_idx), tuple(me_fbxmaterials_idx.get(m) for m in me_obj.materials))
+    else:
+        materials_idx = None
+    active_color = me.color_attributes.active_color
+    return (
+        settings.mesh_smooth_type, settings.use_mesh_edges, settings.use_tspace, settings.colors_type,
+        settings.prioritize_active_color, bool(write_crease),
+        tuple(map(tuple, geom_mat_co)) if geom_mat_co is not None else None,
+        tuple(map(tuple, geom_mat_no)) if geom_mat_no is not None else None,
+        materials_idx,
+        me in scene_data.data_deformers_shape,
+        active_color.name if active_color else None,
+    )
 
-    geom = elem_data_single_int64(root, b"Geometry", get_fbx_uuid_from_key(me_key))
-    geom.add_string(fbx_name_class(me.name.encode(), b"Geometry"))
-    geom.add_string(b"Mesh")
 
-    tmpl = elem_props_template_init(scene_data.templates, b"Geometry")
-    props = elem_properties(geom)
+def fbx_data_mesh_report_tspace_ngons(me, scene_data):
+    scene_data.settings.report(
+        {'WARNING'},
+        tip_("Mesh '%s' has polygons with more than 4 vertices, "
+             "cannot compute/export tangent space for it") % me.name)
 
-    # Custom properties.
-    if scene_data.settings.use_custom_props:
-        fbx_data_element_custom_properties(props, me)
 
-    # Subdivision levels. Take them from the first found subsurf modifier from the
-    # first object that has the mesh. Always write crease information if present,
-    # if the modifier explicitly uses creases ("use_creases" setting) and mesh lacks them,
-    # still provide zeros (see TODO comment below)
-    write_crease = False
-    if scene_data.settings.use_subsurf:
-        last_subsurf = None
-        for mod in me_obj.bdata.modifiers:
-            if not (mod.show_render or mod.show_viewport):
-                continue
-            if mod.type == 'SUBSURF' and mod.subdivision_type == 'CATMULL_CLARK':
-                last_subsurf = mod
-
-        if last_subsurf:
-            elem_data_single_int32(geom, b"Smoothness", 2)  # Display control mesh and smoothed
-            if last_subsurf.boundary_smooth == "PRESERVE_CORNERS":
-                elem_data_single_int32(geom, b"BoundaryRule", 1)  # CreaseAll
-            else:
-                elem_data_single_int32(geom, b"BoundaryRule", 2)  # CreaseEdge
-            elem_data_single_int32(geom, b"PreviewDivisionLevels", last_subsurf.levels)
-            elem_data_single_int32(geom, b"RenderDivisionLevels", last_subsurf.render_levels)
-
-            elem_data_single_int32(geom, b"PreserveBorders", 0)
-            elem_data_single_int32(geom, b"PreserveHardEdges", 0)
-            elem_data_single_int32(geom, b"PropagateEdgeHardness", 0)
+def fbx_data_mesh_geometry_elements(geom, me_obj, me, scene_data, write_crease, geom_mat_co, geom_mat_no):
+    """
+    Write the vertices, polygons, edges and layers of the Mesh (Geometry) data block.
 
-            write_crease = last_subsurf.use_creases
-    write_crease = (write_crease or me.edge_creases)
+    Return whether the tangent space could not be exported because of polygons with more than 4 vertices.
+    """
+    tspace_has_ngons = False
+    smooth_type = scene_data.settings.mesh_smooth_type
+    write_normals = True  # smooth_type in {'OFF'}
 
     elem_data_single_int32(geom, b"GeometryVersion", FBX_GEOMETRY_VERSION)
 
@@ -1252,10 +1222,8 @@ def fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes):
                 me.polygons.foreach_get("loop_total", t_lt)
                 if (t_lt > 4).any():
                     del t_lt
-                    scene_data.settings.report(
-                        {'WARNING'},
-                        tip_("Mesh '%s' has polygons with more than 4 vertices, "
-                             "cannot compute/export tangent space for it") % me.name)
+                    tspace_has_ngons = True
+                    fbx_data_mesh_report_tspace_ngons(me, scene_data)
                 else:
                     del t_lt
                     num_loops = len(me.loops)
@@ -1573,6 +1541,97 @@ def fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes):
             elem_data_single_string(lay_tan, b"Type", b"LayerElementTangent")
             elem_data_single_int32(lay_tan, b"TypedIndex", tspaceidx)
 
+    return tspace_has_ngons
+
+
+def fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes):
+    """
+    Write the Mesh (Geometry) data block.
+    """
+    # Ugly helper... :/
+    def _infinite_gen(val):
+        while 1:
+            yield val
+
+    me_key, me, _free = scene_data.data_meshes[me_obj]
+
+    # In case of multiple instances of same mesh, only write it once!
+    if me_key in done_meshes:
+        return
+
+    # No gscale/gmat here, all data are supposed to be in object space.
+    do_bake_space_transform = me_obj.use_bake_space_transform(scene_data)
+
+    # Vertices are in object space, but we are post-multiplying all transforms with the inverse of the
+    # global matrix, so we need to apply the global matrix to the vertices to get the correct result.
+    geom_mat_co = scene_data.settings.global_matrix if do_bake_space_transform else None
+    # We need to apply the inverse transpose of the global matrix when transforming normals.
+    geom_mat_no = Matrix(scene_data.settings.global_matrix_inv_transposed) if do_bake_space_transform else None
+    if geom_mat_no is not None:
+        # Remove translation & scaling!
+        geom_mat_no.translation = Vector()
+        geom_mat_no.normalize()
+
+    geom = elem_data_single_int64(root, b"Geometry", get_fbx_uuid_from_key(me_key))
+    geom.add_string(fbx_name_class(me.name.encode(), b"Geometry"))
+    geom.add_string(b"Mesh")
+
+    tmpl = elem_props_template_init(scene_data.templates, b"Geometry")
+    props = elem_properties(geom)
+
+    # Custom properties.
+    if scene_data.settings.use_custom_props:
+        fbx_data_element_custom_properties(props, me)
+
+    # Subdivision levels. Take them from the first found subsurf modifier from the
+    # first object that has the mesh. Always write crease information if present,
+    # if the modifier explicitly uses creases ("use_creases" setting) and mesh lacks them,
+    # still provide zeros (see TODO comment below)
+    write_crease = False
+    if scene_data.settings.use_subsurf:
+        last_subsurf = None
+        for mod in me_obj.bdata.modifiers:
+            if not (mod.show_render or mod.show_viewport):
+                continue
+            if mod.type == 'SUBSURF' and mod.subdivision_type == 'CATMULL_CLARK':
+                last_subsurf = mod
+
+        if last_subsurf:
+            elem_data_single_int32(geom, b"Smoothness", 2)  # Display control mesh and smoothed
+            if last_subsurf.boundary_smooth == "PRESERVE_CORNERS":
+                elem_data_single_int32(geom, b"BoundaryRule", 1)  # CreaseAll
+            else:
+                elem_data_single_int32(geom, b"BoundaryRule", 2)  # CreaseEdge
+            elem_data_single_int32(geom, b"PreviewDivisionLevels", last_subsurf.levels)
+            elem_data_single_int32(geom, b"RenderDivisionLevels", last_subsurf.render_levels)
+
+            elem_data_single_int32(geom, b"PreserveBorders", 0)
+            elem_data_single_int32(geom, b"PreserveHardEdges", 0)
+            elem_data_single_int32(geom, b"PropagateEdgeHardness", 0)
+
+            write_crease = last_subsurf.use_creases
+    write_crease = (write_crease or me.edge_creases)
+
+    # Geometry data and layers, which may be retrieved from the mesh cache, if enabled.
+    mesh_cache = scene_data.settings.mesh_cache
+    geom_elems = None
+    if mesh_cache is not None:
+        cache_settings = fbx_data_mesh_cache_settings(me_obj, me, scene_data, write_crease, geom_mat_co, geom_mat_no)
+        cache_key = mesh_cache.mesh_key(me, cache_settings)
+        geom_elems = mesh_cache.load(cache_key)
+    if geom_elems is not None:
+        geom_elems, tspace_has_ngons = geom_elems
+        geom.elems.extend(geom_elems)
+        # Report the same warnings as when the cached elements were written.
+        if tspace_has_ngons:
+            fbx_data_mesh_report_tspace_ngons(me, scene_data)
+    else:
+        geom_elems_start = len(geom.elems)
+        tspace_has_ngons = fbx_data_mesh_geometry_elements(geom, me_obj, me, scene_data, write_crease,
+                                                           geom_mat_co, geom_mat_no)
+        if mesh_cache is not None:
+            mesh_cache.store_later(cache_key, geom.elems[geom_elems_start:], tspace_has_ngons)
+
     # Shape keys...
     fbx_data_mesh_shapes_elements(root, me_obj, me, scene_data, tmpl, props)
 
@@ -2327,85 +2386,121 @@ def fbx_animations_do(scene_data, ref_id, f_start, f_end, start_zero, objects=No
     real_currframes = currframes - f_start if start_zero else currframes
     real_currframes = (real_currframes / fps * FBX_KTIME).astype(np.int64)
 
-    # Generator that yields the animated values of each frame in order.
-    def frame_values_gen():
-        # Precalculate integer frames and subframes.
-        int_currframes = currframes.astype(int)
-        subframes = currframes - int_currframes
-
-        # Create simpler iterables that return only the values we care about.
-        animdata_shapes_only = [shape for _anim_shape, _me, shape in animdata_shapes.values()]
-        animdata_cameras_only = [camera for _anim_camera_lens, _anim_camera_focus_distance, camera
-                                 in animdata_cameras.values()]
-        # Previous frame's rotation for each object in animdata_ob, this will be updated each frame.
-        animdata_ob_p_rots = p_rots.values()
-
-        # Iterate through each frame and yield the values for that frame.
-        # Iterating .data, the memoryview of an array, is faster than iterating the array directly.
-        for int_currframe, subframe in zip(int_currframes.data, subframes.data):
-            scene.frame_set(int_currframe, subframe=subframe)
-
-            if has_animated_duplis:
-                # Changing the scene's frame invalidates existing dupli instances. To get the updated matrices of duplis
-                # for this frame, we must get the duplis from the depsgraph again.
-                for dup in depsgraph.object_instances:
-                    if (parent := dup.parent) and parent.original in dupli_parent_bdata:
-                        # ObjectWrapper caches its instances. Attempting to create a new instance updates the existing
-                        # ObjectWrapper instance with the current frame's matrix and then returns the existing instance.
-                        ObjectWrapper(dup)
-            next_p_rots = []
-            for ob_obj, p_rot in zip(animdata_ob, animdata_ob_p_rots):
-                # We compute baked loc/rot/scale for all objects (rot being euler-compat with previous value!).
-                loc, rot, scale, _m, _mr = ob_obj.fbx_object_tx(scene_data, rot_euler_compat=p_rot)
-                next_p_rots.append(rot)
-                yield from loc
-                yield from rot
-                yield from scale
-            animdata_ob_p_rots = next_p_rots
-            for shape in animdata_shapes_only:
-                yield shape.value
-            for camera in animdata_cameras_only:
-                yield camera.lens
-                yield camera.dof.focus_distance
-
-    # Providing `count` to np.fromiter pre-allocates the array, avoiding extra memory allocations while iterating.
-    num_ob_values = len(animdata_ob) * 9  # Location, rotation and scale, each of which have x, y, and z components
+    num_frames = len(real_currframes)
+
+    # Bones are sampled per armature, with a single `foreach_get()` of all pose bone matrices for each frame, other
+    # objects need their matrix to be computed one by one.
+    # {armature ObjectWrapper: [(index in animdata_ob, bone ObjectWrapper), ...]}
+    armatures_bones = {}
+    other_obs = []
+    for ob_idx, ob_obj in enumerate(animdata_ob):
+        if ob_obj.is_bone:
+            armatures_bones.setdefault(ob_obj.armature, []).append((ob_idx, ob_obj))
+        else:
+            other_obs.append((ob_idx, ob_obj))
+
+    # Preallocate the arrays of all sampled data.
+    # PoseBone.matrix is single precision, so sample into single precision arrays, which is faster with `foreach_get()`.
+    armatures_pose_matrices = []
+    for arm_obj in armatures_bones:
+        pose_bones = arm_obj.bdata.pose.bones
+        armatures_pose_matrices.append((pose_bones, np.empty((num_frames, len(pose_bones) * 16), dtype=np.single)))
+    other_ob_matrices = np.empty((num_frames, len(other_obs), 4, 4), dtype=float)
     num_shape_values = len(animdata_shapes)  # Only 1 value per shape key
     num_camera_values = len(animdata_cameras) * 2  # Focal length (`.lens`) and focus distance
-    num_values_per_frame = num_ob_values + num_shape_values + num_camera_values
-    num_frames = len(real_currframes)
-    all_values_flat = np.fromiter(frame_values_gen(), dtype=float, count=num_frames * num_values_per_frame)
+    all_values = np.empty((num_frames, num_shape_values + num_camera_values), dtype=float)
+
+    # Precalculate integer frames and subframes.
+    int_currframes = currframes.astype(int)
+    subframes = currframes - int_currframes
+
+    # Create simpler iterables that return only the values we care about.
+    animdata_shapes_only = [shape for _anim_shape, _me, shape in animdata_shapes.values()]
+    animdata_cameras_only = [camera for _anim_camera_lens, _anim_camera_focus_distance, camera
+                             in animdata_cameras.values()]
+
+    # Iterate through each frame and sample the values for that frame.
+    # Iterating .data, the memoryview of an array, is faster than iterating the array directly.
+    for frame_idx, int_currframe, subframe in zip(range(num_frames), int_currframes.data, subframes.data):
+        scene.frame_set(int_currframe, subframe=subframe)
+
+        if has_animated_duplis:
+            # Changing the scene's frame invalidates existing dupli instances. To get the updated matrices of duplis
+            # for this frame, we must get the duplis from the depsgraph again.
+            for dup in depsgraph.object_instances:
+                if (parent := dup.parent) and parent.original in dupli_parent_bdata:
+                    # ObjectWrapper caches its instances. Attempting to create a new instance updates the existing
+                    # ObjectWrapper instance with the current frame's matrix and then returns the existing instance.
+                    ObjectWrapper(dup)
+        for pose_bones, pose_matrices in armatures_pose_matrices:
+            pose_bones.foreach_get("matrix", pose_matrices[frame_idx])
+        frame_ob_matrices = other_ob_matrices[frame_idx]
+        for other_idx, (_ob_idx, ob_obj) in enumerate(other_obs):
+            frame_ob_matrices[other_idx] = ob_obj.fbx_object_matrix(scene_data)
+        frame_values = [shape.value for shape in animdata_shapes_only]
+        for camera in animdata_cameras_only:
+            frame_values.append(camera.lens)
+            frame_values.append(camera.dof.focus_distance)
+        all_values[frame_idx] = frame_values
 
     # Restore the scene's current frame.
     scene.frame_set(back_currframe, subframe=0.0)
 
-    # View such that each column is all values for a single frame and each row is all values for a single curve.
-    all_values = all_values_flat.reshape(num_frames, num_values_per_frame).T
-    # Split into views of the arrays for each curve type.
-    split_at = [num_ob_values, num_shape_values, num_camera_values]
-    # For unequal sized splits, np.split takes indices to split at, which can be acquired through a cumulative sum
-    # across the list.
-    # The last value isn't needed, because the last split is assumed to go to the end of the array.
-    split_at = np.cumsum(split_at[:-1])
-    all_ob_values, all_shape_key_values, all_camera_values = np.split(all_values, split_at)
-
     all_anims = []
 
     # Set location/rotation/scale curves.
-    # Split into equal sized views of the arrays for each object.
-    split_into = len(animdata_ob)
-    per_ob_values = np.split(all_ob_values, split_into) if split_into > 0 else ()
-    for anims, ob_values in zip(animdata_ob.values(), per_ob_values):
-        # Split again into equal sized views of the location, rotation and scaling arrays.
-        loc_xyz, rot_xyz, sca_xyz = np.split(ob_values, 3)
+    if animdata_ob:
+        # Gather the matrices of all objects for all frames, in the same order as `animdata_ob`.
+        ob_matrices = np.empty((num_frames, len(animdata_ob), 4, 4), dtype=float)
+        if other_obs:
+            ob_matrices[:, [ob_idx for ob_idx, _ob_obj in other_obs]] = other_ob_matrices
+        bone_correction_matrix = scene_data.settings.bone_correction_matrix
+        bone_correction_matrix_inv = scene_data.settings.bone_correction_matrix_inv
+        for bones, (pose_bones, pose_matrices) in zip(armatures_bones.values(), armatures_pose_matrices):
+            # Matrices are stored column by column in Blender.
+            pose_matrices = pose_matrices.reshape(num_frames, -1, 4, 4).swapaxes(-1, -2).astype(float)
+            pose_bone_indices = {pose_bone.name: idx for idx, pose_bone in enumerate(pose_bones)}
+            matrices = pose_matrices[:, [pose_bone_indices[bo_obj.bdata.name] for _ob_idx, bo_obj in bones]]
+
+            # Same as `ObjectWrapper.fbx_object_matrix()` for bones, but for all frames at once.
+            # PoseBone.matrix is in armature space, bring it back in the local space of the parent bone.
+            has_parent = np.array([bo_obj.bdata.parent is not None for _ob_idx, bo_obj in bones])
+            if has_parent.any():
+                parent_indices = [pose_bone_indices[bo_obj.bdata.parent.name] for _ob_idx, bo_obj in bones
+                                  if bo_obj.bdata.parent is not None]
+                # Only invert the matrix of each parent bone once.
+                parent_indices, parent_inverse = np.unique(parent_indices, return_inverse=True)
+                parent_matrices_inv = matrices4_inverted_safe(pose_matrices[:, parent_indices])
+                local_matrices = parent_matrices_inv[:, parent_inverse] @ matrices[:, has_parent]
+                # If we have a bone parent we need to undo the parent correction.
+                if bone_correction_matrix_inv:
+                    local_matrices = np.array(bone_correction_matrix_inv) @ local_matrices
+                matrices[:, has_parent] = local_matrices
+            # Apply the bone correction.
+            if bone_correction_matrix:
+                matrices = matrices @ np.array(bone_correction_matrix)
+            ob_matrices[:, [ob_idx for ob_idx, _bo_obj in bones]] = matrices
+
+        # Decompose all matrices at once, rotations being euler-compat with the previous frame's rotations.
+        euler_compat = np.array([tuple(p_rot) for p_rot in p_rots.values()], dtype=float)
+        locs, rots, scales = matrices4_decompose_euler_compat(ob_matrices, euler_compat)
         # In-place convert from Blender rotation to FBX rotation.
-        np.rad2deg(rot_xyz, out=rot_xyz)
-
-        anim_loc, anim_rot, anim_scale = anims
-        anim_loc.set_keyframes(real_currframes, loc_xyz)
-        anim_rot.set_keyframes(real_currframes, rot_xyz)
-        anim_scale.set_keyframes(real_currframes, sca_xyz)
-        all_anims.extend(anims)
+        np.rad2deg(rots, out=rots)
+
+        # View such that each row is all values of a single curve, copying the arrays so that each curve is contiguous
+        # in memory.
+        locs, rots, scales = (np.ascontiguousarray(values.transpose(1, 2, 0)) for values in (locs, rots, scales))
+        for anims, loc_xyz, rot_xyz, sca_xyz in zip(animdata_ob.values(), locs, rots, scales):
+            anim_loc, anim_rot, anim_scale = anims
+            anim_loc.set_keyframes(real_currframes, loc_xyz)
+            anim_rot.set_keyframes(real_currframes, rot_xyz)
+            anim_scale.set_keyframes(real_currframes, sca_xyz)
+            all_anims.extend(anims)
+
+    # View such that each row is all values for a single curve.
+    all_values = all_values.T
+    all_shape_key_values = all_values[:num_shape_values]
+    all_camera_values = all_values[num_shape_values:]
 
     # Set shape key curves.
     # There's only one array per shape key, so there's no need to split `all_shape_key_values`.
@@ -3386,14 +3481,28 @@ def fbx_definitions_elements(root, scene_data):
     fbx_templates_generate(definitions, scene_data.templates)
 
 
-def fbx_objects_elements(root, scene_data):
+def fbx_objects_elements(root, scene_data, stream=None):
     """
     Data (objects, geometry, material, textures, armatures, etc.).
+    When an encode_bin.FBXStreamWriter is given, elements are written to file as they are completed.
     """
     perfmon = PerfMon()
     perfmon.level_up()
     objects = elem_empty(root, b"Objects")
 
+    mesh_cache = scene_data.settings.mesh_cache
+
+    if stream is not None:
+        stream.open_elem(objects)
+
+        def flush():
+            if mesh_cache is not None:
+                mesh_cache.store_ready()
+            stream.flush(objects)
+    else:
+        def flush():
+            pass
+
     perfmon.step("FBX export fetch empties (%d)..." % len(scene_data.data_empties))
 
     for empty in scene_data.data_empties:
@@ -3415,6 +3524,7 @@ def fbx_objects_elements(root, scene_data):
     done_meshes = set()
     for me_obj in scene_data.data_meshes:
         fbx_data_mesh_elements(objects, me_obj, scene_data, done_meshes)
+        flush()
     del done_meshes
 
     perfmon.step("FBX export fetch objects (%d)..." % len(scene_data.objects))
@@ -3427,6 +3537,7 @@ def fbx_objects_elements(root, scene_data):
             if dp_obj not in scene_data.objects:
                 continue
             fbx_data_object_elements(objects, dp_obj, scene_data)
+        flush()
 
     perfmon.step("FBX export fetch remaining...")
 
@@ -3434,6 +3545,7 @@ def fbx_objects_elements(root, scene_data):
         if not (ob_obj.is_object and ob_obj.type == 'ARMATURE'):
             continue
         fbx_data_armature_elements(objects, ob_obj, scene_data)
+        flush()
 
     if scene_data.data_leaf_bones:
         fbx_data_leaf_bone_elements(objects, scene_data)
@@ -3452,6 +3564,9 @@ def fbx_objects_elements(root, scene_data):
 
     fbx_data_animation_elements(objects, scene_data)
 
+    if stream is not None:
+        stream.close_elem(objects)
+
     perfmon.level_down()
 
 
@@ -3526,6 +3641,7 @@ def save_single(operator, scene, depsgraph, filepath="",
                 armature_nodetype='NULL',
                 colors_type='SRGB',
                 prioritize_active_color=False,
+                mesh_cache_dir="",
                 **kwargs
                 ):
 
@@ -3592,9 +3708,20 @@ def save_single(operator, scene, depsgraph, filepath="",
         add_leaf_bones, bone_correction_matrix, bone_correction_matrix_inv,
         bake_anim, bake_anim_use_all_bones, bake_anim_use_nla_strips, bake_anim_use_all_actions,
         bake_anim_step, bake_anim_simplify_factor, bake_anim_force_startend_keying,
-        False, media_settings, use_custom_props, colors_type, prioritize_active_color
+        False, media_settings, use_custom_props, colors_type, prioritize_active_color,
+        None,
     )
 
+    # Opt-in cache of the geometry elements of meshes, for repeated exports of mostly unchanged scenes.
+    if mesh_cache_dir:
+        from .fbx_utils_cache import FBXMeshCache
+        from . import bl_info
+        mesh_cache = FBXMeshCache(bpy.path.abspath(mesh_cache_dir), salt=(bl_info["version"], FBX_VERSION))
+        del bl_info
+        settings = settings._replace(mesh_cache=mesh_cache)
+    else:
+        mesh_cache = None
+
     import bpy_extras.io_utils
 
     print('\nFBX export starting... %r' % filepath)
@@ -3603,11 +3730,10 @@ def save_single(operator, scene, depsgraph, filepath="",
     # Generate some data about exported scene...
     scene_data = fbx_data_from_scene(scene, depsgraph, settings)
 
-    # Enable multithreaded array compression in FBXElem and wait until all threads are done before exiting the context
-    # manager.
-    with encode_bin.FBXElem.enable_multithreading_cm():
-        # Writing elements into an FBX hierarchy can now begin.
-        root = elem_empty(None, b"")  # Root element has no id, as it is not saved per se!
+    # Write the FBX hierarchy to file as its top-level elements are completed, compressing arrays on separate threads.
+    # Exiting the context manager writes the remaining elements once all their arrays have been compressed.
+    with encode_bin.FBXStreamWriter(filepath, FBX_VERSION) as stream:
+        root = stream.root  # Root element has no id, as it is not saved per se!
 
         # Mostly FBXHeaderExtension and GlobalSettings.
         fbx_header_elements(root, scene_data)
@@ -3619,11 +3745,12 @@ def save_single(operator, scene, depsgraph, filepath="",
         # Templates definitions.
         fbx_definitions_elements(root, scene_data)
 
-        # Actual data.
-        fbx_objects_elements(root, scene_data)
+        # Actual data, written to file progressively.
+        fbx_objects_elements(root, scene_data, stream)
 
         # How data are inter-connected.
         fbx_connections_elements(root, scene_data)
+        stream.flush(root)
 
         # Animation.
         fbx_takes_elements(root, scene_data)
@@ -3631,8 +3758,11 @@ def save_single(operator, scene, depsgraph, filepath="",
         # Cleanup!
         fbx_scene_data_cleanup(scene_data)
 
-    # And we are done, all multithreaded tasks are complete, and we can write the whole thing to file!
-    encode_bin.write(filepath, root, FBX_VERSION)
+    if mesh_cache is not None:
+        # All arrays are compressed now, so the remaining new cache entries can be stored.
+        mesh_cache.store_all()
+        if bpy.app.debug_io:
+            print("FBX mesh cache: %d hits, %d misses" % (mesh_cache.hits, mesh_cache.misses))
 
     # Clear cached ObjectWrappers!
     ObjectWrapper.cache_clear()
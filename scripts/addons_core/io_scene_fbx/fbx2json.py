@@ -10,7 +10,8 @@ Usage
 
    fbx2json [FILES]...
 
-This script will write a JSON file for each FBX argument given.
+This script will write a JSON file for each FBX argument given,
+both binary and ASCII FBX files are supported.
 
 
 Output
@@ -304,7 +305,15 @@ def fbx2json(fn):
 
     fn_json = "%s.json" % os.path.splitext(fn)[0]
     print("Writing: %r " % fn_json, end="")
-    fbx_root_elem, fbx_version = parse(fn, use_namedtuple=True)
+    if parse_version(fn) == 0:
+        # Not a binary file, attempt to read it as an ASCII file.
+        try:
+            from . import parse_fbx_ascii
+        except ImportError:
+            import parse_fbx_ascii
+        fbx_root_elem, fbx_version = parse_fbx_ascii.parse(fn, use_namedtuple=True)
+    else:
+        fbx_root_elem, fbx_version = parse(fn, use_namedtuple=True)
     print("(Version %d) ..." % fbx_version)
 
     with open(fn_json, 'w', encoding="ascii", errors='xmlcharrefreplace') as f:
@@ -440,6 +440,198 @@ def nors_transformed(raw_nors, m=None, dtype=None):
     return _mat4_vec3_array_multiply(m, raw_nors, dtype)
 
 
+def matrices4_inverted_safe(matrices):
+    """Invert an array of 4d matrices, like calling mathutils.Matrix.inverted_safe() on each of them."""
+    inverted = np.empty_like(matrices)
+    invertible = np.linalg.det(matrices) != 0.0
+    inverted[invertible] = np.linalg.inv(matrices[invertible])
+    # Degenerate matrices (e.g. zero scale on some axis) are expected to be rare, so let mathutils handle them.
+    for idx in zip(*np.nonzero(~invertible)):
+        inverted[idx] = Matrix(matrices[idx].tolist()).inverted_safe()
+    return inverted
+
+
+def _mat3_normalized_to_quat_array(mat):
+    """Array version of mat3_normalized_to_quat_fast in math_rotation_c.cc, used by mathutils.Matrix.decompose().
+
+    `mat` is indexed like Blender's C matrices, that is mat[..., column, row]. The returned quaternions are
+    normalized."""
+    m00, m01, m02 = mat[..., 0, 0], mat[..., 0, 1], mat[..., 0, 2]
+    m10, m11, m12 = mat[..., 1, 0], mat[..., 1, 1], mat[..., 1, 2]
+    m20, m21, m22 = mat[..., 2, 0], mat[..., 2, 1], mat[..., 2, 2]
+
+    m22_negative = m22 < 0.0
+    m00_gt_m11 = m00 > m11
+    m00_lt_neg_m11 = m00 < -m11
+    # (branch mask, trace, negate `s` mask, index of the component computed from `s`, other components)
+    branches = (
+        (m22_negative & m00_gt_m11, 1.0 + m00 - m11 - m22, m12 < m21, 1,
+         ((0, m12 - m21), (2, m01 + m10), (3, m20 + m02))),
+        (m22_negative & ~m00_gt_m11, 1.0 - m00 + m11 - m22, m20 < m02, 2,
+         ((0, m20 - m02), (1, m01 + m10), (3, m12 + m21))),
+        (~m22_negative & m00_lt_neg_m11, 1.0 - m00 - m11 + m22, m01 < m10, 3,
+         ((0, m01 - m10), (1, m20 + m02), (2, m12 + m21))),
+        # A zero matrix falls through to this last branch, resulting in a quaternion without rotation.
+        (~m22_negative & ~m00_lt_neg_m11, 1.0 + m00 + m11 + m22, None, 0,
+         ((1, m12 - m21), (2, m20 - m02), (3, m01 - m10))),
+    )
+
+    quat = np.empty(mat.shape[:-2] + (4,), dtype=mat.dtype)
+    for mask, trace, negate_mask, s_idx, others in branches:
+        # The trace of the selected branch is always at least 1.0, so `s` is never zero.
+        s = 2.0 * np.sqrt(trace[mask])
+        if negate_mask is not None:
+            # Ensure W is non-negative for a canonical result.
+            s[negate_mask[mask]] *= -1.0
+        quat[mask, s_idx] = 0.25 * s
+        s_inv = 1.0 / s
+        for idx, value in others:
+            quat[mask, idx] = value[mask] * s_inv
+
+    quat /= np.linalg.norm(quat, axis=-1, keepdims=True)
+    return quat
+
+
+def _quat_to_mat3_array(quat):
+    """Array version of quat_to_mat3 in math_rotation_c.cc, the returned matrices are indexed like Blender's C
+    matrices, that is mat[..., column, row]."""
+    q0, q1, q2, q3 = np.moveaxis(quat * math.sqrt(2.0), -1, 0)
+    qda = q0 * q1
+    qdb = q0 * q2
+    qdc = q0 * q3
+    qaa = q1 * q1
+    qab = q1 * q2
+    qac = q1 * q3
+    qbb = q2 * q2
+    qbc = q2 * q3
+    qcc = q3 * q3
+
+    mat = np.empty(quat.shape[:-1] + (3, 3), dtype=quat.dtype)
+    mat[..., 0, 0] = 1.0 - qbb - qcc
+    mat[..., 0, 1] = qdc + qab
+    mat[..., 0, 2] = -qdb + qac
+    mat[..., 1, 0] = -qdc + qab
+    mat[..., 1, 1] = 1.0 - qaa - qcc
+    mat[..., 1, 2] = qda + qbc
+    mat[..., 2, 0] = qdb + qac
+    mat[..., 2, 1] = -qda + qbc
+    mat[..., 2, 2] = 1.0 - qaa - qbb
+    return mat
+
+
+def _mat3_normalized_to_eul2_array(mat):
+    """Array version of mat3_normalized_to_eul2 in math_rotation_c.cc, returning both possible 'XYZ' eulers of each
+    matrix, `mat` is indexed like Blender's C matrices, that is mat[..., column, row]."""
+    cy = np.hypot(mat[..., 0, 0], mat[..., 0, 1])
+    # EULER_HYPOT_EPSILON.
+    regular = cy > 0.0000375
+
+    eul1 = np.empty(mat.shape[:-2] + (3,), dtype=mat.dtype)
+    eul1[..., 0] = np.where(regular, np.arctan2(mat[..., 1, 2], mat[..., 2, 2]),
+                            np.arctan2(-mat[..., 2, 1], mat[..., 1, 1]))
+    eul1[..., 1] = np.arctan2(-mat[..., 0, 2], cy)
+    eul1[..., 2] = np.where(regular, np.arctan2(mat[..., 0, 1], mat[..., 0, 0]), 0.0)
+
+    eul2 = eul1.copy()
+    eul2[regular, 0] = np.arctan2(-mat[regular, 1, 2], -mat[regular, 2, 2])
+    eul2[regular, 1] = np.arctan2(-mat[regular, 0, 2], -cy[regular])
+    eul2[regular, 2] = np.arctan2(-mat[regular, 0, 1], -mat[regular, 0, 0])
+    return eul1, eul2
+
+
+def _compatible_eul_difference_array(eul, oldrot):
+    """Array version of compatible_eul in math_rotation_c.cc, returning the difference between the compatible version
+    of `eul` and `oldrot` instead of the compatible euler itself."""
+    pi_x2 = 2.0 * math.pi
+    deul = eul - oldrot
+    # Correct differences around 360 degrees first.
+    above = deul > math.pi
+    deul[above] -= np.floor(deul[above] / pi_x2 + 0.5) * pi_x2
+    below = deul < -math.pi
+    deul[below] += np.floor(-deul[below] / pi_x2 + 0.5) * pi_x2
+
+    # Check if each axis of rotation is larger than 180 degrees and the others are smaller than 90 degrees. The checks
+    # are all done against the differences from the first step.
+    abs_deul = np.abs(deul)
+    correction = np.zeros_like(deul)
+    for i, j, k in ((0, 1, 2), (1, 2, 0), (2, 0, 1)):
+        mask = ((abs_deul[..., i] > math.pi)
+                & (abs_deul[..., j] < math.pi / 2.0)
+                & (abs_deul[..., k] < math.pi / 2.0))
+        correction[mask, i] = np.where(deul[mask, i] > 0.0, -pi_x2, pi_x2)
+    deul += correction
+    return deul
+
+
+def matrices4_decompose_euler_compat(matrices, euler_compat):
+    """Decompose an array of 4d matrices of shape (num_frames, num_items, 4, 4) into arrays of locations, 'XYZ' euler
+    rotations and scales, each of shape (num_frames, num_items, 3).
+
+    This is equivalent to sampling, frame after frame, `loc, rot, scale = matrix.decompose()` followed by
+    `rot = rot.to_euler('XYZ', previous_frame_rot)`, where the rotation compatibility of the first frame is given by the
+    `euler_compat` array of shape (num_items, 3)."""
+    num_frames = len(matrices)
+    # Blender's C matrices are indexed by column first, swapping the axes makes porting its math functions easier.
+    bl_mat = np.swapaxes(matrices, -1, -2)
+
+    # mat4_decompose, see math_matrix_c.cc.
+    loc = bl_mat[..., 3, :3].copy()
+    rot_mat = bl_mat[..., :3, :3].copy()
+    scale = np.linalg.norm(rot_mat, axis=-1)
+    # Like normalize_v3_v3, (near) zero length axes become zero vectors.
+    scale[scale <= 1.0e-35] = 0.0
+    np.divide(rot_mat, scale[..., np.newaxis], out=rot_mat, where=scale[..., np.newaxis] != 0.0)
+    rot_mat[scale == 0.0] = 0.0
+    negative = np.linalg.det(rot_mat) < 0.0
+    rot_mat[negative] *= -1.0
+    scale[negative] *= -1.0
+    quat = _mat3_normalized_to_quat_array(rot_mat)
+
+    # Quaternion.to_euler('XYZ', compat), see quat_to_compatible_eul in math_rotation_c.cc.
+    candidates = _mat3_normalized_to_eul2_array(_quat_to_mat3_array(quat))
+
+    # Each frame picks whichever of its two candidate eulers is the closest to the previous frame's result, once made
+    # compatible with it. Compatibility only adds multiples of 360 degrees, so which candidate is the closest only
+    # depends on which candidate was picked in the previous frame. This gives, for each frame (but the first one, which
+    # is compared against `euler_compat`), the candidate to pick given each possible candidate picked in the previous
+    # frame.
+    def pick_second(current, previous):
+        d1 = np.abs(_compatible_eul_difference_array(current[0], previous)).sum(axis=-1)
+        d2 = np.abs(_compatible_eul_difference_array(current[1], previous)).sum(axis=-1)
+        return d1 > d2
+
+    first_frame = tuple(cand[:1] for cand in candidates)
+    next_frames = tuple(cand[1:] for cand in candidates)
+    previous_frames = tuple(cand[:-1] for cand in candidates)
+    pick_second_after_first = np.concatenate((pick_second(first_frame, euler_compat),
+                                              pick_second(next_frames, previous_frames[0])))
+    pick_second_after_second = np.concatenate((pick_second_after_first[:1],
+                                               pick_second(next_frames, previous_frames[1])))
+
+    # Frames where the same candidate is picked whatever the previous frame picked fully determine the pick, other
+    # frames either keep the previous frame's pick or swap it. The pick of each frame is thus the pick of the nearest
+    # previous determined frame, swapped as many times as there are swapping frames in-between.
+    frame_idx = np.arange(num_frames)[:, np.newaxis]
+    determined = pick_second_after_first == pick_second_after_second
+    swapping = pick_second_after_first & ~pick_second_after_second
+    last_determined_idx = np.maximum.accumulate(np.where(determined, frame_idx, 0), axis=0)
+    num_swaps = np.cumsum(swapping, axis=0)
+    swapped = (num_swaps - np.take_along_axis(num_swaps, last_determined_idx, axis=0)) % 2 == 1
+    picked_second = np.take_along_axis(pick_second_after_first, last_determined_idx, axis=0) ^ swapped
+    picked = np.where(picked_second[..., np.newaxis], candidates[1], candidates[0])
+
+    # Make the picked eulers compatible with each other, which only adds multiples of 360 degrees to them.
+    compat_diff = np.empty_like(picked)
+    compat_diff[0] = _compatible_eul_difference_array(picked[0], euler_compat)
+    compat_diff[1:] = _compatible_eul_difference_array(picked[1:], picked[:-1])
+    rot = np.cumsum(compat_diff, axis=0)
+    rot += euler_compat
+    # Snap to exact multiples of 360 degrees away from the picked eulers to get rid of accumulated rounding errors.
+    rot = picked + np.round((rot - picked) / (2.0 * math.pi)) * (2.0 * math.pi)
+
+    return loc, rot, scale
+
+
 def astype_view_signedness(arr, new_dtype):
     """Unsafely views arr as new_dtype if the itemsize and byteorder of arr matches but the signedness does not.
 
@@ -1347,75 +1539,80 @@ class AnimationCurveNodeWrapper:
 
         # Values are enabled for writing if they differ enough from either of their adjacent values or if they differ
         # enough from the closest previous value that is enabled due to either of these conditions.
-        for sampled_values, enabled_mask in zip(self._frame_values_array, self._frame_write_mask_array):
-            # Create overlapping views of the 'previous' (all but the last) and 'current' (all but the first)
-            # `sampled_values` and `enabled_mask`.
-            # Calculate absolute values from `sampled_values` so that the 'previous' and 'current' absolute arrays can
-            # be views into the same array instead of separately calculated arrays.
-            abs_sampled_values = np.abs(sampled_values)
-            # 'previous' views.
-            p_val_view = sampled_values[:-1]
-            p_abs_val_view = abs_sampled_values[:-1]
-            p_enabled_mask_view = enabled_mask[:-1]
-            # 'current' views.
-            c_val_view = sampled_values[1:]
-            c_abs_val_view = abs_sampled_values[1:]
-            c_enabled_mask_view = enabled_mask[1:]
-
-            # If enough difference from previous sampled value, enable the current value *and* the previous one!
-            # The difference check is symmetrical, so this will compare each value to both of its adjacent values.
-            # Unless it is forcefully enabled later, this is the only way that the first value can be enabled.
-            # This is a contracted form of relative + absolute-near-zero difference:
-            # def is_different(a, b):
-            #     abs_diff = abs(a - b)
-            #     if abs_diff < min_reldiff_fac * min_absdiff_fac:
-            #         return False
-            #     return (abs_diff / ((abs(a) + abs(b)) / 2)) > min_reldiff_fac
-            # Note that we ignore the '/ 2' part here, since it's not much significant for us.
-            # Contracted form using only builtin Python functions:
-            #     return abs(a - b) > (min_reldiff_fac * max(abs(a) + abs(b), min_absdiff_fac))
-            abs_diff = np.abs(c_val_view - p_val_view)
-            different_if_greater_than = min_reldiff_fac * np.maximum(c_abs_val_view + p_abs_val_view, min_absdiff_fac)
-            enough_diff_p_val_mask = abs_diff > different_if_greater_than
-            # Enable both the current values *and* the previous values where `enough_diff_p_val_mask` is True. Some
-            # values may get set to True twice because the views overlap, but this is not a problem.
-            p_enabled_mask_view[enough_diff_p_val_mask] = True
-            c_enabled_mask_view[enough_diff_p_val_mask] = True
-
-            # Else, if enough difference from previous enabled value, enable the current value only!
-            # For each 'current' value, get the index of the nearest previous enabled value in `sampled_values` (or
-            # itself if the value is enabled).
-            # Start with an array that is the index of the 'current' value in `sampled_values`. The 'current' values are
-            # all but the first value, so the indices will be from 1 to `len(sampled_values)` exclusive.
-            # Let len(sampled_values) == 9:
-            #   [1, 2, 3, 4, 5, 6, 7, 8]
-            p_enabled_idx_in_sampled_values = np.arange(1, len(sampled_values))
-            # Replace the indices of all disabled values with 0 in preparation of filling them in with the index of the
-            # nearest previous enabled value. We choose to replace with 0 so that if there is no nearest previous
-            # enabled value, we instead default to `sampled_values[0]`.
-            c_val_disabled_mask = ~c_enabled_mask_view
-            # Let `c_val_disabled_mask` be:
-            #   [F, F, T, F, F, T, T, T]
-            # Set indices to 0 where `c_val_disabled_mask` is True:
-            #   [1, 2, 3, 4, 5, 6, 7, 8]
-            #          v        v  v  v
-            #   [1, 2, 0, 4, 5, 0, 0, 0]
-            p_enabled_idx_in_sampled_values[c_val_disabled_mask] = 0
-            # Accumulative maximum travels across the array from left to right, filling in the zeroed indices with the
-            # maximum value so far, which will be the closest previous enabled index because the non-zero indices are
-            # strictly increasing.
-            #   [1, 2, 0, 4, 5, 0, 0, 0]
-            #          v        v  v  v
-            #   [1, 2, 2, 4, 5, 5, 5, 5]
-            p_enabled_idx_in_sampled_values = np.maximum.accumulate(p_enabled_idx_in_sampled_values)
-            # Only disabled values need to be checked against their nearest previous enabled values.
-            # We can additionally ignore all values which equal their immediately previous value because those values
-            # will never be enabled if they were not enabled by the earlier difference check against immediately
-            # previous values.
-            p_enabled_diff_to_check_mask = np.logical_and(c_val_disabled_mask, p_val_view != c_val_view)
+        # All curves are processed at once, each row of `sampled_values` and `enabled_mask` being a separate curve.
+        sampled_values = self._frame_values_array
+        enabled_mask = self._frame_write_mask_array
+        # Create overlapping views of the 'previous' (all but the last) and 'current' (all but the first)
+        # `sampled_values` and `enabled_mask`.
+        # Calculate absolute values from `sampled_values` so that the 'previous' and 'current' absolute arrays can
+        # be views into the same array instead of separately calculated arrays.
+        abs_sampled_values = np.abs(sampled_values)
+        # 'previous' views.
+        p_val_view = sampled_values[:, :-1]
+        p_abs_val_view = abs_sampled_values[:, :-1]
+        p_enabled_mask_view = enabled_mask[:, :-1]
+        # 'current' views.
+        c_val_view = sampled_values[:, 1:]
+        c_abs_val_view = abs_sampled_values[:, 1:]
+        c_enabled_mask_view = enabled_mask[:, 1:]
+
+        # If enough difference from previous sampled value, enable the current value *and* the previous one!
+        # The difference check is symmetrical, so this will compare each value to both of its adjacent values.
+        # Unless it is forcefully enabled later, this is the only way that the first value can be enabled.
+        # This is a contracted form of relative + absolute-near-zero difference:
+        # def is_different(a, b):
+        #     abs_diff = abs(a - b)
+        #     if abs_diff < min_reldiff_fac * min_absdiff_fac:
+        #         return False
+        #     return (abs_diff / ((abs(a) + abs(b)) / 2)) > min_reldiff_fac
+        # Note that we ignore the '/ 2' part here, since it's not much significant for us.
+        # Contracted form using only builtin Python functions:
+        #     return abs(a - b) > (min_reldiff_fac * max(abs(a) + abs(b), min_absdiff_fac))
+        abs_diff = np.abs(c_val_view - p_val_view)
+        different_if_greater_than = min_reldiff_fac * np.maximum(c_abs_val_view + p_abs_val_view, min_absdiff_fac)
+        enough_diff_p_val_mask = abs_diff > different_if_greater_than
+        # Enable both the current values *and* the previous values where `enough_diff_p_val_mask` is True. Some
+        # values may get set to True twice because the views overlap, but this is not a problem.
+        p_enabled_mask_view[enough_diff_p_val_mask] = True
+        c_enabled_mask_view[enough_diff_p_val_mask] = True
+
+        # Else, if enough difference from previous enabled value, enable the current value only!
+        # For each 'current' value, get the index of the nearest previous enabled value in its row of `sampled_values`
+        # (or itself if the value is enabled).
+        # Start with an array that is the index of the 'current' value in its row of `sampled_values`. The 'current'
+        # values are all but the first value, so the indices will be from 1 to `len(sampled_values[0])` exclusive.
+        # Let len(sampled_values[0]) == 9:
+        #   [1, 2, 3, 4, 5, 6, 7, 8]
+        p_enabled_idx_in_sampled_values = np.tile(np.arange(1, sampled_values.shape[1]), (len(sampled_values), 1))
+        # Replace the indices of all disabled values with 0 in preparation of filling them in with the index of the
+        # nearest previous enabled value. We choose to replace with 0 so that if there is no nearest previous
+        # enabled value, we instead default to the first value of the row.
+        c_val_disabled_mask = ~c_enabled_mask_view
+        # Let `c_val_disabled_mask` be:
+        #   [F, F, T, F, F, T, T, T]
+        # Set indices to 0 where `c_val_disabled_mask` is True:
+        #   [1, 2, 3, 4, 5, 6, 7, 8]
+        #          v        v  v  v
+        #   [1, 2, 0, 4, 5, 0, 0, 0]
+        p_enabled_idx_in_sampled_values[c_val_disabled_mask] = 0
+        # Accumulative maximum travels across each row from left to right, filling in the zeroed indices with the
+        # maximum value so far, which will be the closest previous enabled index because the non-zero indices are
+        # strictly increasing.
+        #   [1, 2, 0, 4, 5, 0, 0, 0]
+        #          v        v  v  v
+        #   [1, 2, 2, 4, 5, 5, 5, 5]
+        p_enabled_idx_in_sampled_values = np.maximum.accumulate(p_enabled_idx_in_sampled_values, axis=1)
+        # Only disabled values need to be checked against their nearest previous enabled values.
+        # We can additionally ignore all values which equal their immediately previous value because those values
+        # will never be enabled if they were not enabled by the earlier difference check against immediately
+        # previous values.
+        p_enabled_diff_to_check_mask = np.logical_and(c_val_disabled_mask, p_val_view != c_val_view)
+
+        # The remaining checks are done row by row, skipping rows without any value to check, e.g. constant curves.
+        for row in np.flatnonzero(np.any(p_enabled_diff_to_check_mask, axis=1)):
             # Convert from a mask to indices because we need the indices later and because the array of indices will
             # usually be smaller than the mask array making it faster to index other arrays with.
-            p_enabled_diff_to_check_idx = np.flatnonzero(p_enabled_diff_to_check_mask)
+            p_enabled_diff_to_check_idx = np.flatnonzero(p_enabled_diff_to_check_mask[row])
             # `p_enabled_idx_in_sampled_values` from earlier:
             #   [1, 2, 2, 4, 5, 5, 5, 5]
             # `p_enabled_diff_to_check_mask` assuming no values equal their immediately previous value:
@@ -1424,12 +1621,12 @@ class AnimationCurveNodeWrapper:
             #   [      2,       5, 6, 7]
             # `p_enabled_idx_in_sampled_values_to_check`:
             #   [      2,       5, 5, 5]
-            p_enabled_idx_in_sampled_values_to_check = p_enabled_idx_in_sampled_values[p_enabled_diff_to_check_idx]
+            p_enabled_idx_in_sampled_values_to_check = p_enabled_idx_in_sampled_values[row][p_enabled_diff_to_check_idx]
             # Get the 'current' disabled values that need to be checked.
-            c_val_to_check = c_val_view[p_enabled_diff_to_check_idx]
-            c_abs_val_to_check = c_abs_val_view[p_enabled_diff_to_check_idx]
+            c_val_to_check = c_val_view[row][p_enabled_diff_to_check_idx]
+            c_abs_val_to_check = c_abs_val_view[row][p_enabled_diff_to_check_idx]
             # Get the nearest previous enabled value for each value to be checked.
-            nearest_p_enabled_val = sampled_values[p_enabled_idx_in_sampled_values_to_check]
+            nearest_p_enabled_val = sampled_values[row][p_enabled_idx_in_sampled_values_to_check]
             abs_nearest_p_enabled_val = np.abs(nearest_p_enabled_val)
             # Check the relative + absolute-near-zero difference again, but against the nearest previous enabled value
             # this time.
@@ -1450,46 +1647,47 @@ class AnimationCurveNodeWrapper:
             #   [2, 5,>6<,5]
             # But 6 > 5, so the next value's nearest previous enabled index is also affected:
             #   [2, 5, 6,>6<]
-            # We had calculated a newly enabled index of 7 too, but that was calculated against the old nearest previous
-            # enabled index of 5, which has now been updated to 6, so whether 7 is enabled or not needs to be
+            # We had calculated a newly enabled index of 7 too, but that was calculated against the old nearest
+            # previous enabled index of 5, which has now been updated to 6, so whether 7 is enabled or not needs to be
             # recalculated:
             #   [F, F, T, ?]
-            if np.any(enough_diff_p_enabled_val_mask):
-                # Accessing .data, the memoryview of the array, iteratively or by individual index is faster than doing
-                # the same with the array itself.
-                zipped = zip(p_enabled_diff_to_check_idx.data,
-                             c_val_to_check.data,
-                             c_abs_val_to_check.data,
-                             p_enabled_idx_in_sampled_values_to_check.data,
-                             enough_diff_p_enabled_val_mask.data)
-                # While iterating, we could set updated values into `enough_diff_p_enabled_val_mask` as we go and then
-                # update `enabled_mask` in bulk after the iteration, but if we're going to update an array while
-                # iterating, we may as well update `enabled_mask` directly instead and skip the bulk update.
-                # Additionally, the number of `True` writes to `enabled_mask` is usually much less than the number of
-                # updates that would be required to `enough_diff_p_enabled_val_mask`.
-                c_enabled_mask_view_mv = c_enabled_mask_view.data
-
-                # While iterating, keep track of the most recent newly enabled index, so we can tell when we need to
-                # recalculate whether the current value needs to be enabled.
-                new_p_enabled_idx = -1
-                # Keep track of its value too for performance.
-                new_p_enabled_val = -1
-                new_abs_p_enabled_val = -1
-                for cur_idx, c_val, c_abs_val, old_p_enabled_idx, enough_diff in zipped:
-                    if new_p_enabled_idx > old_p_enabled_idx:
-                        # The nearest previous enabled value is newly enabled and was not included when
-                        # `enough_diff_p_enabled_val_mask` was calculated, so whether the current value is different
-                        # enough needs to be recalculated using the newly enabled value.
-                        # Check if the relative + absolute-near-zero difference is enough to enable this value.
-                        enough_diff = (abs(c_val - new_p_enabled_val)
-                                       > (min_reldiff_fac * max(c_abs_val + new_abs_p_enabled_val, min_absdiff_fac)))
-                    if enough_diff:
-                        # The current value needs to be enabled.
-                        c_enabled_mask_view_mv[cur_idx] = True
-                        # Update the index and values for this newly enabled value.
-                        new_p_enabled_idx = cur_idx
-                        new_p_enabled_val = c_val
-                        new_abs_p_enabled_val = c_abs_val
+            if not np.any(enough_diff_p_enabled_val_mask):
+                continue
+            # Accessing .data, the memoryview of the array, iteratively or by individual index is faster than doing
+            # the same with the array itself.
+            zipped = zip(p_enabled_diff_to_check_idx.data,
+                         c_val_to_check.data,
+                         c_abs_val_to_check.data,
+                         p_enabled_idx_in_sampled_values_to_check.data,
+                         enough_diff_p_enabled_val_mask.data)
+            # While iterating, we could set updated values into `enough_diff_p_enabled_val_mask` as we go and then
+            # update `enabled_mask` in bulk after the iteration, but if we're going to update an array while
+            # iterating, we may as well update `enabled_mask` directly instead and skip the bulk update.
+            # Additionally, the number of `True` writes to `enabled_mask` is usually much less than the number of
+            # updates that would be required to `enough_diff_p_enabled_val_mask`.
+            c_enabled_mask_view_mv = c_enabled_mask_view[row].data
+
+            # While iterating, keep track of the most recent newly enabled index, so we can tell when we need to
+            # recalculate whether the current value needs to be enabled.
+            new_p_enabled_idx = -1
+            # Keep track of its value too for performance.
+            new_p_enabled_val = -1
+            new_abs_p_enabled_val = -1
+            for cur_idx, c_val, c_abs_val, old_p_enabled_idx, enough_diff in zipped:
+                if new_p_enabled_idx > old_p_enabled_idx:
+                    # The nearest previous enabled value is newly enabled and was not included when
+                    # `enough_diff_p_enabled_val_mask` was calculated, so whether the current value is different
+                    # enough needs to be recalculated using the newly enabled value.
+                    # Check if the relative + absolute-near-zero difference is enough to enable this value.
+                    enough_diff = (abs(c_val - new_p_enabled_val)
+                                   > (min_reldiff_fac * max(c_abs_val + new_abs_p_enabled_val, min_absdiff_fac)))
+                if enough_diff:
+                    # The current value needs to be enabled.
+                    c_enabled_mask_view_mv[cur_idx] = True
+                    # Update the index and values for this newly enabled value.
+                    new_p_enabled_idx = cur_idx
+                    new_p_enabled_val = c_val
+                    new_abs_p_enabled_val = c_abs_val
 
         # If we write nothing (action doing nothing) and are in 'force_keep' mode, we key everything! :P
         # See T41766.
@@ -1910,7 +2108,8 @@ FBXExportSettings = namedtuple("FBXExportSettings", (
     "bone_correction_matrix", "bone_correction_matrix_inv",
     "bake_anim", "bake_anim_use_all_bones", "bake_anim_use_nla_strips", "bake_anim_use_all_actions",
     "bake_anim_step", "bake_anim_simplify_factor", "bake_anim_force_startend_keying",
-    "use_metadata", "media_settings", "use_custom_props", "colors_type", "prioritize_active_color"
+    "use_metadata", "media_settings", "use_custom_props", "colors_type", "prioritize_active_color",
+    "mesh_cache",
 ))
 
 # Helper container gathering some data we need multiple times:
@@ -0,0 +1,137 @@
+# SPDX-FileCopyrightText: 2025 Blender Authors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import hashlib
+import os
+import pickle
+
+import numpy as np
+
+from . import encode_bin
+from .fbx_utils import _attribute_data_type_info_lookup
+
+# Increment when the format of the cached data or the way the cache keys are computed changes.
+_MESH_CACHE_VERSION = 3
+
+
+def _elem_to_tuple(elem):
+    return (elem.id, elem.props, bytes(elem.props_type), [_elem_to_tuple(sub_elem) for sub_elem in elem.elems])
+
+
+def _elem_from_tuple(elem_tuple):
+    elem_id, props, props_type, sub_elems = elem_tuple
+    elem = encode_bin.FBXElem(elem_id)
+    elem.props = props
+    elem.props_type = bytearray(props_type)
+    elem.elems = [_elem_from_tuple(sub_elem) for sub_elem in sub_elems]
+    return elem
+
+
+class FBXMeshCache:
+    """On-disk cache of the encoded geometry elements (vertices, polygons, edges, layers) of exported meshes.
+
+    Entries are keyed by a hash of the evaluated mesh data and of the export settings affecting these elements. Cached
+    elements store their properties already encoded (and arrays already compressed), so meshes that did not change
+    since a previous export are written without recomputing or recompressing anything, producing identical output.
+    Each entry also stores some extra (picklable) data, e.g. to report the same warnings as when writing the elements.
+
+    Elements are only stored once all their arrays have been compressed, see `store_ready()`."""
+    __slots__ = (
+        "cache_dir",
+        "_salt",
+        "_pending",
+        "hits",
+        "misses",
+    )
+
+    def __init__(self, cache_dir, salt=b""):
+        self.cache_dir = cache_dir
+        # Extra data included in every key, e.g. the add-on version.
+        self._salt = salt
+        # List of (key, elems, extra) waiting for their arrays to be compressed before they can be stored.
+        self._pending = []
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def mesh_key(self, me, settings_key):
+        """Return the cache key of the evaluated mesh `me`.
+
+        `settings_key` must be a tuple of everything besides the mesh data that affects the cached elements."""
+        h = hashlib.sha256()
+        h.update(repr((_MESH_CACHE_VERSION, self._salt, settings_key)).encode())
+        h.update(repr((len(me.vertices), len(me.edges), len(me.polygons), len(me.loops))).encode())
+        h.update(repr(([uvl.name for uvl in me.uv_layers], [col.name for col in me.color_attributes])).encode())
+
+        # How corners are grouped into faces is not stored as an attribute.
+        loop_starts = np.empty(len(me.polygons), dtype=np.uintc)
+        me.polygons.foreach_get("loop_start", loop_starts)
+        h.update(loop_starts)
+
+        for attr in me.attributes:
+            h.update(repr((attr.name, attr.data_type, attr.domain, len(attr.data))).encode())
+            data_type_info = _attribute_data_type_info_lookup.get(attr.data_type)
+            if data_type_info is None or data_type_info.dtype is None:
+                # Not usable with foreach_get, such attributes are not exported.
+                continue
+            data = np.empty(len(attr.data) * data_type_info.item_size, dtype=data_type_info.dtype)
+            attr.data.foreach_get(data_type_info.foreach_attribute, data)
+            h.update(data)
+
+        # Normals depend on more than the attributes (e.g. custom normals), so they are hashed directly.
+        h.update(me.normals_domain.encode())
+        normals = np.empty(len(me.corner_normals) * 3, dtype=np.single)
+        me.corner_normals.foreach_get("vector", normals)
+        h.update(normals)
+
+        return h.hexdigest()
+
+    def _path_from_key(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".pickle")
+
+    def load(self, key):
+        """Return the (list of cached elements, extra data) for `key`, or None if they are not in the cache."""
+        try:
+            with open(self._path_from_key(key), 'rb') as fh:
+                elem_tuples, extra = pickle.load(fh)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as ex:
+            # Treat corrupt or incompatible entries as missing, they will be overwritten.
+            print("FBX mesh cache: failed to read entry %r (%s)" % (key, ex))
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [_elem_from_tuple(elem_tuple) for elem_tuple in elem_tuples], extra
+
+    def store_later(self, key, elems, extra=None):
+        """Store `elems` and `extra` for `key` once all their arrays have been compressed."""
+        self._pending.append((key, elems, extra))
+
+    def _store(self, key, elems, extra):
+        filepath = self._path_from_key(key)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        # Write to a temporary file first, so concurrent exports never read partially written entries.
+        filepath_tmp = "%s.%d.tmp" % (filepath, os.getpid())
+        with open(filepath_tmp, 'wb') as fh:
+            pickle.dump(([_elem_to_tuple(elem) for elem in elems], extra), fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(filepath_tmp, filepath)
+
+    def store_ready(self):
+        """Store the pending elements whose arrays have all been compressed."""
+        still_pending = []
+        for key, elems, extra in self._pending:
+            if all(encode_bin.elem_is_ready(elem) for elem in elems):
+                self._store(key, elems, extra)
+            else:
+                still_pending.append((key, elems, extra))
+        self._pending = still_pending
+
+    def store_all(self):
+        """Store all pending elements, must only be called once all arrays have been compressed."""
+        for key, elems, extra in self._pending:
+            assert all(encode_bin.elem_is_ready(elem) for elem in elems)
+            self._store(key, elems, extra)
+        self._pending.clear()
@@ -41,6 +41,21 @@ def get_cpu_count():
     return count if count is not None else 1
 
 
+def new_cpu_bound_executor_cm(other_cpu_bound_threads_in_use=1, hard_max_threads=32):
+    """Return a context manager that, when entered, returns a ThreadPoolExecutor sized for CPU-bound tasks that release
+    the GIL, or None if the system can't use multithreading.
+
+    Unlike MultiThreadedTaskConsumer, each submitted task returns a Future, so this is suitable when the caller needs to
+    wait for specific tasks to complete, at the cost of a higher overhead per task."""
+    if _MULTITHREADING_ENABLED:
+        max_threads = get_cpu_count() - other_cpu_bound_threads_in_use
+        max_threads = min(max_threads, hard_max_threads)
+        if max_threads > 0:
+            return ThreadPoolExecutor(max_workers=max_threads)
+    # Fall back to single-threaded.
+    return nullcontext(None)
+
+
 class MultiThreadedTaskConsumer:
     """Helper class that encapsulates everything needed to run a function on separate threads, with a single-threaded
     fallback if multi-threading is not available.
@@ -56,6 +56,10 @@ from .fbx_utils import (
 
 LINEAR_INTERPOLATION_VALUE = bpy.types.Keyframe.bl_rna.properties['interpolation'].enum_items['LINEAR'].value
 
+# Files of this size or larger are memory-mapped and have their arrays decoded lazily,
+# since most of their memory and parsing time would otherwise go to arrays that may never be used.
+FBX_LAZY_PARSE_MIN_SIZE = 256 * 1024 * 1024
+
 # global singleton, assign on execution
 fbx_elem_nil = None
 
@@ -3066,7 +3070,7 @@ def load(operator, context, filepath="",
     import time
     from bpy_extras.io_utils import axis_conversion
 
-    from . import parse_fbx
+    from . import parse_fbx, parse_fbx_ascii
     from .fbx_utils import RIGHT_HAND_AXES, FBX_FRAMERATES
 
     start_time_proc = time.process_time()
@@ -3077,33 +3081,22 @@ def load(operator, context, filepath="",
     perfmon.step("FBX Import: start importing %s" % filepath)
     perfmon.level_up()
 
-    # Detect ASCII files.
+    # Detect ASCII files, which are parsed into the same element tree as binary ones.
+    is_ascii = parse_fbx_ascii.is_ascii(filepath)
 
-    # Typically it's bad practice to fail silently on any error,
-    # however the file may fail to read for many reasons,
-    # and this situation is handled later in the code,
-    # right now we only want to know if the file successfully reads as ascii.
     try:
-        with open(filepath, 'r', encoding="utf-8") as fh:
-            fh.read(24)
-        is_ascii = True
-    except Exception:
-        is_ascii = False
-
-    if is_ascii:
-        operator.report({'ERROR'}, rpt_("ASCII FBX files are not supported %r") % filepath)
-        return {'CANCELLED'}
-    del is_ascii
-    # End ascii detection.
-
-    try:
-        elem_root, version = parse_fbx.parse(filepath)
+        if is_ascii:
+            elem_root, version = parse_fbx_ascii.parse(filepath)
+        else:
+            use_mmap = os.path.getsize(filepath) >= FBX_LAZY_PARSE_MIN_SIZE
+            elem_root, version = parse_fbx.parse(filepath, use_mmap=use_mmap)
     except Exception as e:
         import traceback
         traceback.print_exc()
 
         operator.report({'ERROR'}, rpt_("Couldn't open file %r (%s)") % (filepath, e))
         return {'CANCELLED'}
+    del is_ascii
 
     if version < 7100:
         operator.report({'ERROR'}, rpt_("Version %r unsupported, must be %r or later") % (version, 7100))
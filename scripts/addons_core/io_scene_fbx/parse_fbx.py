@@ -12,6 +12,7 @@ __all__ = (
 
 from struct import unpack
 import array
+import mmap
 import zlib
 from io import BytesIO
 
@@ -106,6 +107,71 @@ def unpack_array(read, array_type, array_stride, array_byteswap):
         return _create_array(data, length, array_type, array_stride, array_byteswap), False
 
 
+class FBXLazyArray:
+    """Location of an array property inside a memory-mapped FBX file, decoded on first access.
+
+    Only offsets are stored, so the memory-map itself can be closed once all the arrays that are needed have been
+    decoded."""
+    __slots__ = ("offset", "comp_len", "length", "encoding", "array_type", "array_stride", "array_byteswap")
+
+    def __init__(self, offset, comp_len, length, encoding, array_type, array_stride, array_byteswap):
+        self.offset = offset
+        self.comp_len = comp_len
+        self.length = length
+        self.encoding = encoding
+        self.array_type = array_type
+        self.array_stride = array_stride
+        self.array_byteswap = array_byteswap
+
+    def decode(self, mm):
+        data = mm[self.offset:self.offset + self.comp_len]
+        if self.encoding == 1:
+            data = zlib.decompress(data, bufsize=self.length * self.array_stride)
+        return _create_array(data, self.length, self.array_type, self.array_stride, self.array_byteswap)
+
+
+class FBXLazyProps:
+    """List-like container of element properties, where array properties are decoded from the memory-mapped file the
+    first time they are accessed.
+
+    Decoded arrays replace their FBXLazyArray placeholder, so each array is only decoded once."""
+    __slots__ = ("_data", "_mm")
+
+    def __init__(self, data, mm):
+        self._data = data
+        self._mm = mm
+
+    def _get(self, index):
+        val = self._data[index]
+        if val.__class__ is FBXLazyArray:
+            val = self._data[index] = val.decode(self._mm)
+        return val
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self._data)))]
+        return self._get(index)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        for i in range(len(self._data)):
+            yield self._get(i)
+
+    def __repr__(self):
+        return repr(self._data)
+
+
+def unpack_array_lazy(mm, array_type, array_stride, array_byteswap):
+    """Skip over an array in a memory-mapped FBX file being parsed, returning a FBXLazyArray that can decode it
+    later."""
+    length, encoding, comp_len = read_array_params(mm.read)
+    offset = mm.tell()
+    mm.seek(comp_len, 1)
+    return FBXLazyArray(offset, comp_len, length, encoding, array_type, array_stride, array_byteswap)
+
+
 read_array_dict = {
     b'b'[0]: lambda read: unpack_array(read, data_types.ARRAY_BOOL, 1, False),     # bool
     b'c'[0]: lambda read: unpack_array(read, data_types.ARRAY_BYTE, 1, False),     # ubyte
@@ -115,6 +181,15 @@ read_array_dict = {
     b'd'[0]: lambda read: unpack_array(read, data_types.ARRAY_FLOAT64, 8, False),  # double
 }
 
+read_array_lazy_dict = {
+    b'b'[0]: lambda mm: unpack_array_lazy(mm, data_types.ARRAY_BOOL, 1, False),     # bool
+    b'c'[0]: lambda mm: unpack_array_lazy(mm, data_types.ARRAY_BYTE, 1, False),     # ubyte
+    b'i'[0]: lambda mm: unpack_array_lazy(mm, data_types.ARRAY_INT32, 4, True),     # int
+    b'l'[0]: lambda mm: unpack_array_lazy(mm, data_types.ARRAY_INT64, 8, True),     # long
+    b'f'[0]: lambda mm: unpack_array_lazy(mm, data_types.ARRAY_FLOAT32, 4, False),  # float
+    b'd'[0]: lambda mm: unpack_array_lazy(mm, data_types.ARRAY_FLOAT64, 8, False),  # double
+}
+
 read_data_dict = {
     b'Z'[0]: lambda read: unpack(b'<b', read(1))[0],  # byte
     b'Y'[0]: lambda read: unpack(b'<h', read(2))[0],  # 16 bit int
@@ -236,6 +311,47 @@ def read_elem(read, tell, use_namedtuple, decompress_array_func, tell_file_offse
     return FBXElem(*args) if use_namedtuple else args
 
 
+def read_elem_lazy(mm, use_namedtuple):
+    """Same as read_elem, but reading from a memory-mapped file, where array properties are not read at all until they
+    are accessed through the returned element's props."""
+    read = mm.read
+    end_offset, prop_count, elem_id = read_fbx_elem_start(read)
+    if end_offset == 0:
+        return None
+
+    elem_props_type = bytearray(prop_count)  # elem property types
+    elem_props_data = [None] * prop_count    # elem properties (if any)
+    elem_subtree = []                        # elem children (if any)
+
+    for i in range(prop_count):
+        data_type = read(1)[0]
+        if data_type in read_array_lazy_dict:
+            elem_props_data[i] = read_array_lazy_dict[data_type](mm)
+        else:
+            elem_props_data[i] = read_data_dict[data_type](read)
+        elem_props_type[i] = data_type
+
+    # Unlike reading from a file, `tell()` of a memory-map is cheap, so there is no need to read sub-trees into BytesIO.
+    pos = mm.tell()
+    if pos < end_offset:
+        sub_tree_end = end_offset - _BLOCK_SENTINEL_LENGTH
+        while pos < sub_tree_end:
+            elem_subtree.append(read_elem_lazy(mm, use_namedtuple))
+            pos = mm.tell()
+
+        # At the end of each subtree there should be a sentinel (an empty element with all bytes set to zero).
+        if read(_BLOCK_SENTINEL_LENGTH) != _BLOCK_SENTINEL_DATA:
+            raise IOError("failed to read nested block sentinel, "
+                          "expected all bytes to be 0")
+        pos += _BLOCK_SENTINEL_LENGTH
+
+    if pos != end_offset:
+        raise IOError("scope length not reached, something is wrong")
+
+    args = (elem_id, FBXLazyProps(elem_props_data, mm), elem_props_type, elem_subtree)
+    return FBXElem(*args) if use_namedtuple else args
+
+
 def parse_version(fn):
     """
     Return the FBX version,
@@ -250,7 +366,44 @@ def parse_version(fn):
         return read_uint(read)
 
 
-def parse(fn, use_namedtuple=True):
+def parse_lazy(fn, use_namedtuple=True):
+    """Parse the element tree of a memory-mapped FBX file.
+
+    Array properties are stored as offsets into the file and only decompressed when first accessed, which greatly
+    reduces memory usage and parsing time for large files where many of the arrays are never used.
+
+    The memory-map is kept alive by the returned tree."""
+    root_elems = []
+
+    with open(fn, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    read = mm.read
+
+    if read(len(_HEAD_MAGIC)) != _HEAD_MAGIC:
+        mm.close()
+        raise IOError("Invalid header")
+
+    fbx_version = read_uint(read)
+    init_version(fbx_version)
+
+    while True:
+        elem = read_elem_lazy(mm, use_namedtuple)
+        if elem is None:
+            break
+        root_elems.append(elem)
+
+    args = (b'', [], bytearray(0), root_elems)
+    return FBXElem(*args) if use_namedtuple else args, fbx_version
+
+
+def parse(fn, use_namedtuple=True, use_mmap=False):
+    """Parse a binary FBX file, returning the root element and the FBX version.
+
+    When `use_mmap` is enabled, the file is memory-mapped and arrays are decoded lazily, see `parse_lazy`."""
+    if use_mmap:
+        return parse_lazy(fn, use_namedtuple=use_namedtuple)
+
     root_elems = []
 
     multithread_decompress_array_cm = MultiThreadedTaskConsumer.new_cpu_bound_cm(_decompress_and_insert_array)
@@ -0,0 +1,327 @@
+# SPDX-FileCopyrightText: 2025 Blender Authors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+ASCII FBX parser, producing the same element tree as the binary parser (``parse_fbx.parse``).
+
+ASCII FBX files don't store the type of their values, so types are deduced from the element and property
+definitions, matching what the binary format uses for them.
+Large arrays (``Vertices: *24 { a: ... }``) are parsed in bulk with numpy, without creating a Python object per value.
+"""
+
+__all__ = (
+    "parse",
+    "parse_version",
+    "is_ascii",
+)
+
+try:
+    from . import data_types
+except:
+    import data_types
+
+import array
+import mmap
+import re
+import numpy as np
+
+from collections import namedtuple
+FBXElem = namedtuple("FBXElem", ("id", "props", "props_type", "elems"))
+del namedtuple
+
+_HEAD_MAGIC_BINARY = b'Kaydara FBX Binary\x20\x20\x00\x1a\x00'
+
+_TOKEN_RE = re.compile(
+    rb'\s*(?:'
+    rb'(?P<comment>;[^\n]*)'
+    rb'|(?P<key>[A-Za-z_][\w|\-]*)\s*:'
+    rb'|(?P<string>"[^"]*")'
+    rb'|(?P<number>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)'
+    rb'|(?P<comma>,)'
+    rb'|(?P<array>\*\d+\s*\{)'
+    rb'|(?P<open>\{)'
+    rb'|(?P<close>\})'
+    rb'|(?P<word>[A-Za-z_]\w*)'
+    rb')'
+)
+_ARRAY_CONTENT_RE = re.compile(rb'\s*a\s*:')
+_VERSION_COMMENT_RE = re.compile(rb';\s*FBX\s+(\d+)\.(\d+)\.(\d+)')
+
+# Array types of the binary format, for the elements storing arrays.
+_ARRAY_TYPES = {
+    b'KeyTime': data_types.INT64_ARRAY,
+    b'KeyValueFloat': data_types.FLOAT32_ARRAY,
+    b'KeyAttrDataFloat': data_types.FLOAT32_ARRAY,
+    b'KeyAttrFlags': data_types.INT32_ARRAY,
+    b'KeyAttrRefCount': data_types.INT32_ARRAY,
+    b'PolygonVertexIndex': data_types.INT32_ARRAY,
+    b'Edges': data_types.INT32_ARRAY,
+    b'Indexes': data_types.INT32_ARRAY,
+    b'Materials': data_types.INT32_ARRAY,
+    b'Smoothing': data_types.INT32_ARRAY,
+    b'NormalsIndex': data_types.INT32_ARRAY,
+    b'BinormalsIndex': data_types.INT32_ARRAY,
+    b'TangentsIndex': data_types.INT32_ARRAY,
+    b'UVIndex': data_types.INT32_ARRAY,
+    b'ColorIndex': data_types.INT32_ARRAY,
+    b'Vertices': data_types.FLOAT64_ARRAY,
+    b'Normals': data_types.FLOAT64_ARRAY,
+    b'NormalsW': data_types.FLOAT64_ARRAY,
+    b'Binormals': data_types.FLOAT64_ARRAY,
+    b'BinormalsW': data_types.FLOAT64_ARRAY,
+    b'Tangents': data_types.FLOAT64_ARRAY,
+    b'TangentsW': data_types.FLOAT64_ARRAY,
+    b'UV': data_types.FLOAT64_ARRAY,
+    b'Colors': data_types.FLOAT64_ARRAY,
+    b'EdgeCrease': data_types.FLOAT64_ARRAY,
+    b'Weights': data_types.FLOAT64_ARRAY,
+    b'FullWeights': data_types.FLOAT64_ARRAY,
+    b'Matrix': data_types.FLOAT64_ARRAY,
+    b'Transform': data_types.FLOAT64_ARRAY,
+    b'TransformLink': data_types.FLOAT64_ARRAY,
+    b'TransformAssociateModel': data_types.FLOAT64_ARRAY,
+    b'Points': data_types.FLOAT64_ARRAY,
+    b'KnotVector': data_types.FLOAT64_ARRAY,
+    b'KnotVectorU': data_types.FLOAT64_ARRAY,
+    b'KnotVectorV': data_types.FLOAT64_ARRAY,
+}
+
+_ARRAY_TYPECODES = {
+    data_types.INT32_ARRAY: data_types.ARRAY_INT32,
+    data_types.INT64_ARRAY: data_types.ARRAY_INT64,
+    data_types.FLOAT32_ARRAY: data_types.ARRAY_FLOAT32,
+    data_types.FLOAT64_ARRAY: data_types.ARRAY_FLOAT64,
+}
+
+# Elements whose integer values are 64 bit in the binary format (besides the IDs of objects and connections).
+_ELEM_IDS_INT64 = {b'LocalTime', b'ReferenceTime', b'Document', b'RootNode', b'Node'}
+
+# Properties70 types whose values are integers or 32 bit floats, other numeric values are stored as doubles.
+_P_TYPES_INT32 = {b'bool', b'Bool', b'int', b'Integer', b'enum', b'Enum', b'Visibility Inheritance'}
+_P_TYPES_INT64 = {b'KTime', b'ULongLong'}
+_P_TYPES_FLOAT32 = {b'float', b'Float'}
+
+_INT32_MIN = -(1 << 31)
+_INT32_MAX = (1 << 31) - 1
+
+
+def _convert_string(value, elem_id, parent_id):
+    value = value[1:-1].replace(b'&quot;', b'"')
+    if elem_id == b'Content':
+        # Embedded media is base64 encoded in ASCII files.
+        import binascii
+        return binascii.a2b_base64(value), data_types.BYTES
+    if parent_id == b'Objects' and b'::' in value:
+        # ASCII files store object names as `Class::Name`, where binary files use `Name\x00\x01Class`.
+        elem_class, _, elem_name = value.partition(b'::')
+        value = elem_name + b'\x00\x01' + elem_class
+    return value, data_types.STRING
+
+
+def _convert_number(value, number_type):
+    if number_type is None:
+        # Deduce the type from the value itself.
+        if b'.' in value or b'e' in value or b'E' in value:
+            return float(value), data_types.FLOAT64
+        value = int(value)
+        return value, (data_types.INT32 if _INT32_MIN <= value <= _INT32_MAX else data_types.INT64)
+    if number_type in {data_types.FLOAT64, data_types.FLOAT32}:
+        return float(value), number_type
+    return int(float(value)) if b'.' in value else int(value), number_type
+
+
+def _elem_number_type(elem_id, parent_id, props, index):
+    """Return the binary type of the numeric property at `index`, or None if it should be deduced from its value."""
+    if parent_id == b'Objects' and index == 0:
+        # Object IDs.
+        return data_types.INT64
+    if elem_id == b'C' or elem_id in _ELEM_IDS_INT64:
+        return data_types.INT64
+    if elem_id == b'P' and index >= 4:
+        p_type = props[1]
+        if p_type in _P_TYPES_INT32:
+            return data_types.INT32
+        if p_type in _P_TYPES_INT64:
+            return data_types.INT64
+        if p_type in _P_TYPES_FLOAT32:
+            return data_types.FLOAT32
+        return data_types.FLOAT64
+    return None
+
+
+def _finalize_props(elem, parent_id):
+    """Convert the raw tokens stored in the properties of `elem` into typed values."""
+    elem_id, props, props_type, _elems = elem
+    for i, (token_type, value) in enumerate(props):
+        if token_type == 'string':
+            props[i], prop_type = _convert_string(value, elem_id, parent_id)
+        elif token_type == 'number':
+            number_type = _elem_number_type(elem_id, parent_id, props, i)
+            props[i], prop_type = _convert_number(value, number_type)
+        elif token_type == 'word':
+            # Bare single letters (`Shading: Y`) are chars in the binary format.
+            if len(value) == 1:
+                props[i], prop_type = value, data_types.CHAR
+            else:
+                props[i], prop_type = value, data_types.STRING
+        else:
+            assert token_type == 'array'
+            props[i], prop_type = value
+        props_type.append(prop_type)
+
+
+def _parse_array(data, pos, elem_id, array_len):
+    """Parse the `a: ...` content of an array in bulk, returning the array and the position after its closing brace."""
+    m = _ARRAY_CONTENT_RE.match(data, pos)
+    end = data.find(b'}', pos)
+    if m is None or end == -1 or m.end() > end:
+        raise IOError("invalid array content at offset %d" % pos)
+    content = data[m.end():end]
+
+    prop_type = _ARRAY_TYPES.get(elem_id)
+    if prop_type is None:
+        # Unknown array, deduce its type from its content.
+        if b'.' in content or b'e' in content or b'E' in content:
+            prop_type = data_types.FLOAT64_ARRAY
+        else:
+            prop_type = data_types.INT32_ARRAY
+    typecode = _ARRAY_TYPECODES[prop_type]
+
+    if array_len:
+        values = np.fromstring(content, dtype=typecode, sep=',')
+    else:
+        values = np.empty(0, dtype=typecode)
+    if len(values) != array_len:
+        raise IOError("array length mismatch at offset %d, expected %d values, but got %d"
+                      % (pos, array_len, len(values)))
+
+    values_array = array.array(typecode)
+    values_array.frombytes(values.tobytes())
+    return (values_array, prop_type), end + 1
+
+
+def _parse_elems(data):
+    root = FBXElem(b'', [], bytearray(0), [])
+
+    # Stack of (element, its parent's id) whose children are being parsed.
+    stack = [(root, None)]
+    # Element whose properties are being parsed, and the id of its parent.
+    elem = None
+    elem_parent_id = None
+
+    match = _TOKEN_RE.match
+    data_len = len(data)
+    pos = 0
+    while pos < data_len:
+        m = match(data, pos)
+        if m is None:
+            if not data[pos:].strip():
+                break
+            raise IOError("unexpected data at offset %d" % pos)
+        pos = m.end()
+        token_type = m.lastgroup
+
+        if token_type in {'comma', 'comment'}:
+            continue
+        elif token_type == 'key':
+            if elem is not None:
+                _finalize_props(elem, elem_parent_id)
+            parent, _parent_parent_id = stack[-1]
+            elem = FBXElem(m.group('key'), [], bytearray(), [])
+            elem_parent_id = parent.id
+            parent.elems.append(elem)
+        elif token_type in {'string', 'number', 'word'}:
+            if elem is None:
+                raise IOError("value without an element at offset %d" % m.start(token_type))
+            elem.props.append((token_type, m.group(token_type)))
+        elif token_type == 'array':
+            if elem is None:
+                raise IOError("array without an element at offset %d" % m.start(token_type))
+            array_len = int(m.group(token_type)[1:-1].strip())
+            value, pos = _parse_array(data, pos, elem.id, array_len)
+            elem.props.append(('array', value))
+        elif token_type == 'open':
+            if elem is None:
+                raise IOError("nested block without an element at offset %d" % m.start(token_type))
+            _finalize_props(elem, elem_parent_id)
+            stack.append((elem, elem_parent_id))
+            elem = None
+        else:
+            assert token_type == 'close'
+            if elem is not None:
+                _finalize_props(elem, elem_parent_id)
+                elem = None
+            if len(stack) == 1:
+                raise IOError("unexpected closing brace at offset %d" % m.start(token_type))
+            stack.pop()
+
+    if elem is not None:
+        _finalize_props(elem, elem_parent_id)
+    if len(stack) != 1:
+        raise IOError("unexpected end of file, %d nested blocks are not closed" % (len(stack) - 1))
+
+    return root
+
+
+def _as_tuples(elem):
+    return (elem.id, elem.props, elem.props_type, [_as_tuples(sub_elem) for sub_elem in elem.elems])
+
+
+def is_ascii(fn):
+    """
+    Return True if the file doesn't start with the binary FBX header,
+    and starts with text which could be an ASCII FBX file.
+    """
+    with open(fn, 'rb') as f:
+        head = f.read(len(_HEAD_MAGIC_BINARY))
+    if head == _HEAD_MAGIC_BINARY:
+        return False
+    try:
+        head.decode('utf-8')
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def parse_version(fn):
+    """
+    Return the FBX version of an ASCII file, read from its header comment (e.g. ``; FBX 7.4.0 project file``),
+    zero if it could not be found.
+    """
+    with open(fn, 'rb') as f:
+        head = f.read(1024)
+    m = _VERSION_COMMENT_RE.search(head)
+    if m is None:
+        return 0
+    major, minor, patch = (int(v) for v in m.groups())
+    return major * 1000 + minor * 100 + patch * 10
+
+
+def parse(fn, use_namedtuple=True):
+    """Parse an ASCII FBX file, returning the root element and the FBX version."""
+    with open(fn, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be memory-mapped.
+            data = b''
+
+    try:
+        root = _parse_elems(data)
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+    fbx_version = 0
+    for elem in root.elems:
+        if elem.id == b'FBXHeaderExtension':
+            for sub_elem in elem.elems:
+                if sub_elem.id == b'FBXVersion' and sub_elem.props:
+                    fbx_version = sub_elem.props[0]
+                    break
+            break
+    if not fbx_version:
+        fbx_version = parse_version(fn)
+
+    return root if use_namedtuple else _as_tuples(root), fbx_version
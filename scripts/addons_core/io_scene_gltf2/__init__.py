@@ -211,6 +211,18 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
         default=''
     )
 
+    # Don't use export_ prefix here either, this is not an export setting
+    gltf_cache_dir: StringProperty(
+        name='Cache Directory',
+        description=(
+            'Directory where data that is long to compute (e.g. mesh vertex deduplication) is cached, '
+            'to speed up later exports of the same data (not cached on disk when empty)'
+        ),
+        subtype='DIR_PATH',
+        default='',
+        options={'HIDDEN', 'SKIP_PRESET'},
+    )
+
     # gltfpack properties
     export_use_gltfpack: BoolProperty(
         name='Use Gltfpack',
@@ -1118,6 +1130,7 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
 
         export_settings['timestamp'] = datetime.datetime.now()
         export_settings['gltf_export_id'] = self.gltf_export_id
+        export_settings['gltf_cache_dir'] = bpy.path.abspath(self.gltf_cache_dir) if self.gltf_cache_dir else ''
         export_settings['gltf_filepath'] = self.filepath
         export_settings['gltf_filedirectory'] = os.path.dirname(export_settings['gltf_filepath']) + '/'
         export_settings['gltf_texturedirectory'] = os.path.join(
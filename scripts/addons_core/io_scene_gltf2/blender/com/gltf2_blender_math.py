@@ -4,6 +4,7 @@
 
 import typing
 import math
+import numpy as np
 from mathutils import Matrix, Vector, Quaternion, Euler
 
 from .data_path import get_target_property_name
@@ -178,6 +179,38 @@ def scale_rot_swap_matrix(rot):
     return m
 
 
+def quaternions_multiply(a, b):
+    """Hamilton product of (arrays of) quaternions in WXYZ order, broadcasting like numpy operators."""
+    aw, ax, ay, az = np.moveaxis(np.asarray(a), -1, 0)
+    bw, bx, by, bz = np.moveaxis(np.asarray(b), -1, 0)
+    return np.stack((
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ), axis=-1)
+
+
+def quaternions_make_compatible(quats):
+    """Flip the sign of quaternions (in place) so that each one is in the same hemisphere as the previous one.
+
+    This is the same as flipping quats[i] when quats[i].dot(quats[i - 1]) < 0, going forward through the array."""
+    if len(quats) < 2:
+        return
+    dots = np.einsum('ij,ij->i', quats[1:], quats[:-1])
+    # A quaternion is flipped when the previous one was not flipped and their dot product is negative, or when the
+    # previous one was flipped and their dot product is positive. So the number of negative dot products since the last
+    # one that was neither positive nor negative (where nothing is flipped) tells whether to flip.
+    num_negatives = np.zeros(len(quats), dtype=np.int64)
+    np.cumsum(dots < 0, out=num_negatives[1:])
+    num_negatives_at_reset = np.zeros(len(quats), dtype=np.int64)
+    resets = np.flatnonzero(~((dots < 0) | (dots > 0))) + 1
+    num_negatives_at_reset[resets] = num_negatives[resets]
+    np.maximum.accumulate(num_negatives_at_reset, out=num_negatives_at_reset)
+    flip = (num_negatives - num_negatives_at_reset) % 2 == 1
+    quats[flip] *= -1
+
+
 def nearby_signed_perm_matrix(rot):
     """Returns a signed permutation matrix close to rot.to_matrix().
     (A signed permutation matrix is like a permutation matrix, except
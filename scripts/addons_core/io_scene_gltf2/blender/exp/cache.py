@@ -3,9 +3,111 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import functools
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+
+# Increment when the format of the results cached on disk changes.
+_DISK_CACHE_VERSION = 1
+
+_MISSING = object()
+
+# Caches of the 'DISK' scope functions, whose results are only kept in memory until the end of the export.
+_disk_scope_caches = []
+
+
+def _result_nbytes(result):
+    """Memory used by the (numpy) arrays of a cached result."""
+    if isinstance(result, (tuple, list)):
+        return sum(_result_nbytes(item) for item in result)
+    return getattr(result, "nbytes", 0)
+
+
+class _DiskCache:
+    """Results of a 'DISK' scope function, see cached_by_key().
+
+    Keeps the max_entries most recently used results in memory (as long as their arrays use less than max_bytes) until
+    cleared, and when a cache directory is given, in files of that directory (also keeping only the max_entries most
+    recently used ones)."""
+
+    def __init__(self, name, max_entries, max_bytes):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.entries_nbytes = 0
+
+    def clear(self):
+        self.entries.clear()
+        self.entries_nbytes = 0
+
+    def __file_path(self, cache_dir, cache_key):
+        digest = hashlib.sha256(repr((_DISK_CACHE_VERSION, cache_key)).encode()).hexdigest()
+        return os.path.join(cache_dir, self.name, digest + ".pickle")
+
+    def __load(self, filepath):
+        try:
+            with open(filepath, 'rb') as f:
+                result = pickle.load(f)
+        except FileNotFoundError:
+            return _MISSING
+        except Exception as e:
+            # Treat corrupt or incompatible files as missing, they will be overwritten.
+            print("glTF cache: failed to read %r (%s)" % (filepath, e))
+            return _MISSING
+        # Mark as recently used.
+        os.utime(filepath)
+        return result
+
+    def __store(self, filepath, result):
+        dirpath = os.path.dirname(filepath)
+        os.makedirs(dirpath, exist_ok=True)
+        # Write to a temporary file first, so concurrent exports never read partially written files.
+        filepath_tmp = "%s.%d.tmp" % (filepath, os.getpid())
+        with open(filepath_tmp, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(filepath_tmp, filepath)
+
+        with os.scandir(dirpath) as it:
+            files = [(entry.stat().st_mtime, entry.path) for entry in it if entry.name.endswith(".pickle")]
+        if len(files) > self.max_entries:
+            files.sort()
+            for _mtime, path in files[:len(files) - self.max_entries]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def get(self, cache_key, cache_dir, compute):
+        result = self.entries.get(cache_key, _MISSING)
+        if result is not _MISSING:
+            self.entries.move_to_end(cache_key)
+            return result
+
+        filepath = self.__file_path(cache_dir, cache_key) if cache_dir else None
+        if filepath is not None:
+            result = self.__load(filepath)
+        if result is _MISSING:
+            result = compute()
+            if filepath is not None:
+                self.__store(filepath, result)
+
+        self.entries[cache_key] = result
+        self.entries_nbytes += _result_nbytes(result)
+        while self.entries and (len(self.entries) > self.max_entries or self.entries_nbytes > self.max_bytes):
+            _cache_key, evicted = self.entries.popitem(last=False)
+            self.entries_nbytes -= _result_nbytes(evicted)
+        return result
+
 
+def clear_disk_scope_memory():
+    """Forget the results of 'DISK' scope functions kept in memory, to call at the end of each export."""
+    for disk_cache in _disk_scope_caches:
+        disk_cache.clear()
 
-def cached_by_key(key):
+
+def cached_by_key(key, scope='EXPORT', max_entries=64, max_bytes=256 * 1024 * 1024):
     """
     Decorates functions whose result should be cached. Use it like:
         @cached_by_key(key=...)
@@ -15,8 +117,21 @@ def cached_by_key(key):
     (the cache is stored here).
     The key argument to the decorator is a function that computes the key to
     cache on. It is passed all the arguments to func.
+
+    The scope argument tells how long results are kept:
+    - 'EXPORT': during the current export only.
+    - 'DISK': during the current export, the max_entries most recently used results are kept in memory (as long as
+      their arrays use less than max_bytes), and across exports and Blender sessions in
+      export_settings['gltf_cache_dir'] (when set). Exports must call clear_disk_scope_memory() when they end.
+      The key must only depend on the content of the arguments and on the export settings the result depends on (not
+      on ids of Blender data), and have a stable repr() (only made of str, numbers, bytes, tuples...). The result must
+      not reference data of the export.
     """
     def inner(func):
+        if scope == 'DISK':
+            disk_cache = _DiskCache(func.__module__ + "." + func.__qualname__, max_entries, max_bytes)
+            _disk_scope_caches.append(disk_cache)
+
         @functools.wraps(func)
         def wrapper_cached(*args, **kwargs):
             if kwargs.get("export_settings"):
@@ -26,8 +141,12 @@ def cached_by_key(key):
 
             cache_key = key(*args, **kwargs)
 
-            # invalidate cache if export settings have changed
-            if not hasattr(func, "__export_settings") or export_settings != func.__export_settings:
+            if scope == 'DISK':
+                cache_dir = export_settings.get('gltf_cache_dir')
+                return disk_cache.get(cache_key, cache_dir, lambda: func(*args, **kwargs))
+
+            # invalidate cache if this is another export
+            if not hasattr(func, "__export_settings") or export_settings is not func.__export_settings:
                 func.__cache = {}
                 func.__export_settings = export_settings
             # use or fill cache
@@ -16,6 +16,8 @@ from ...io.exp.user_extensions import export_user_extensions
 from ..com import json_util
 from . import gather as gltf2_blender_gather
 from .exporter import GlTF2Exporter
+from .cache import clear_disk_scope_memory
+from .material.encode_image import shutdown_image_encoder
 
 
 def save(context, export_settings):
@@ -34,7 +36,11 @@ def save(context, export_settings):
     for callback in pre_export_callbacks:
         callback(export_settings)
 
-    json, buffer = __export(export_settings)
+    try:
+        json, buffer = __export(export_settings)
+    finally:
+        # Results cached across exports are only kept on disk, don't keep large arrays alive in memory.
+        clear_disk_scope_memory()
 
     post_export_callbacks = export_settings["post_export_callbacks"]
     for callback in post_export_callbacks:
@@ -52,17 +58,22 @@ def save(context, export_settings):
 
 def __export(export_settings):
     exporter = GlTF2Exporter(export_settings)
-    __gather_gltf(exporter, export_settings)
-
-    # If the directory does not exist, create it
-    if not os.path.isdir(export_settings['gltf_filedirectory']):
-        os.makedirs(export_settings['gltf_filedirectory'])
-    if export_settings['gltf_format'] == "GLTF_SEPARATE" \
-            and not os.path.isdir(export_settings['gltf_texturedirectory']):
-        os.makedirs(export_settings['gltf_texturedirectory'])
-
-    buffer = __create_buffer(exporter, export_settings)
-    exporter.finalize_images()
+    try:
+        __gather_gltf(exporter, export_settings)
+
+        # If the directory does not exist, create it
+        if not os.path.isdir(export_settings['gltf_filedirectory']):
+            os.makedirs(export_settings['gltf_filedirectory'])
+        if export_settings['gltf_format'] == "GLTF_SEPARATE" \
+                and not os.path.isdir(export_settings['gltf_texturedirectory']):
+            os.makedirs(export_settings['gltf_texturedirectory'])
+
+        buffer = __create_buffer(exporter, export_settings)
+        exporter.finalize_images()
+    finally:
+        # All encoded images have been stored at this point (or the export failed),
+        # stop the encoder worker threads in any case.
+        shutdown_image_encoder(export_settings)
 
     export_user_extensions('gather_gltf_extensions_hook', export_settings, exporter.glTF)
     exporter.traverse_extensions()
@@ -228,7 +239,7 @@ def __gather_gltf(exporter, export_settings):
 
 
 def __create_buffer(exporter, export_settings):
-    buffer = bytes()
+    buffer = None
     if export_settings['gltf_format'] == 'GLB':
         buffer = exporter.finalize_buffer(export_settings['gltf_filedirectory'], is_glb=True)
     else:
@@ -122,7 +122,7 @@ class GlTF2Exporter:
                 uri = None
             elif output_path and buffer_name:
                 with open(output_path + uri_to_path(buffer_name), 'wb') as f:
-                    f.write(self.__buffer.to_bytes())
+                    self.__buffer.write_to(f)
                 uri = buffer_name
             else:
                 uri = self.__buffer.to_embed_string()
@@ -139,7 +139,8 @@ class GlTF2Exporter:
         self.__finalized = True
 
         if is_glb:
-            return self.__buffer.to_bytes()
+            # Return the buffer itself rather than its bytes, so it's streamed to the GLB file without a copy.
+            return self.__buffer
 
     def add_draco_extension(self):
         """
@@ -4,10 +4,14 @@
 
 import bpy
 import os
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 import numpy as np
 import tempfile
 import enum
+import hashlib
+import struct
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
 
 
 class Channel(enum.IntEnum):
@@ -215,7 +219,11 @@ class ExportImage:
             all(fill.tile == self.fills[list(self.fills.keys())[0]].tile for fill in self.fills.values())
         )
 
-    def encode(self, mime_type: Optional[str], export_settings) -> Tuple[bytes, bool]:
+    def encode(self, mime_type: Optional[str], export_settings) -> Tuple[Union[bytes, Future], bool]:
+        """Return the encoded image data and the factor (if any).
+
+        Images that have to be assembled from pixels and saved as PNG are encoded on other threads, the data is then a
+        Future of the encoded bytes, see ImageEncoder."""
         self.file_format = {
             "image/jpeg": "JPEG",
             "image/png": "PNG",
@@ -367,7 +375,10 @@ class ExportImage:
 
         return self.__encode_from_numpy_array(out_buf, (width, height), export_settings)
 
-    def __encode_from_numpy_array(self, pixels: np.ndarray, dim: Tuple[int, int], export_settings) -> bytes:
+    def __encode_from_numpy_array(self, pixels: np.ndarray, dim: Tuple[int, int], export_settings):
+        if self.file_format == "PNG":
+            return get_image_encoder(export_settings).encode_png(pixels, dim, Channel.A in self.fills)
+
         with TmpImageGuard() as guard:
             guard.image = bpy.data.images.new(
                 "##gltf-export:tmp-image##",
@@ -459,6 +470,112 @@ def _encode_temp_image(tmp_image: bpy.types.Image, file_format: str, export_sett
             return b''
 
 
+def _encode_png(pixels: np.ndarray, width: int, height: int, alpha: bool) -> bytes:
+    """Encode float RGBA pixels (rows from bottom to top, as in Blender) as an 8 bits RGB(A) PNG.
+
+    This gives the same pixels as saving a temporary byte image, but without using bpy, so it can run on any thread
+    (numpy and zlib release the GIL for most of the work)."""
+    channels = 4 if alpha else 3
+    # Same conversion as when setting the pixels of a byte image.
+    rows = np.clip(pixels * np.float32(255.0) + np.float32(0.5), 0.0, 255.0).astype(np.uint8)
+    rows = rows.reshape(height, width, 4)[::-1, :, :channels].reshape(height, width * channels)
+
+    # Filter the rows with the filter type giving the lowest sum of absolute values (as signed bytes), which is the
+    # heuristic used by libpng. Done by blocks of rows to bound the memory used for the candidates.
+    filtered = np.empty((height, width * channels + 1), np.uint8)
+    block_size = max(1, (1 << 20) // (width * channels))
+    for start in range(0, height, block_size):
+        stop = min(start + block_size, height)
+        x = rows[start:stop].astype(np.int16)
+        b = np.zeros_like(x)
+        if start > 0:
+            b[0] = rows[start - 1]
+        b[1:] = x[:-1]
+        a = np.zeros_like(x)
+        a[:, channels:] = x[:, :-channels]
+        c = np.zeros_like(x)
+        c[:, channels:] = b[:, :-channels]
+
+        p = a + b - c
+        pa = np.abs(p - a)
+        pb = np.abs(p - b)
+        pc = np.abs(p - c)
+        paeth = np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+
+        best = x
+        best_type = np.zeros(stop - start, np.uint8)
+        best_score = np.abs(x.astype(np.uint8).view(np.int8).astype(np.int32)).sum(axis=1)
+        for filter_type, prediction in ((1, a), (2, b), (3, (a + b) >> 1), (4, paeth)):
+            candidate = x - prediction
+            score = np.abs(candidate.astype(np.uint8).view(np.int8).astype(np.int32)).sum(axis=1)
+            better = score < best_score
+            best = np.where(better[:, None], candidate, best)
+            best_type[better] = filter_type
+            best_score = np.minimum(score, best_score)
+
+        filtered[start:stop, 0] = best_type
+        filtered[start:stop, 1:] = best.astype(np.uint8)
+
+    def chunk(chunk_type, data):
+        return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data))
+
+    color_type = 6 if alpha else 2
+    return b"".join((
+        b"\x89PNG\r\n\x1a\n",
+        chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)),
+        chunk(b"IDAT", zlib.compress(filtered, 6)),
+        chunk(b"IEND", b""),
+    ))
+
+
+class ImageEncoder:
+    """Encodes images on worker threads, so the export keeps gathering data while they are encoded.
+
+    Identical images (same pixels and encoding parameters) are only encoded once: the same Future is returned for all
+    of them, so their BinaryData/ImageData compare equal and the image is only stored once."""
+
+    def __init__(self):
+        try:
+            self.__executor = ThreadPoolExecutor(thread_name_prefix="gltf-image-encoder")
+            self.__executor.submit(lambda: None).result()
+        except Exception:
+            # Threads are not available, encode synchronously instead.
+            self.__executor = None
+        self.__futures = {}
+
+    def encode_png(self, pixels: np.ndarray, dim: Tuple[int, int], alpha: bool) -> Future:
+        pixels = np.ascontiguousarray(pixels, np.float32)
+        key = (dim, alpha, hashlib.sha1(pixels).digest())
+        future = self.__futures.get(key)
+        if future is None:
+            if self.__executor is not None:
+                future = self.__executor.submit(_encode_png, pixels, dim[0], dim[1], alpha)
+            else:
+                future = Future()
+                future.set_result(_encode_png(pixels, dim[0], dim[1], alpha))
+            self.__futures[key] = future
+        return future
+
+    def shutdown(self):
+        """Wait for all the images to be encoded and stop the worker threads."""
+        if self.__executor is not None:
+            self.__executor.shutdown()
+        self.__futures.clear()
+
+
+def get_image_encoder(export_settings) -> ImageEncoder:
+    image_encoder = export_settings.get('image_encoder')
+    if image_encoder is None:
+        image_encoder = export_settings['image_encoder'] = ImageEncoder()
+    return image_encoder
+
+
+def shutdown_image_encoder(export_settings):
+    image_encoder = export_settings.pop('image_encoder', None)
+    if image_encoder is not None:
+        image_encoder.shutdown()
+
+
 class TmpImageGuard:
     """Guard to automatically clean up temp images (use it with `with`)."""
 
@@ -119,7 +119,8 @@ def __filter_image(sockets, export_settings):
 def __gather_buffer_view(image_data, mime_type, name, export_settings):
     if export_settings['gltf_format'] != 'GLTF_SEPARATE':
         data, factor = image_data.encode(mime_type, export_settings)
-        if len(data) == 0:
+        # Images being encoded on another thread (Future) are never empty
+        if isinstance(data, bytes) and len(data) == 0:
             export_settings['log'].warning("Image data is empty, not exporting image")
             return None, None
         return gltf2_io_binary_data.BinaryData(data=data), factor
@@ -210,7 +211,8 @@ def __gather_uri(image_data, mime_type, name, export_settings):
     if export_settings['gltf_format'] == 'GLTF_SEPARATE':
         # as usual we just store the data in place instead of already resolving the references
         data, factor = image_data.encode(mime_type, export_settings)
-        if len(data) == 0:
+        # Images being encoded on another thread (Future) are never empty
+        if isinstance(data, bytes) and len(data) == 0:
             export_settings['log'].warning("Image data is empty, not exporting image")
             return None, None
         image = gltf2_io_image_data.ImageData(
@@ -45,11 +45,7 @@ def __gather_skins(blender_primitive, export_settings):
 
     # Retrieve max set index
     max_bone_set_index = 0
-    while blender_primitive["attributes"].get(
-        'JOINTS_' +
-        str(max_bone_set_index)) and blender_primitive["attributes"].get(
-        'WEIGHTS_' +
-            str(max_bone_set_index)):
+    while __has_skin_set(blender_primitive["attributes"], max_bone_set_index):
         max_bone_set_index += 1
     max_bone_set_index -= 1
 
@@ -96,7 +92,7 @@ def __gather_skins(blender_primitive, export_settings):
         weight_id = 'WEIGHTS_' + str(s)
         weight = blender_primitive["attributes"][weight_id]
         weight = np.array(weight, dtype=np.float32)
-        weight = weight.reshape(len(weight) // 4, 4)
+        weight = weight.reshape(-1, 4)
 
         # Set warning for the case where we are in the same group, will be done later (for example, 3 weights needed, but 2 wanted by user)
         # And then, remove no more needed weights
@@ -125,7 +121,7 @@ def __gather_skins(blender_primitive, export_settings):
         joint_id = 'JOINTS_' + str(s)
         internal_joint = blender_primitive["attributes"][joint_id]
         component_type = gltf2_io_constants.ComponentType.UnsignedShort
-        if max(internal_joint) < 256:
+        if np.max(internal_joint) < 256:
             component_type = gltf2_io_constants.ComponentType.UnsignedByte
         joints = np.array(internal_joint, dtype=gltf2_io_constants.ComponentType.to_numpy_dtype(component_type))
         joints = joints.reshape(-1, 4)
@@ -171,6 +167,13 @@ def __gather_skins(blender_primitive, export_settings):
     return attributes
 
 
+def __has_skin_set(attributes, set_index):
+    # Joints and weights are (n, 4) arrays, one for each set of 4 influences
+    joints = attributes.get('JOINTS_' + str(set_index))
+    weights = attributes.get('WEIGHTS_' + str(set_index))
+    return joints is not None and len(joints) > 0 and weights is not None and len(weights) > 0
+
+
 def __gather_attribute(blender_primitive, attribute, export_settings):
     data = blender_primitive["attributes"][attribute]
 
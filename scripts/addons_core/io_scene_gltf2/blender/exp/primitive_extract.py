@@ -2,6 +2,7 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import hashlib
 import numpy as np
 from copy import deepcopy
 from mathutils import Vector
@@ -15,6 +16,7 @@ from .material.materials import get_base_material, get_active_uvmap_index, get_n
 from .material.texture_info import gather_udim_texture_info
 from . import skins as gltf2_blender_gather_skins
 from . attribute_utils import extract_attribute_data
+from .cache import cached_by_key
 
 
 def extract_primitives(
@@ -46,6 +48,25 @@ def extract_primitives(
         return primitive_creator.primitive_creation_shared()
 
 
+def unique_dots_cache_key(dots, export_settings):
+    return (str(dots.dtype), len(dots), hashlib.sha1(np.ascontiguousarray(dots)).digest())
+
+
+@cached_by_key(key=unique_dots_cache_key, scope='DISK', max_entries=32)
+def unique_dots(dots, export_settings):
+    """
+    Deduplicate dots, return the unique dots and the index of each dot in them.
+
+    This is the most expensive part of the extraction, so it is cached across exports, by content: meshes that didn't
+    change since a previous export (or only in ways that don't change the dots) are not deduplicated again.
+    The returned arrays are shared with the cache, so they are read-only.
+    """
+    unique, inverse = fast_structured_np_unique(dots, return_inverse=True)
+    unique.flags.writeable = False
+    inverse.flags.writeable = False
+    return unique, inverse
+
+
 class PrimitiveCreator:
     def __init__(
             self,
@@ -830,7 +851,7 @@ class PrimitiveCreator:
 
     def primitive_creation_shared(self):
         primitives = []
-        self.dots, shared_dot_indices = fast_structured_np_unique(self.dots, return_inverse=True)
+        self.dots, shared_dot_indices = unique_dots(self.dots, self.export_settings)
 
         self.blender_idxs = self.dots['vertex_index']
 
@@ -858,22 +879,7 @@ class PrimitiveCreator:
                 self.__set_regular_attribute(self.dots, attr)
 
         if self.skin:
-            joints = [[] for _ in range(self.num_joint_sets)]
-            weights = [[] for _ in range(self.num_joint_sets)]
-
-            for vi in self.blender_idxs:
-                bones = self.vert_bones[vi]
-                for j in range(0, 4 * self.num_joint_sets):
-                    if j < len(bones):
-                        joint, weight = bones[j]
-                    else:
-                        joint, weight = 0, 0.0
-                    joints[j // 4].append(joint)
-                    weights[j // 4].append(weight)
-
-            for i, (js, ws) in enumerate(zip(joints, weights)):
-                self.attributes['JOINTS_%d' % i] = js
-                self.attributes['WEIGHTS_%d' % i] = ws
+            self.__set_joints_weights_attributes(self.attributes)
 
         for material_idx, dot_indices in self.prim_indices.items():
             indices = shared_dot_indices[dot_indices]
@@ -906,7 +912,7 @@ class PrimitiveCreator:
             # Extract just dots used by this primitive, deduplicate them, and
             # calculate indices into this deduplicated list.
             self.prim_dots = self.dots[dot_indices]
-            self.prim_dots, indices = fast_structured_np_unique(self.prim_dots, return_inverse=True)
+            self.prim_dots, indices = unique_dots(self.prim_dots, self.export_settings)
 
             if len(self.prim_dots) == 0:
                 continue
@@ -939,22 +945,7 @@ class PrimitiveCreator:
                 next_texcoor_idx += 1
 
             if self.skin:
-                joints = [[] for _ in range(self.num_joint_sets)]
-                weights = [[] for _ in range(self.num_joint_sets)]
-
-                for vi in self.blender_idxs:
-                    bones = self.vert_bones[vi]
-                    for j in range(0, 4 * self.num_joint_sets):
-                        if j < len(bones):
-                            joint, weight = bones[j]
-                        else:
-                            joint, weight = 0, 0.0
-                        joints[j // 4].append(joint)
-                        weights[j // 4].append(weight)
-
-                for i, (js, ws) in enumerate(zip(joints, weights)):
-                    self.attributes['JOINTS_%d' % i] = js
-                    self.attributes['WEIGHTS_%d' % i] = ws
+                self.__set_joints_weights_attributes(self.attributes)
 
             primitives.append({
                 'attributes': self.attributes,
@@ -980,7 +971,7 @@ class PrimitiveCreator:
             if self.blender_idxs_edges.shape[0] > 0:
                 # Export one glTF vert per unique Blender vert in a loose edge
                 self.blender_idxs = self.blender_idxs_edges
-                dots_edges, indices = fast_structured_np_unique(self.dots_edges, return_inverse=True)
+                dots_edges, indices = unique_dots(self.dots_edges, self.export_settings)
                 self.blender_idxs = np.unique(self.blender_idxs_edges)
 
                 self.attributes_edges_points = {}
@@ -1008,22 +999,7 @@ class PrimitiveCreator:
                                 attr['blender_data_type'])
 
                 if self.skin:
-                    joints = [[] for _ in range(self.num_joint_sets)]
-                    weights = [[] for _ in range(self.num_joint_sets)]
-
-                    for vi in self.blender_idxs:
-                        bones = self.vert_bones[vi]
-                        for j in range(0, 4 * self.num_joint_sets):
-                            if j < len(bones):
-                                joint, weight = bones[j]
-                            else:
-                                joint, weight = 0, 0.0
-                            joints[j // 4].append(joint)
-                            weights[j // 4].append(weight)
-
-                    for i, (js, ws) in enumerate(zip(joints, weights)):
-                        self.attributes_edges_points['JOINTS_%d' % i] = js
-                        self.attributes_edges_points['WEIGHTS_%d' % i] = ws
+                    self.__set_joints_weights_attributes(self.attributes_edges_points)
 
                 primitives_edges_points.append({
                     'attributes': self.attributes_edges_points,
@@ -1064,22 +1040,7 @@ class PrimitiveCreator:
                                 attr['blender_data_type'])
 
                 if self.skin:
-                    joints = [[] for _ in range(self.num_joint_sets)]
-                    weights = [[] for _ in range(self.num_joint_sets)]
-
-                    for vi in self.blender_idxs:
-                        bones = self.vert_bones[vi]
-                        for j in range(0, 4 * self.num_joint_sets):
-                            if j < len(bones):
-                                joint, weight = bones[j]
-                            else:
-                                joint, weight = 0, 0.0
-                            joints[j // 4].append(joint)
-                            weights[j // 4].append(weight)
-
-                    for i, (js, ws) in enumerate(zip(joints, weights)):
-                        self.attributes_edges_points['JOINTS_%d' % i] = js
-                        self.attributes_edges_points['WEIGHTS_%d' % i] = ws
+                    self.__set_joints_weights_attributes(self.attributes_edges_points)
 
                 primitives_edges_points.append({
                     'attributes': self.attributes_edges_points,
@@ -1519,38 +1480,65 @@ class PrimitiveCreator:
         min_influence = 0.0001
 
         joint_name_to_index = {joint.name: index for index, joint in enumerate(self.skin.joints)}
-        group_to_joint = [joint_name_to_index.get(g.name) for g in self.blender_vertex_groups]
-
-        # List of (joint, weight) pairs for each vert
-        self.vert_bones = []
-        max_num_influences = 0
-
-        for vertex in self.blender_mesh.vertices:
-            bones = []
-            if vertex.groups:
-                for group_element in vertex.groups:
-                    weight = group_element.weight
-                    if weight <= min_influence:
-                        continue
-                    try:
-                        joint = group_to_joint[group_element.group]
-                    except Exception:
-                        continue
-                    if joint is None:
-                        continue
-                    bones.append((joint, weight))
-            bones.sort(key=lambda x: x[1], reverse=True)
-            if not bones:
-                # Is not assign to any bone
-                bones = ((len(self.skin.joints), 1.0),)  # Assign to a joint that will be created later
-                self.need_neutral_bone = True
-            self.vert_bones.append(bones)
-            if len(bones) > max_num_influences:
-                max_num_influences = len(bones)
+        # Joint index for each vertex group, -1 for groups that are not a joint
+        group_to_joint = np.array(
+            [joint_name_to_index.get(g.name, -1) for g in self.blender_vertex_groups] + [-1],
+            dtype=np.int64)
+
+        # Read all (group, weight) pairs in flat arrays, with the number of pairs of each vert
+        # There is no foreach_get for vertex groups, so this is the only loop over the verts
+        num_verts = len(self.blender_mesh.vertices)
+        vertex_groups = [vertex.groups for vertex in self.blender_mesh.vertices]
+        counts = np.fromiter((len(groups) for groups in vertex_groups), dtype=np.int64, count=num_verts)
+        num_elements = int(counts.sum())
+        groups = np.fromiter(
+            (group_element.group for groups in vertex_groups for group_element in groups),
+            dtype=np.int64, count=num_elements)
+        weights = np.fromiter(
+            (group_element.weight for groups in vertex_groups for group_element in groups),
+            dtype=np.float32, count=num_elements)
+        vert_of_element = np.repeat(np.arange(num_verts), counts)
+
+        # Groups that don't exist (anymore) are mapped to the trailing -1
+        groups[(groups < 0) | (groups >= len(group_to_joint) - 1)] = -1
+        joints = group_to_joint[groups]
+
+        keep = (weights > min_influence) & (joints >= 0)
+        joints = joints[keep]
+        weights = weights[keep]
+        vert_of_element = vert_of_element[keep]
+
+        # Sort by vert, then by decreasing weight (stable, so equal weights keep their order)
+        order = np.lexsort((-weights, vert_of_element))
+        joints = joints[order]
+        weights = weights[order]
+        vert_of_element = vert_of_element[order]
+
+        counts = np.bincount(vert_of_element, minlength=num_verts)
+        starts = np.zeros(num_verts, dtype=np.int64)
+        np.cumsum(counts[:-1], out=starts[1:])
+        influence_index = np.arange(len(joints)) - starts[vert_of_element]
+
+        not_assigned = counts == 0
+        if not_assigned.any():
+            # Is not assign to any bone
+            self.need_neutral_bone = True
+        # Verts not assigned to any bone get one influence, see below
+        max_num_influences = int(np.maximum(counts, 1).max()) if num_verts else 0
 
         # How many joint sets do we need? 1 set = 4 influences
         self.num_joint_sets = (max_num_influences + 3) // 4
 
+        # Joints and weights for each vert, sorted by decreasing weight, padded with zeros
+        self.vert_joints = np.zeros((num_verts, 4 * self.num_joint_sets), dtype=np.uint32)
+        self.vert_weights = np.zeros((num_verts, 4 * self.num_joint_sets), dtype=np.float32)
+        self.vert_joints[vert_of_element, influence_index] = joints
+        self.vert_weights[vert_of_element, influence_index] = weights
+
+        # Assign to a joint that will be created later
+        self.vert_joints[not_assigned, 0] = len(self.skin.joints)
+        self.vert_weights[not_assigned, 0] = 1.0
+
 ##################################### Set ###################################
     def set_function(self):
 
@@ -1616,6 +1604,13 @@ class PrimitiveCreator:
             t_morph.rotate(rotation)
             self.morph_tangents[i] = t_morph - t  # back to delta
 
+    def __set_joints_weights_attributes(self, attributes):
+        joints = self.vert_joints[self.blender_idxs]
+        weights = self.vert_weights[self.blender_idxs]
+        for i in range(self.num_joint_sets):
+            attributes['JOINTS_%d' % i] = joints[:, 4 * i:4 * i + 4]
+            attributes['WEIGHTS_%d' % i] = weights[:, 4 * i:4 * i + 4]
+
     def __set_regular_attribute(self, dots, attr):
         res = np.empty((len(dots), attr['len']), dtype=attr['type'])
         for i in range(attr['len']):
@@ -3,10 +3,11 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import bpy
-from mathutils import Vector
+import numpy as np
 
 from ...io.imp.user_extensions import import_user_extensions
 from ...io.imp.gltf2_io_binary import BinaryData
+from ..com.gltf2_blender_math import quaternions_multiply, quaternions_make_compatible
 from .animation_utils import make_fcurve, get_or_create_action_and_slot
 from .vnode import VNode
 
@@ -61,34 +62,36 @@ class BlenderNodeAnim():
 
         action, slot = get_or_create_action_and_slot(gltf, node_idx, anim_idx, path)
 
-        keys = BinaryData.get_data_from_accessor(gltf, animation.samplers[channel.sampler].input)
-        values = BinaryData.get_data_from_accessor(gltf, animation.samplers[channel.sampler].output)
+        keys = BinaryData.decode_accessor(gltf, animation.samplers[channel.sampler].input)
+        values = BinaryData.decode_accessor(gltf, animation.samplers[channel.sampler].output)
 
         if animation.samplers[channel.sampler].interpolation == "CUBICSPLINE":
             # TODO manage tangent?
             values = values[1::3]
 
-        # Convert the curve from glTF to Blender.
+        # Convert the whole curve from glTF to Blender at once. This works on a
+        # copy, as the decoded accessor may be cached or shared with other channels.
+        values = np.array(values, dtype=np.float64)
 
         if path == "translation":
             blender_path = "location"
             group_name = "Object Transforms"
             num_components = 3
-            values = [gltf.loc_gltf_to_blender(vals) for vals in values]
+            gltf.locs_batch_gltf_to_blender(values)
             values = vnode.base_locs_to_final_locs(values)
 
         elif path == "rotation":
             blender_path = "rotation_quaternion"
             group_name = "Object Transforms"
             num_components = 4
-            values = [gltf.quaternion_gltf_to_blender(vals) for vals in values]
+            gltf.quaternions_batch_gltf_to_blender(values)
             values = vnode.base_rots_to_final_rots(values)
 
         elif path == "scale":
             blender_path = "scale"
             group_name = "Object Transforms"
             num_components = 3
-            values = [gltf.scale_gltf_to_blender(vals) for vals in values]
+            gltf.scales_batch_gltf_to_blender(values)
             values = vnode.base_scales_to_final_scales(values)
 
         # Objects parented to a bone are translated to the bone tip by default.
@@ -96,8 +99,7 @@ class BlenderNodeAnim():
         if vnode.type == VNode.Object and path == "translation":
             if vnode.parent is not None and gltf.vnodes[vnode.parent].type == VNode.Bone:
                 bone_length = gltf.vnodes[vnode.parent].bone_length
-                off = Vector((0, -bone_length, 0))
-                values = [vals + off for vals in values]
+                values[:, 1] -= bone_length
 
         if vnode.type == VNode.Bone:
             # Need to animate the pose bone when the node is a bone.
@@ -124,20 +126,13 @@ class BlenderNodeAnim():
             #     ps = fs
 
             if path == 'translation':
-                edit_trans, edit_rot = vnode.editbone_trans, vnode.editbone_rot
-                edit_rot_inv = edit_rot.conjugated()
-                values = [
-                    edit_rot_inv @ (trans - edit_trans)
-                    for trans in values
-                ]
+                edit_trans = np.array(vnode.editbone_trans)
+                edit_rot_inv = np.array(vnode.editbone_rot.conjugated().to_matrix())
+                values = (values - edit_trans) @ edit_rot_inv.T
 
             elif path == 'rotation':
-                edit_rot = vnode.editbone_rot
-                edit_rot_inv = edit_rot.conjugated()
-                values = [
-                    edit_rot_inv @ rot
-                    for rot in values
-                ]
+                edit_rot_inv = np.array(vnode.editbone_rot.conjugated())
+                values = quaternions_multiply(edit_rot_inv, values)
 
             elif path == 'scale':
                 pass  # no change needed
@@ -145,21 +140,21 @@ class BlenderNodeAnim():
         # To ensure rotations always take the shortest path, we flip
         # adjacent antipodal quaternions.
         if path == 'rotation':
-            for i in range(1, len(values)):
-                if values[i].dot(values[i - 1]) < 0:
-                    values[i] = -values[i]
+            quaternions_make_compatible(values)
 
         fps = (bpy.context.scene.render.fps * bpy.context.scene.render.fps_base)
 
-        coords = [0] * (2 * len(keys))
-        coords[::2] = (key[0] * fps for key in keys)
+        # Interleaved (frame, value) pairs, so that each F-curve is filled with
+        # a single foreach_set.
+        coords = np.empty((len(keys), 2), dtype=np.float32)
+        coords[:, 0] = keys[:, 0].astype(np.float64) * fps
 
         for i in range(0, num_components):
-            coords[1::2] = (vals[i] for vals in values)
+            coords[:, 1] = values[:, i]
             make_fcurve(
                 action,
                 slot,
-                coords,
+                coords.reshape(-1),
                 data_path=blender_path,
                 index=i,
                 group_name=group_name,
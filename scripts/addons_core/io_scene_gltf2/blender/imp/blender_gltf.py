@@ -94,6 +94,15 @@ class BlenderGlTF():
                 ns[:, [1, 2]] = ns[:, [2, 1]]
                 ns[:, 1] *= -1
 
+            def convert_quats_batch(qs):
+                # x,y,z,w -> w,x,-z,y
+                qs[:] = qs[:, [3, 0, 2, 1]]
+                qs[:, 2] *= -1
+
+            def convert_scales_batch(ss):
+                # x,y,z -> x,z,y
+                ss[:, [1, 2]] = ss[:, [2, 1]]
+
             # Correction for cameras and lights.
             # glTF: right = +X, forward = -Z, up = +Y
             # glTF after Yup2Zup: right = +X, forward = +Y, up = +Z
@@ -112,14 +121,22 @@ class BlenderGlTF():
             def convert_locs_batch(_locs): return
             def convert_normals_batch(_ns): return
 
+            def convert_quats_batch(qs):
+                # x,y,z,w -> w,x,y,z
+                qs[:] = qs[:, [3, 0, 1, 2]]
+
+            def convert_scales_batch(_ss): return
+
             # Same convention, no correction needed.
             gltf.camera_correction = None
 
         gltf.loc_gltf_to_blender = convert_loc
         gltf.locs_batch_gltf_to_blender = convert_locs_batch
         gltf.quaternion_gltf_to_blender = convert_quat
+        gltf.quaternions_batch_gltf_to_blender = convert_quats_batch
         gltf.normals_batch_gltf_to_blender = convert_normals_batch
         gltf.scale_gltf_to_blender = convert_scale
+        gltf.scales_batch_gltf_to_blender = convert_scales_batch
         gltf.matrix_gltf_to_blender = convert_matrix
 
     @staticmethod
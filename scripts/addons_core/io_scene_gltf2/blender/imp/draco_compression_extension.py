@@ -97,6 +97,7 @@ def decode_primitive(gltf, prim):
 
     # Update accessor to point to the new buffer view.
     index_accessor.buffer_view = len(gltf.data.buffer_views) - 1
+    gltf.uncache_decoded_accessor(prim.indices)
 
     # Read each attribute.
     for attr_idx, attr in enumerate(extension['attributes']):
@@ -134,5 +135,6 @@ def decode_primitive(gltf, prim):
 
         # Update accessor to point to the new buffer view.
         accessor.buffer_view = len(gltf.data.buffer_views) - 1
+        gltf.uncache_decoded_accessor(prim.attributes[attr])
 
     dll.decoderRelease(decoder)
@@ -2,6 +2,8 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 import bpy
 from mathutils import Matrix
 import numpy as np
@@ -14,6 +16,9 @@ from ..com.gltf2_blender_utils import fast_structured_np_unique
 from .material import BlenderMaterial
 from .draco_compression_extension import decode_primitive
 
+# Below this total amount of indices, filling the primitives on worker threads costs more than it gains.
+FILL_PRIMITIVES_THREADED_MIN_INDICES = 65536
+
 
 class BlenderMesh():
     """Blender Mesh."""
@@ -75,8 +80,7 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
     num_uvs = 0
     num_cols = 0
     num_joint_sets = 0
-    attributes = set({})
-    attribute_data = []
+    attributes = []
     attribute_type = {}
     attribute_component_type = {}
 
@@ -107,48 +111,13 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
 
         custom_attrs = [k for k in prim.attributes if k.startswith('_')]
         for attr in custom_attrs:
-            if attr not in attributes:
+            if attr not in attribute_type:
+                attributes.append(attr)
                 attribute_type[attr] = gltf.data.accessors[prim.attributes[attr]].type
                 attribute_component_type[attr] = gltf.data.accessors[prim.attributes[attr]].component_type
-                attribute_data.append(
-                    np.empty(
-                        dtype=ComponentType.to_numpy_dtype(attribute_component_type[attr]),
-                        shape=(0, DataType.num_elements(attribute_type[attr])))
-                )
-        attributes.update(set(custom_attrs))
 
     num_shapekeys = sum(sk_name is not None for sk_name in pymesh.shapekey_names)
 
-    # -------------
-    # We'll process all the primitives gathering arrays to feed into the
-    # various foreach_set function that create the mesh data.
-
-    num_faces = 0  # total number of faces
-    vert_locs = np.empty(dtype=np.float32, shape=(0, 3))  # coordinate for each vert
-    vert_normals = np.empty(dtype=np.float32, shape=(0, 3))  # normal for each vert
-    edge_vidxs = np.array([], dtype=np.uint32)  # vertex_index for each loose edge
-    loop_vidxs = np.array([], dtype=np.uint32)  # vertex_index for each loop
-    loop_uvs = [
-        np.empty(dtype=np.float32, shape=(0, 2))  # UV for each loop for each layer
-        for _ in range(num_uvs)
-    ]
-    loop_cols = [
-        np.empty(dtype=np.float32, shape=(0, 4))  # color for each loop for each layer
-        for _ in range(num_cols)
-    ]
-    vert_joints = [
-        np.empty(dtype=np.uint32, shape=(0, 4))  # 4 joints for each vert for each set
-        for _ in range(num_joint_sets)
-    ]
-    vert_weights = [
-        np.empty(dtype=np.float32, shape=(0, 4))  # 4 weights for each vert for each set
-        for _ in range(num_joint_sets)
-    ]
-    sk_vert_locs = [
-        np.empty(dtype=np.float32, shape=(0, 3))  # coordinate for each vert for each shapekey
-        for _ in range(num_shapekeys)
-    ]
-
     # We need to detect if some non-tri primitives have some VC.
     # (Because, in that case, we will need to create vertex domain VC, instead of corner domain VC)
     has_non_tri_vcs = []
@@ -158,14 +127,28 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
             ['COLOR_' + str(i) in attr for attr in prim.attributes]) for prim in pymesh.primitives]))
         vc_domains.append('POINT' if has_non_tri_vcs[i] else 'CORNER')
 
+    # -------------
+    # We'll process all the primitives gathering arrays to feed into the
+    # various foreach_set function that create the mesh data.
+    #
+    # This is done in two passes: the first one decodes the indices of each
+    # primitive, which tells where its data goes in the arrays. The arrays are
+    # then allocated once, and the second pass fills them, each primitive
+    # writing to its own part of the arrays.
+
+    num_faces = 0  # total number of faces
+    num_verts = 0
+    num_loops = 0
+    num_edge_vidxs = 0
+    num_corner_cols = 0
+    prim_fills = []
+
     for prim in pymesh.primitives:
         prim.num_faces = 0
 
         if 'POSITION' not in prim.attributes:
             continue
 
-        vert_index_base = len(vert_locs)
-
         if prim.extensions is not None and 'KHR_draco_mesh_compression' in prim.extensions:
 
             gltf.log.info('Draco Decoder: Decode primitive {}'.format(pymesh.name or '[unnamed]'))
@@ -177,8 +160,8 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
             indices = BinaryData.decode_accessor(gltf, prim.indices)
             indices = indices.reshape(len(indices))
         else:
-            num_verts = gltf.data.accessors[prim.attributes['POSITION']].count
-            indices = np.arange(0, num_verts, dtype=np.uint32)
+            num_prim_verts = gltf.data.accessors[prim.attributes['POSITION']].count
+            indices = np.arange(0, num_prim_verts, dtype=np.uint32)
 
         mode = 4 if prim.mode is None else prim.mode
         points, edges, tris = points_edges_tris(mode, indices)
@@ -192,28 +175,83 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
         # We'll add one vert to the arrays for each index used in indices
         unique_indices, inv_indices = np.unique(indices, return_inverse=True)
 
+        prim_fill = PrimitiveFill(prim, indices, unique_indices, inv_indices)
+        prim_fill.vert_start = num_verts
+        num_verts += len(unique_indices)
+
+        if edges is not None:
+            prim_fill.edge_start = num_edge_vidxs
+            num_edge_vidxs += len(indices)
+
+        if tris is not None:
+            prim.num_faces = len(indices) // 3
+            num_faces += prim.num_faces
+            prim_fill.loop_start = num_loops
+            num_loops += len(indices)
+
+        prim_fill.corner_col_start = num_corner_cols
+        num_corner_cols += len(indices)
+
+        prim_fills.append(prim_fill)
+
+    vert_locs = np.empty(dtype=np.float32, shape=(num_verts, 3))  # coordinate for each vert
+    # normal for each vert
+    vert_normals = np.empty(dtype=np.float32, shape=(num_verts if has_normals else 0, 3))
+    edge_vidxs = np.empty(dtype=np.uint32, shape=num_edge_vidxs)  # vertex_index for each loose edge
+    loop_vidxs = np.empty(dtype=np.uint32, shape=num_loops)  # vertex_index for each loop
+    loop_uvs = [
+        np.empty(dtype=np.float32, shape=(num_loops, 2))  # UV for each loop for each layer
+        for _ in range(num_uvs)
+    ]
+    loop_cols = [
+        # color for each loop (or vert) for each layer
+        np.empty(dtype=np.float32, shape=(num_corner_cols if vc_domains[col_i] == 'CORNER' else num_verts, 4))
+        for col_i in range(num_cols)
+    ]
+    vert_joints = [
+        np.empty(dtype=np.uint32, shape=(num_verts, 4))  # 4 joints for each vert for each set
+        for _ in range(num_joint_sets)
+    ]
+    vert_weights = [
+        np.empty(dtype=np.float32, shape=(num_verts, 4))  # 4 weights for each vert for each set
+        for _ in range(num_joint_sets)
+    ]
+    sk_vert_locs = [
+        np.empty(dtype=np.float32, shape=(num_verts, 3))  # coordinate for each vert for each shapekey
+        for _ in range(num_shapekeys)
+    ]
+    attribute_data = [
+        np.empty(
+            dtype=ComponentType.to_numpy_dtype(attribute_component_type[attr]),
+            shape=(num_verts, DataType.num_elements(attribute_type[attr])))
+        for attr in attributes
+    ]
+
+    def fill_primitive(prim_fill):
+        prim = prim_fill.prim
+        indices = prim_fill.indices
+        unique_indices = prim_fill.unique_indices
+        verts = slice(prim_fill.vert_start, prim_fill.vert_start + len(unique_indices))
+
         vs = BinaryData.decode_accessor(gltf, prim.attributes['POSITION'], cache=True)
-        vert_locs = np.concatenate((vert_locs, vs[unique_indices]))
+        vert_locs[verts] = vs[unique_indices]
 
         if has_normals:
             if 'NORMAL' in prim.attributes:
                 ns = BinaryData.decode_accessor(gltf, prim.attributes['NORMAL'], cache=True)
-                ns = ns[unique_indices]
+                vert_normals[verts] = ns[unique_indices]
             else:
-                ns = np.zeros((len(unique_indices), 3), dtype=np.float32)
-            vert_normals = np.concatenate((vert_normals, ns))
+                vert_normals[verts] = 0.0
 
         for i in range(num_joint_sets):
             if ('JOINTS_%d' % i) in prim.attributes and ('WEIGHTS_%d' % i) in prim.attributes:
                 js = BinaryData.decode_accessor(gltf, prim.attributes['JOINTS_%d' % i], cache=True)
                 ws = BinaryData.decode_accessor(gltf, prim.attributes['WEIGHTS_%d' % i], cache=True)
-                js = js[unique_indices]
-                ws = ws[unique_indices]
+                vert_joints[i][verts] = js[unique_indices]
+                vert_weights[i][verts] = ws[unique_indices]
             else:
-                js = np.zeros((len(unique_indices), 4), dtype=np.uint32)
-                ws = np.zeros((len(unique_indices), 4), dtype=np.float32)
-            vert_joints[i] = np.concatenate((vert_joints[i], js))
-            vert_weights[i] = np.concatenate((vert_weights[i], ws))
+                vert_joints[i][verts] = 0
+                vert_weights[i][verts] = 0.0
 
         sk_i = 0
         for sk, sk_name in enumerate(pymesh.shapekey_names):
@@ -221,66 +259,59 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
                 continue
             if prim.targets and 'POSITION' in prim.targets[sk]:
                 morph_vs = BinaryData.decode_accessor(gltf, prim.targets[sk]['POSITION'], cache=True)
-                morph_vs = morph_vs[unique_indices]
+                sk_vert_locs[sk_i][verts] = morph_vs[unique_indices]
             else:
-                morph_vs = np.zeros((len(unique_indices), 3), dtype=np.float32)
-            sk_vert_locs[sk_i] = np.concatenate((sk_vert_locs[sk_i], morph_vs))
+                sk_vert_locs[sk_i][verts] = 0.0
             sk_i += 1
 
         # inv_indices are the indices into the verts just for this prim;
         # calculate indices into the overall verts array
-        prim_vidxs = inv_indices.astype(np.uint32, copy=False)
-        prim_vidxs += vert_index_base  # offset for verts from previous prims
-
-        if edges is not None:
-            edge_vidxs = np.concatenate((edge_vidxs, prim_vidxs))
+        if prim_fill.edge_start is not None:
+            edges = slice(prim_fill.edge_start, prim_fill.edge_start + len(indices))
+            edge_vidxs[edges] = prim_fill.inv_indices
+            edge_vidxs[edges] += prim_fill.vert_start  # offset for verts from previous prims
 
-        if tris is not None:
-            prim.num_faces = len(indices) // 3
-            num_faces += prim.num_faces
-
-            loop_vidxs = np.concatenate((loop_vidxs, prim_vidxs))
+        if prim_fill.loop_start is not None:
+            loops = slice(prim_fill.loop_start, prim_fill.loop_start + len(indices))
+            loop_vidxs[loops] = prim_fill.inv_indices
+            loop_vidxs[loops] += prim_fill.vert_start  # offset for verts from previous prims
 
             # UV only if we have a face
             for uv_i in range(num_uvs):
                 if ('TEXCOORD_%d' % uv_i) in prim.attributes:
                     uvs = BinaryData.decode_accessor(gltf, prim.attributes['TEXCOORD_%d' % uv_i], cache=True)
-                    uvs = uvs[indices]
+                    loop_uvs[uv_i][loops] = uvs[indices]
                 else:
-                    uvs = np.zeros((len(indices), 2), dtype=np.float32)
-                loop_uvs[uv_i] = np.concatenate((loop_uvs[uv_i], uvs))
+                    loop_uvs[uv_i][loops] = 0.0
 
         # We can have VC for points, lines, and tris
+        corner_cols = slice(prim_fill.corner_col_start, prim_fill.corner_col_start + len(indices))
         for col_i in range(num_cols):
+            if vc_domains[col_i] == 'CORNER':
+                cols_out = loop_cols[col_i][corner_cols]
+                cols_indices = indices
+            else:
+                cols_out = loop_cols[col_i][verts]
+                cols_indices = unique_indices
             if ('COLOR_%d' % col_i) in prim.attributes:
                 cols = BinaryData.decode_accessor(gltf, prim.attributes['COLOR_%d' % col_i], cache=True)
-                if vc_domains[col_i] == 'CORNER':
-                    cols = cols[indices]
-                else:
-                    cols = cols[unique_indices]
+                cols = cols[cols_indices]
                 if cols.shape[1] == 3:
-                    cols = colors_rgb_to_rgba(cols)
-            else:
-                if vc_domains[col_i] == 'CORNER':
-                    cols = np.ones((len(indices), 4), dtype=np.float32)
+                    cols_out[:, :3] = cols
+                    cols_out[:, 3] = 1.0
                 else:
-                    cols = np.ones((len(unique_indices), 4), dtype=np.float32)
-            loop_cols[col_i] = np.concatenate((loop_cols[col_i], cols))
+                    cols_out[:] = cols
+            else:
+                cols_out[:] = 1.0
 
         for idx, attr in enumerate(attributes):
             if attr in prim.attributes:
                 attr_data = BinaryData.decode_accessor(gltf, prim.attributes[attr], cache=True)
-                attribute_data[idx] = np.concatenate((attribute_data[idx], attr_data[unique_indices]))
+                attribute_data[idx][verts] = attr_data[unique_indices]
             else:
-                attr_data = np.zeros(
-                    (len(unique_indices), DataType.num_elements(attribute_type[attr])),
-                    dtype=ComponentType.to_numpy_dtype(attribute_component_type[attr])
-                )
-                attribute_data[idx] = np.concatenate((attribute_data[idx], attr_data))
+                attribute_data[idx][verts] = 0
 
-    # Accessors are cached in case they are shared between primitives; clear
-    # the cache now that all prims are done.
-    gltf.decode_accessor_cache = {}
+    fill_primitives(fill_primitive, prim_fills)
 
     if gltf.import_settings['merge_vertices']:
         vert_locs, vert_normals, vert_joints, vert_weights, \
@@ -547,6 +578,48 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
         mesh.normals_split_custom_set_from_vertices(vert_normals)
 
 
+class PrimitiveFill:
+    """Where the data of a primitive goes in the arrays gathered for the whole mesh."""
+
+    def __init__(self, prim, indices, unique_indices, inv_indices):
+        self.prim = prim
+        self.indices = indices
+        self.unique_indices = unique_indices
+        self.inv_indices = inv_indices
+        self.vert_start = 0
+        self.edge_start = None  # Only for primitives with edges
+        self.loop_start = None  # Only for primitives with faces
+        self.corner_col_start = 0
+
+
+def fill_primitives(fill_primitive, prim_fills):
+    """Call fill_primitive for each primitive, on worker threads when there are several large enough primitives.
+
+    Each primitive writes to its own part of the arrays, so they can be filled independently."""
+    max_workers = min(len(prim_fills), os.cpu_count() or 1)
+    num_indices = sum(len(prim_fill.indices) for prim_fill in prim_fills)
+    if max_workers <= 1 or num_indices < FILL_PRIMITIVES_THREADED_MIN_INDICES:
+        for prim_fill in prim_fills:
+            fill_primitive(prim_fill)
+        return
+
+    futures = []
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gltf-mesh-import") as executor:
+        try:
+            for prim_fill in prim_fills:
+                futures.append(executor.submit(fill_primitive, prim_fill))
+        except RuntimeError:
+            # Threads could not be started, the primitives not handled by the running workers are filled below.
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    for i, prim_fill in enumerate(prim_fills):
+        if i < len(futures) and not futures[i].cancelled():
+            # Raise the exceptions of the workers.
+            futures[i].result()
+        else:
+            fill_primitive(prim_fill)
+
+
 def points_edges_tris(mode, indices):
     points = None
     edges = None
@@ -658,12 +731,6 @@ def squish(array, dtype=None):
     return np.ascontiguousarray(array, dtype=dtype).reshape(array.size)
 
 
-def colors_rgb_to_rgba(rgb):
-    rgba = np.ones((len(rgb), 4), dtype=np.float32)
-    rgba[:, :3] = rgb
-    return rgba
-
-
 def uvs_gltf_to_blender(uvs):
     # u,v -> u,1-v
     uvs[:, 1] *= -1
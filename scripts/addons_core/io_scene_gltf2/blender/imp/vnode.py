@@ -3,10 +3,11 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import bpy
+import numpy as np
 from itertools import chain
 from mathutils import Vector, Quaternion, Matrix
 from ...io.imp.gltf2_io_binary import BinaryData
-from ..com.gltf2_blender_math import scale_rot_swap_matrix, nearby_signed_perm_matrix
+from ..com.gltf2_blender_math import scale_rot_swap_matrix, nearby_signed_perm_matrix, quaternions_multiply
 
 
 def compute_vnodes(gltf):
@@ -71,17 +72,20 @@ class VNode:
             m @ s,
         )
 
+    # The base_*_to_final_* functions convert whole numpy arrays of locations (n x 3), rotations (n x 4, WXYZ) or
+    # scales (n x 3), as is needed for animations.
+
     def base_locs_to_final_locs(self, base_locs):
-        ra = self.rotation_after
-        return [ra @ loc for loc in base_locs]
+        ra = np.array(self.rotation_after.to_matrix())
+        return base_locs @ ra.T
 
     def base_rots_to_final_rots(self, base_rots):
-        ra, rb = self.rotation_after, self.rotation_before
-        return [ra @ rot @ rb for rot in base_rots]
+        ra, rb = np.array(self.rotation_after), np.array(self.rotation_before)
+        return quaternions_multiply(quaternions_multiply(ra, base_rots), rb)
 
     def base_scales_to_final_scales(self, base_scales):
-        m = scale_rot_swap_matrix(self.rotation_before)
-        return [m @ scale for scale in base_scales]
+        m = np.array(scale_rot_swap_matrix(self.rotation_before))
+        return base_scales @ m.T
 
 
 def local_rotation(gltf, vnode_id, rot):
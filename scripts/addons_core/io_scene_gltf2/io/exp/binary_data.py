@@ -4,23 +4,41 @@
 
 import typing
 import array
+from concurrent.futures import Future
 from ...io.com import constants as gltf2_io_constants
 
 
 class BinaryData:
-    """Store for gltf binary data that can later be stored in a buffer."""
+    """Store for gltf binary data that can later be stored in a buffer.
 
-    def __init__(self, data: bytes, bufferViewTarget=None):
-        if not isinstance(data, bytes):
+    The data can also be a Future of a bytes array (e.g. an image being encoded on another thread), it is only waited
+    for when the data is accessed. Such data is hashed by the Future and only equal to data of the same Future, so
+    hashing and comparing never wait for it. Identical images share one Future, see `ImageEncoder`."""
+
+    def __init__(self, data: typing.Union[bytes, Future], bufferViewTarget=None):
+        if not isinstance(data, (bytes, Future)):
             raise TypeError("Data is not a bytes array")
-        self.data = data
+        self._data = data
         self.bufferViewTarget = bufferViewTarget
 
     def __eq__(self, other):
-        return self.data == other.data
+        # Data being encoded (Future) is only equal to the same Future, consistent with the hash and without waiting.
+        if isinstance(self._data, Future) or isinstance(other._data, Future):
+            return self._data is other._data
+        return self._data == other._data
 
     def __hash__(self):
-        return hash(self.data)
+        return hash(self._data)
+
+    @property
+    def data(self):
+        if isinstance(self._data, Future):
+            return self._data.result()
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
 
     @classmethod
     def from_list(cls,
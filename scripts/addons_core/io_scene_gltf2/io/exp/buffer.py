@@ -9,24 +9,33 @@ from ...io.exp import binary_data as gltf2_io_binary_data
 
 
 class Buffer:
-    """Class representing binary data for use in a glTF file as 'buffer' property."""
+    """Class representing binary data for use in a glTF file as 'buffer' property.
+
+    The data of the buffer views is not copied into the buffer, the buffer only keeps references to it (and to the
+    padding between views), so that it can be written out chunk after chunk."""
 
     def __init__(self, buffer_index=0, initial_data=None):
-        self.__data = bytearray(b"")
+        self.__chunks = []
+        self.__byte_length = 0
         if initial_data is not None:
-            self.__data = bytearray(initial_data.tobytes())
+            self.__add_chunk(memoryview(initial_data).cast('B'))
         self.__buffer_index = buffer_index
 
+    def __add_chunk(self, data):
+        self.__chunks.append(data)
+        self.__byte_length += len(data)
+
     def add_and_get_view(self, binary_data: gltf2_io_binary_data.BinaryData) -> gltf2_io.BufferView:
         """Add binary data to the buffer. Return a glTF BufferView."""
-        offset = len(self.__data)
-        self.__data.extend(binary_data.data)
+        offset = self.__byte_length
+        self.__add_chunk(binary_data.data)
 
         length = binary_data.byte_length
 
         # offsets should be a multiple of 4 --> therefore add padding if necessary
         padding = (4 - (length % 4)) % 4
-        self.__data.extend(b"\x00" * padding)
+        if padding:
+            self.__add_chunk(b"\x00" * padding)
 
         buffer_view = gltf2_io.BufferView(
             buffer=self.__buffer_index,
@@ -42,13 +51,36 @@ class Buffer:
 
     @property
     def byte_length(self):
-        return len(self.__data)
+        return self.__byte_length
 
     def to_bytes(self):
-        return self.__data
+        return b"".join(self.__chunks)
+
+    def write_to(self, file):
+        """Write the buffer to a binary file object, chunk after chunk, without assembling it in memory first."""
+        file.writelines(self.__chunks)
 
     def clear(self):
-        self.__data = b""
+        self.__chunks = []
+        self.__byte_length = 0
 
     def to_embed_string(self):
-        return 'data:application/octet-stream;base64,' + base64.b64encode(self.__data).decode('ascii')
+        # Encode chunk after chunk, carrying over the bytes which don't fill a whole group of 3 bytes (4 base64
+        # characters) to the next chunk.
+        encoded = ['data:application/octet-stream;base64,']
+        remainder = b""
+        for chunk in self.__chunks:
+            chunk = memoryview(chunk)
+            if remainder:
+                fill = 3 - len(remainder)
+                remainder += chunk[:fill]
+                chunk = chunk[fill:]
+                if len(remainder) < 3:
+                    continue
+                encoded.append(base64.b64encode(remainder).decode('ascii'))
+                remainder = b""
+            split_at = len(chunk) - len(chunk) % 3
+            encoded.append(base64.b64encode(chunk[:split_at]).decode('ascii'))
+            remainder = chunk[split_at:].tobytes()
+        encoded.append(base64.b64encode(remainder).decode('ascii'))
+        return "".join(encoded)
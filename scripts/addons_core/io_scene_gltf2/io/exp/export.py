@@ -60,20 +60,18 @@ def save_gltf(gltf, export_settings, encoder, glb_buffer):
     export_user_extensions('gather_gltf_encoded_hook', export_settings, gltf_format, sort_order)
 
     gltf_ordered = OrderedDict(sorted(gltf.items(), key=lambda item: sort_order.index(item[0])))
-    gltf_encoded = json.dumps(
-        gltf_ordered,
-        indent=gltf_format.indent,
-        separators=gltf_format.separators,
-        cls=encoder,
-        allow_nan=False)
-
-    #
 
     if export_settings['gltf_format'] != 'GLB':
-        file = open(export_settings['gltf_filepath'], "w", encoding="utf8", newline="\n")
-        file.write(gltf_encoded)
-        file.write("\n")
-        file.close()
+        # Stream the JSON to the file as it's being encoded, instead of encoding the whole document in memory first.
+        with open(export_settings['gltf_filepath'], "w", encoding="utf8", newline="\n") as file:
+            json.dump(
+                gltf_ordered,
+                file,
+                indent=gltf_format.indent,
+                separators=gltf_format.separators,
+                cls=encoder,
+                allow_nan=False)
+            file.write("\n")
 
         binary = export_settings['gltf_binary']
         if len(binary) > 0 and not export_settings['gltf_embed_buffers']:
@@ -82,16 +80,21 @@ def save_gltf(gltf, export_settings, encoder, glb_buffer):
             file.close()
 
     else:
-        file = open(export_settings['gltf_filepath'], "wb")
-
+        # The length of the JSON chunk is needed in the header, so the JSON has to be encoded first.
+        gltf_encoded = json.dumps(
+            gltf_ordered,
+            indent=gltf_format.indent,
+            separators=gltf_format.separators,
+            cls=encoder,
+            allow_nan=False)
         gltf_data = gltf_encoded.encode()
-        binary = glb_buffer
+        del gltf_encoded
 
         length_gltf = len(gltf_data)
         spaces_gltf = (4 - (length_gltf & 3)) & 3
         length_gltf += spaces_gltf
 
-        length_bin = len(binary)
+        length_bin = glb_buffer.byte_length if glb_buffer is not None else 0
         zeros_bin = (4 - (length_bin & 3)) & 3
         length_bin += zeros_bin
 
@@ -99,24 +102,28 @@ def save_gltf(gltf, export_settings, encoder, glb_buffer):
         if length_bin > 0:
             length += 8 + length_bin
 
-        # Header (Version 2)
-        file.write('glTF'.encode())
-        file.write(struct.pack("I", 2))
-        file.write(struct.pack("I", length))
-
-        # Chunk 0 (JSON)
-        file.write(struct.pack("I", length_gltf))
-        file.write('JSON'.encode())
-        file.write(gltf_data)
-        file.write(b' ' * spaces_gltf)
-
-        # Chunk 1 (BIN)
-        if length_bin > 0:
-            file.write(struct.pack("I", length_bin))
-            file.write('BIN\0'.encode())
-            file.write(binary)
-            file.write(b'\0' * zeros_bin)
-
-        file.close()
+        with open(export_settings['gltf_filepath'], "wb") as file:
+            file.writelines((
+                # Header (Version 2)
+                'glTF'.encode(),
+                struct.pack("I", 2),
+                struct.pack("I", length),
+
+                # Chunk 0 (JSON)
+                struct.pack("I", length_gltf),
+                'JSON'.encode(),
+                gltf_data,
+                b' ' * spaces_gltf,
+            ))
+
+            # Chunk 1 (BIN)
+            if length_bin > 0:
+                file.writelines((
+                    struct.pack("I", length_bin),
+                    'BIN\0'.encode(),
+                ))
+                # Streamed from the buffer's chunks, the binary data is never assembled in memory.
+                glb_buffer.write_to(file)
+                file.write(b'\0' * zeros_bin)
 
     return True
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import re
+from concurrent.futures import Future
 
 
 class ImageData:
@@ -10,7 +11,8 @@ class ImageData:
     # FUTURE_WORK: as a method to allow the node graph to be better supported, we could model some of
     # the node graph elements with numpy functions
 
-    def __init__(self, data: bytes, mime_type: str, name: str):
+    def __init__(self, data, mime_type: str, name: str):
+        # data is a bytes array, or a Future of a bytes array, see BinaryData.
         self._data = data
         self._mime_type = mime_type
         self._name = name
@@ -18,7 +20,10 @@ class ImageData:
         self._uri = None
 
     def __eq__(self, other):
-        return self._data == other.data
+        # Data being encoded (Future) is only equal to the same Future, consistent with the hash and without waiting.
+        if isinstance(self._data, Future) or isinstance(other._data, Future):
+            return self._data is other._data
+        return self._data == other._data
 
     def __hash__(self):
         return hash(self._data)
@@ -31,6 +36,8 @@ class ImageData:
 
     @property
     def data(self):
+        if isinstance(self._data, Future):
+            return self._data.result()
         return self._data
 
     @property
@@ -47,7 +54,7 @@ class ImageData:
 
     @property
     def byte_length(self):
-        return len(self._data)
+        return len(self.data)
 
     @property
     def uri(self):
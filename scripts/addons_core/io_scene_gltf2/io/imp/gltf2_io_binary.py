@@ -35,12 +35,13 @@ class BinaryData():
         """Get binary data for buffer view."""
         buffer_view = gltf.data.buffer_views[buffer_view_idx]
 
-        if buffer_view.buffer in gltf.buffers.keys():
-            buffer = gltf.buffers[buffer_view.buffer]
-        else:
-            # load buffer
-            gltf.load_buffer(buffer_view.buffer)
-            buffer = gltf.buffers[buffer_view.buffer]
+        with gltf.decode_accessor_lock:
+            if buffer_view.buffer in gltf.buffers.keys():
+                buffer = gltf.buffers[buffer_view.buffer]
+            else:
+                # load buffer
+                gltf.load_buffer(buffer_view.buffer)
+                buffer = gltf.buffers[buffer_view.buffer]
 
         byte_offset = buffer_view.byte_offset
         if byte_offset is None:
@@ -64,16 +65,25 @@ class BinaryData():
     @staticmethod
     def decode_accessor(gltf, accessor_idx, cache=False):
         """Decodes accessor to 2D numpy array (count x num_components)."""
-        if accessor_idx in gltf.decode_accessor_cache:
-            return gltf.accessor_cache[accessor_idx]
+        # Only the cache is locked, so that several threads can decode accessors at the same time.
+        with gltf.decode_accessor_lock:
+            array = gltf.get_decoded_accessor(accessor_idx)
+        if array is not None:
+            # Cached arrays are read-only and shared, callers not using the cache may modify theirs.
+            return array if cache else array.copy()
 
         accessor = gltf.data.accessors[accessor_idx]
         array = BinaryData.decode_accessor_obj(gltf, accessor)
 
         if cache:
-            gltf.accessor_cache[accessor_idx] = array
             # Prevent accidentally modifying cached arrays
             array.flags.writeable = False
+            with gltf.decode_accessor_lock:
+                # Another thread may have decoded the same accessor meanwhile, share its array.
+                array_cached = gltf.get_decoded_accessor(accessor_idx)
+                if array_cached is not None:
+                    return array_cached
+                gltf.cache_decoded_accessor(accessor_idx, array)
 
         return array
 
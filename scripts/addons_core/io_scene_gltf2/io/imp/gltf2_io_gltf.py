@@ -7,10 +7,15 @@ from ..com.gltf2_io import gltf_from_dict
 from ..com.debug import Log
 import logging
 import json
+import mmap
 import struct
 import base64
+import threading
+from collections import OrderedDict
 from os.path import dirname, join, isfile
 
+import numpy as np
+
 
 # Raise this error to have the importer report an error message.
 class ImportError(RuntimeError):
@@ -20,6 +25,10 @@ class ImportError(RuntimeError):
 class glTFImporter():
     """glTF Importer class."""
 
+    # Maximum memory used by decoded accessors kept in the decode cache, arrays which are views of the (memory-mapped)
+    # buffers are not counted since they don't use any memory of their own.
+    DECODE_ACCESSOR_CACHE_MAX_SIZE = 512 * 1024 * 1024
+
     def __init__(self, filename, import_settings):
         """initialization."""
         self.filename = filename
@@ -27,7 +36,12 @@ class glTFImporter():
         self.glb_buffer = None
         self.buffers = {}
         self.accessor_cache = {}
-        self.decode_accessor_cache = {}
+        # Least recently used decoded accessors come first.
+        self.decode_accessor_cache = OrderedDict()
+        self.decode_accessor_cache_size = 0
+        # Accessors can be decoded from several threads at the same time (see mesh import), this protects the caches
+        # and the lazy loading of the buffers.
+        self.decode_accessor_lock = threading.RLock()
         self.import_user_extensions = import_settings['import_user_extensions']
         self.variant_mapping = {}  # Used to map between mgltf material idx and blender material, for Variants
 
@@ -147,8 +161,7 @@ class glTFImporter():
         if not isfile(self.filename):
             raise ImportError("Please select a file")
 
-        with open(self.filename, 'rb') as f:
-            content = memoryview(f.read())
+        content = glTFImporter.read_file(self.filename)
 
         if content[:4] == b'glTF':
             gltf, self.glb_buffer = self.load_glb(content)
@@ -191,8 +204,53 @@ class glTFImporter():
 
         path = join(dirname(self.filename), uri_to_path(uri))
         try:
-            with open(path, 'rb') as f_:
-                return memoryview(f_.read())
+            return glTFImporter.read_file(path)
         except Exception:
             self.log.error("Couldn't read file: " + path)
             return None
+
+    @staticmethod
+    def read_file(path):
+        """Return the content of a file as a read-only memoryview, memory-mapped when possible so that only the parts
+        which are actually used get loaded."""
+        with open(path, 'rb') as f:
+            try:
+                # The mapping stays valid after the file is closed, until the memoryview and all arrays created from it
+                # have been released.
+                return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            except (ValueError, OSError):
+                # Empty files can't be mapped, nor files on some file systems.
+                return memoryview(f.read())
+
+    @staticmethod
+    def _decoded_accessor_size(array):
+        base = array
+        while isinstance(base, np.ndarray):
+            if base.flags.owndata:
+                return array.nbytes
+            base = base.base
+        # A view of a buffer.
+        return 0
+
+    def get_decoded_accessor(self, accessor_idx):
+        """Return the cached decoded array of an accessor, or None."""
+        array = self.decode_accessor_cache.get(accessor_idx)
+        if array is not None:
+            self.decode_accessor_cache.move_to_end(accessor_idx)
+        return array
+
+    def cache_decoded_accessor(self, accessor_idx, array):
+        """Add the decoded array of an accessor to the cache, evicting the least recently used ones if needed."""
+        self.uncache_decoded_accessor(accessor_idx)
+        self.decode_accessor_cache[accessor_idx] = array
+        self.decode_accessor_cache_size += glTFImporter._decoded_accessor_size(array)
+        max_size = self.DECODE_ACCESSOR_CACHE_MAX_SIZE
+        while self.decode_accessor_cache_size > max_size and len(self.decode_accessor_cache) > 1:
+            _accessor_idx, evicted = self.decode_accessor_cache.popitem(last=False)
+            self.decode_accessor_cache_size -= glTFImporter._decoded_accessor_size(evicted)
+
+    def uncache_decoded_accessor(self, accessor_idx):
+        """Remove an accessor from the decode cache, e.g. because its data changed."""
+        array = self.decode_accessor_cache.pop(accessor_idx, None)
+        if array is not None:
+            self.decode_accessor_cache_size -= glTFImporter._decoded_accessor_size(array)
@@ -147,6 +147,15 @@ class UI_AP_i18n_settings(AddonPreferences):
         set=lambda self, val: setattr(self._settings, "SPELL_CACHE", val),
     )
 
+    EXTRACT_CACHE: StringProperty(
+        name="Extraction Cache",
+        description="A cache storing messages extracted from each source file, to only process changed files",
+        subtype='FILE_PATH',
+        default=os.path.join("/tmp", ".extract_messages_cache"),
+        get=lambda self: self._settings.EXTRACT_CACHE,
+        set=lambda self, val: setattr(self._settings, "EXTRACT_CACHE", val),
+    )
+
     PY_SYS_PATHS: StringProperty(
         name="Import Paths",
         description="Additional paths to add to sys.path (';' separated)",
@@ -173,6 +182,7 @@ class UI_AP_i18n_settings(AddonPreferences):
         layout.prop(self, "SOURCE_DIR")
         layout.prop(self, "I18N_DIR")
         layout.prop(self, "SPELL_CACHE")
+        layout.prop(self, "EXTRACT_CACHE")
         layout.prop(self, "PY_SYS_PATHS")
 
         layout.separator()
@@ -27,6 +27,11 @@ RE_DEF_COMPLETE = re.compile(
     # allow opening bracket(s)
     r'''(?:\(|\s)*)$''')
 
+# Doc-strings & argument specifications of functions, see `get_doc_and_argspec`.
+# `{(id(func), is_bound_method): (func, doc, argspec), ...}`, the function is stored so its ID remains valid.
+DOC_ARGSPEC_CACHE = {}
+DOC_ARGSPEC_CACHE_SIZE = 256
+
 
 def reduce_newlines(text):
     """Reduces multiple newlines to a single newline.
@@ -130,6 +135,31 @@ def get_argspec(func, *, strip_self=True, doc=None, source=None):
     return argspec
 
 
+def get_doc_and_argspec(func):
+    """Get the doc string and argument specifications, cached per function.
+
+    Reading the doc string or source of a function may need to read its file,
+    which is slow for large modules.
+
+    :returns: doc string and argument specification
+    :rtype: tuple[str, str]
+    """
+    # Methods are created on access, use the function they wrap.
+    # Bound methods and their functions don't have the same argument specification (`self` is stripped).
+    func_key = getattr(func, '__func__', func)
+    cache_key = (id(func_key), func_key is not func)
+    entry = DOC_ARGSPEC_CACHE.get(cache_key)
+    if entry is not None and entry[0] is func_key:
+        return entry[1:]
+
+    doc = get_doc(func)
+    argspec = get_argspec(func, doc=doc)
+    if len(DOC_ARGSPEC_CACHE) >= DOC_ARGSPEC_CACHE_SIZE:
+        DOC_ARGSPEC_CACHE.clear()
+    DOC_ARGSPEC_CACHE[cache_key] = (func_key, doc, argspec)
+    return doc, argspec
+
+
 def complete(line, cursor, namespace):
     """Complete callable with call-tip.
 
@@ -162,8 +192,7 @@ def complete(line, cursor, namespace):
             func = None
 
         if func:
-            doc = get_doc(func)
-            argspec = get_argspec(func, doc=doc)
+            doc, argspec = get_doc_and_argspec(func)
             scrollback = func_word.split('.')[-1] + (argspec or '()')
             if doc.startswith(scrollback):
                 scrollback = doc
@@ -22,16 +22,27 @@ changes have been made:
 - sorted modules
 - added sphinx documentation
 - complete() returns a blank list of the module isn't found
+- module names are cached per path (can be saved & updated in the background)
 """
 
 
 import os
 import sys
+import threading
 
-TIMEOUT_STORAGE = 3  # Time in secs after which the root-modules will be stored
-TIMEOUT_GIVEUP = 20  # Time in secs after which we give up
+# Module names for directories in the python-path, see `module_list_cached`.
+# `{path: (mtime, names), ...}`
+MODULE_INDEX = {}
 
-ROOT_MODULES = None
+# Set when `MODULE_INDEX` is changed and needs to be saved to `_module_index_filepath`.
+_module_index_changed = False
+_module_index_filepath = None
+_module_index_thread = None
+# Serializes `module_index_save`, which may run from the main thread and the background thread at once.
+_module_index_save_lock = threading.Lock()
+
+# Increment when the contents of the index change.
+_MODULE_INDEX_VERSION = 1
 
 
 def get_root_modules():
@@ -42,22 +53,9 @@ def get_root_modules():
     :returns: modules
     :rtype: list[ModuleType]
     """
-    global ROOT_MODULES
     modules = []
-    if not (ROOT_MODULES is None):
-        return ROOT_MODULES
-    from time import time
-    t = time()
-    store = False
     for path in sys.path:
-        modules += module_list(path)
-        if time() - t >= TIMEOUT_STORAGE and not store:
-            # Caching the list of root modules, please wait!
-            store = True
-        if time() - t > TIMEOUT_GIVEUP:
-            # This is taking too long, we give up.
-            ROOT_MODULES = []
-            return []
+        modules += module_list_cached(path)
 
     modules += sys.builtin_module_names
 
@@ -67,8 +65,9 @@ def get_root_modules():
     modules = set(modules)
     modules.discard("__init__")
     modules = sorted(list(modules))
-    if store:
-        ROOT_MODULES = modules
+
+    if _module_index_changed and (_module_index_filepath is not None):
+        module_index_save(_module_index_filepath)
     return modules
 
 
@@ -84,8 +83,22 @@ def module_list(path):
     """
 
     if os.path.isdir(path):
-        folder_list = os.listdir(path)
-    elif path.endswith('.egg'):
+        folder_list = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    p = entry.name
+                    if p[-3:] in {'.py', '.so'} or p[-4:] in {'.pyc', '.pyo', '.pyd'}:
+                        folder_list.append(p)
+                    # Only directories can be packages, avoid checking files.
+                    elif entry.is_dir() and os.path.exists(os.path.join(path, p, '__init__.py')):
+                        folder_list.append(p)
+        except OSError:
+            pass
+        folder_list = [p.split('.')[0] for p in folder_list]
+        return folder_list
+
+    if path.endswith('.egg'):
         from zipimport import zipimporter
         try:
             folder_list = [f for f in zipimporter(path)._files]
@@ -104,6 +117,128 @@ def module_list(path):
     return folder_list
 
 
+def module_list_cached(path):
+    """
+    Return :func:`module_list` for a path, using the module index when the
+    modification time of the path is unchanged.
+
+    :param path: folder path
+    :type path: str
+    :returns: modules
+    :rtype: list[str]
+    """
+    global _module_index_changed
+
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return []
+
+    entry = MODULE_INDEX.get(path)
+    if entry is not None and entry[0] == mtime:
+        return entry[1]
+
+    modules = module_list(path)
+    MODULE_INDEX[path] = (mtime, modules)
+    _module_index_changed = True
+    return modules
+
+
+def module_index_load(filepath):
+    """
+    Add entries from a module index written by :func:`module_index_save`,
+    entries which are already indexed are kept.
+
+    :param filepath: the file to load, errors reading it are ignored.
+    :type filepath: str
+    """
+    import json
+
+    try:
+        with open(filepath, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except FileNotFoundError:
+        return
+    except Exception as ex:
+        print("Error reading module index:", repr(filepath), str(ex))
+        return
+
+    if (
+            type(data) is not dict or
+            data.get("version") != _MODULE_INDEX_VERSION or
+            data.get("python") != list(sys.version_info[:2]) or
+            type(paths := data.get("paths")) is not dict
+    ):
+        return
+
+    for path, (mtime, modules) in paths.items():
+        MODULE_INDEX.setdefault(path, (mtime, modules))
+
+
+def module_index_save(filepath):
+    """
+    Write the module index, so it can be used by new sessions.
+
+    :param filepath: the file to write, errors writing it are ignored.
+    :type filepath: str
+    """
+    global _module_index_changed
+    import json
+
+    # Don't create the directory as a side effect of auto-completion.
+    if not os.path.isdir(os.path.dirname(filepath)):
+        return
+
+    with _module_index_save_lock:
+        _module_index_changed = False
+        data = {
+            "version": _MODULE_INDEX_VERSION,
+            "python": list(sys.version_info[:2]),
+            # Copy as the index may be updated from another thread.
+            "paths": dict(MODULE_INDEX),
+        }
+        # Write to a temporary file first, so other instances never read a partially written index.
+        filepath_temp = "{:s}.{:d}.tmp".format(filepath, os.getpid())
+        try:
+            with open(filepath_temp, "w", encoding="utf-8") as fh:
+                json.dump(data, fh)
+            os.replace(filepath_temp, filepath)
+        except Exception as ex:
+            print("Error writing module index:", repr(filepath), str(ex))
+            try:
+                os.remove(filepath_temp)
+            except OSError:
+                pass
+
+
+def module_index_update_in_background(filepath=None):
+    """
+    Load the module index and update it for all paths in the python-path
+    from a background thread, so completing imports doesn't have to wait
+    for the file-system. This only runs once, calling again does nothing.
+
+    :param filepath: Optional file to load the index from and save it to.
+    :type filepath: str | None
+    """
+    global _module_index_filepath, _module_index_thread
+
+    if _module_index_thread is not None:
+        return
+
+    _module_index_filepath = filepath
+
+    def index_update():
+        if filepath is not None:
+            module_index_load(filepath)
+        for path in list(sys.path):
+            module_list_cached(path)
+        if _module_index_changed and (filepath is not None):
+            module_index_save(filepath)
+
+    _module_index_thread = threading.Thread(target=index_update, name="module_index_update", daemon=True)
+    _module_index_thread.start()
+
+
 def complete(line):
     """
     Returns a list containing the completion possibilities for an import line.
@@ -149,7 +284,7 @@ def complete(line):
             completion_list = []
         completion_list.extend(getattr(m, '__all__', []))
         if hasattr(m, '__file__') and '__init__' in m.__file__:
-            completion_list.extend(module_list(os.path.dirname(m.__file__)))
+            completion_list.extend(module_list_cached(os.path.dirname(m.__file__)))
         completion_list = list(set(completion_list))
         if '__init__' in completion_list:
             completion_list.remove('__init__')
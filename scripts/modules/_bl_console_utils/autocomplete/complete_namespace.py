@@ -15,6 +15,11 @@ RE_INCOMPLETE_INDEX = re.compile(r'(.*?)\[[^\]]+$')
 TEMP = '__tEmP__'  # only \w characters are allowed!
 TEMP_N = len(TEMP)
 
+# Attribute completions of types, see `complete_attributes`.
+# `{(type, attr): matches, ...}` where matches don't include the object expression.
+TYPE_MATCHES_CACHE = {}
+TYPE_MATCHES_CACHE_SIZE = 1024
+
 
 def is_dict(obj):
     """Returns whether obj is a dictionary"""
@@ -46,6 +51,53 @@ def complete_names(word, namespace):
     return sorted(set(completer.matches))
 
 
+def is_attributes_from_type(obj):
+    """Returns whether all instances of the type of obj have the same attributes.
+
+    This isn't the case for objects with a ``__dict__`` (modules, classes, ...)
+    or a custom ``__dir__`` (``bpy.context`` members depend on the context for example).
+    """
+    return (not hasattr(obj, "__dict__")) and (getattr(type(obj), "__dir__", None) is object.__dir__)
+
+
+def complete_attributes(obj, obj_expr, attr, namespace):
+    """Complete attributes of an object, the results are cached per type
+    when all instances of the type have the same attributes.
+
+    :param obj: object evaluated from obj_expr
+    :param obj_expr: sub-string which can be evaluated into obj
+    :type obj_expr: str
+    :param attr: (partial) attribute name to complete
+    :type attr: str
+    :param namespace: namespace
+    :type namespace: dict[str, Any]
+    :returns: completion matches
+    :rtype: list of str
+
+    >>> complete_attributes(1.0, 'x', 'is_', {})
+    ['x.is_integer()']
+    """
+    use_cache = is_attributes_from_type(obj)
+    if use_cache:
+        key = type(obj), attr
+        matches = TYPE_MATCHES_CACHE.get(key)
+    else:
+        matches = None
+
+    if matches is None:
+        namespace[TEMP] = obj
+        try:
+            matches = [match[TEMP_N:] for match in complete_names(TEMP + '.' + attr, namespace)]
+        finally:
+            del namespace[TEMP]
+        if use_cache:
+            if len(TYPE_MATCHES_CACHE) >= TYPE_MATCHES_CACHE_SIZE:
+                TYPE_MATCHES_CACHE.clear()
+            TYPE_MATCHES_CACHE[key] = matches
+
+    return [obj_expr + match for match in matches]
+
+
 def complete_indices(word, namespace, *, obj=None, base=None):
     """Complete a list or dictionary with its indices:
 
@@ -134,25 +186,21 @@ def complete(word, namespace, *, private=True):
         matches = complete_indices(word, namespace,
                                    base=re_incomplete_index.group(1))
 
-    elif not ('[' in word):
+    elif not ('[' in word or '.' in word):
         matches = complete_names(word, namespace)
 
     elif word[-1] == ']':
         matches = [word]
 
     elif '.' in word:
-        # brackets are normally not allowed -> work around
-
-        # remove brackets by using a temp var without brackets
-        obj, attr = word.rsplit('.', 1)
+        # Evaluate the object once, brackets are also not allowed by the standard completer.
+        obj_expr, attr = word.rsplit('.', 1)
         try:
             # do not run the obj expression in the console
-            namespace[TEMP] = eval(obj, namespace)
+            obj = eval(obj_expr, namespace)
         except BaseException:
             return []
-        matches = complete_names(TEMP + '.' + attr, namespace)
-        matches = [obj + match[TEMP_N:] for match in matches]
-        del namespace[TEMP]
+        matches = complete_attributes(obj, obj_expr, attr, namespace)
 
     else:
         # safety net, but when would this occur?
@@ -18,7 +18,7 @@ import glob
 from pathlib import PurePath
 
 # XXX Relative import does not work here when used from Blender...
-from _bl_i18n_utils import settings as settings_i18n, utils
+from _bl_i18n_utils import settings as settings_i18n, utils, utils_extract
 
 import bpy
 
@@ -485,10 +485,12 @@ def dump_rna_messages(msgs, reports, settings, verbose=False):
 
 
 ##### Python source code #####
-def dump_py_messages_from_files(msgs, reports, files, settings):
+def dump_py_messages_from_files(msgs, reports, files, settings, cache=None, cache_kind="py"):
     """
     Dump text inlined in the python files given, e.g. "My Name" in:
         ``layout.prop("someprop", text="My Name")``
+    Messages of files unchanged since they were stored in the given cache (an `utils_extract.ExtractCache`) are
+    taken from it, as results of `cache_kind`. Results of other files of that kind are dropped from the cache.
     """
     import ast
 
@@ -584,16 +586,28 @@ def dump_py_messages_from_files(msgs, reports, files, settings):
         opname, _ = bag[0]
         if not opname:
             return i18n_contexts.operator_default
+        ctxt = file_op_ctxts[opname] = _opname_to_ctxt(opname)
+        return ctxt
+
+    # Translation contexts of the operators used in the file being processed, stored with its cached messages.
+    file_op_ctxts = {}
+    op_ctxts = {}
+
+    def _opname_to_ctxt(opname):
+        ctxt = op_ctxts.get(opname)
+        if ctxt is not None:
+            return ctxt
         op = bpy.ops
         for n in opname.split('.'):
             op = getattr(op, n)
         try:
-            return op.get_rna_type().translation_context
+            ctxt = op.get_rna_type().translation_context
         except Exception as ex:
-            default_op_context = i18n_contexts.operator_default
+            ctxt = i18n_contexts.operator_default
             print("ERROR: ", str(ex))
-            print("       Assuming default operator context '{}'".format(default_op_context))
-            return default_op_context
+            print("       Assuming default operator context '{}'".format(ctxt))
+        op_ctxts[opname] = ctxt
+        return ctxt
 
     # Gather function names.
     # In addition of UI func, also parse pgettext ones...
@@ -707,14 +721,12 @@ def dump_py_messages_from_files(msgs, reports, files, settings):
             "spell_errors": check_ctxt.get("spell_errors"),
         }
 
-    for fp in files:
+    def extract_file(fp, fp_rel):
+        """Yield the (msgctxt, msgid, msgsrc) messages found in the given python file."""
         # ~ print("Checking File ", fp)
         with open(fp, 'r', encoding="utf8") as filedata:
             root_node = ast.parse(filedata.read(), fp, 'exec')
 
-        fp_rel = make_rel(fp)
-        fp_rel = PurePath(fp_rel).as_posix()
-
         for node in ast.walk(root_node):
             if type(node) == ast.Call:
                 # ~ print("found function at")
@@ -782,11 +794,46 @@ def dump_py_messages_from_files(msgs, reports, files, settings):
                                 msgsrc = "{}:{}".format(fp_rel, sorted({nd.lineno for nd in nds})[0])
                             else:
                                 msgsrc = "{}:???".format(fp_rel)
-                            process_msg(msgs, msgctxt, estr, msgsrc, reports, check_ctxt_py, settings)
-                            reports["py_messages"].append((msgctxt, estr, msgsrc))
-
-
-def dump_py_messages(msgs, reports, addons, settings, addons_only=False):
+                            yield (msgctxt, estr, msgsrc)
+
+    if cache is not None:
+        # Files are identified by their relative path, which is used for the message sources,
+        # so the absolute paths of the files don't change the results.
+        fingerprint = cache.fingerprint((
+            func_translate_args,
+            sorted((ctxt_id, getattr(i18n_contexts, ctxt_id)) for ctxt_id in i18n_ctxt_ids),
+            i18n_contexts.default,
+            i18n_contexts.operator_default,
+        ))
+
+    files_rel = []
+    for fp in files:
+        fp_rel = make_rel(fp)
+        fp_rel = PurePath(fp_rel).as_posix()
+        files_rel.append(fp_rel)
+
+        result = None
+        if cache is not None:
+            file_hash = cache.file_hash(fp)
+            result = cache.get(cache_kind, fingerprint, fp_rel, file_hash)
+            # Contexts of operators are not part of the fingerprint, check that those used by this file are unchanged.
+            if result is not None and any(_opname_to_ctxt(opname) != ctxt for opname, ctxt in result[1].items()):
+                result = None
+        if result is None:
+            file_op_ctxts.clear()
+            result = (tuple(extract_file(fp, fp_rel)), dict(file_op_ctxts))
+            if cache is not None:
+                cache.set(cache_kind, fingerprint, fp_rel, file_hash, result)
+
+        for msgctxt, estr, msgsrc in result[0]:
+            process_msg(msgs, msgctxt, estr, msgsrc, reports, check_ctxt_py, settings)
+            reports["py_messages"].append((msgctxt, estr, msgsrc))
+
+    if cache is not None:
+        cache.prune(cache_kind, files_rel)
+
+
+def dump_py_messages(msgs, reports, addons, settings, addons_only=False, cache=None):
     def _get_files(path):
         if not os.path.exists(path):
             return []
@@ -810,88 +857,29 @@ def dump_py_messages(msgs, reports, addons, settings, addons_only=False):
         else:
             files.append(fn)
 
-    dump_py_messages_from_files(msgs, reports, sorted(files), settings)
+    # Only some files are processed for add-ons, keep their results apart from the others.
+    cache_kind = "py_addons" if addons_only else "py"
+    dump_py_messages_from_files(msgs, reports, sorted(files), settings, cache, cache_kind)
 
 
 ##### C source code #####
-def dump_src_messages(msgs, reports, settings):
+def dump_src_messages(msgs, reports, settings, cache=None, num_jobs=1):
     def get_contexts():
         """Return a mapping {C_CTXT_NAME: ctxt_value}."""
         return {k: getattr(bpy.app.translations.contexts, n) for k, n in bpy.app.translations.contexts_C_to_py.items()}
 
     contexts = get_contexts()
-    _clean_str = re.compile(settings.str_clean_re).finditer
-
-    def clean_str(s):
-        # The encode/decode to/from 'raw_unicode_escape' allows to transform the C-type unicode hexadecimal escapes
-        # (like '\u00d7' for the '×' symbol) back into a proper unicode character.
-        return "".join(
-            m.group("clean") for m in _clean_str(s)
-        ).encode('raw_unicode_escape').decode('raw_unicode_escape')
-
-    def dump_src_file(path, rel_path, msgs, reports, settings):
-        def process_entry(_msgctxt, _msgid):
-            # Context.
-            msgctxt = settings.DEFAULT_CONTEXT
-            if _msgctxt:
-                if _msgctxt in contexts:
-                    msgctxt = contexts[_msgctxt]
-                elif '"' in _msgctxt or "'" in _msgctxt:
-                    msgctxt = clean_str(_msgctxt)
-                else:
-                    print("WARNING: raw context “{}” couldn’t be resolved!".format(_msgctxt))
-            # Message.
-            msgid = ""
-            if _msgid:
-                if '"' in _msgid or "'" in _msgid:
-                    msgid = clean_str(_msgid)
-                else:
-                    print("WARNING: raw message “{}” couldn’t be resolved!".format(_msgid))
-            return msgctxt, msgid
-
-        check_ctxt_src = None
-        if reports["check_ctxt"]:
-            check_ctxt = reports["check_ctxt"]
-            check_ctxt_src = {
-                "multi_lines": check_ctxt.get("multi_lines"),
-                "not_capitalized": check_ctxt.get("not_capitalized"),
-                "end_point": check_ctxt.get("end_point"),
-                "spell_checker": check_ctxt.get("spell_checker"),
-                "spell_errors": check_ctxt.get("spell_errors"),
-            }
-
-        data = ""
-        with open(path, encoding="utf8") as f:
-            data = f.read()
-
-        for keyword in settings.PYGETTEXT_KEYWORDS:
-            m = keyword.search(data)
-            line = pos = 0
-            while m:
-                d = m.groupdict()
-                # Line.
-                line += data[pos:m.start()].count('\n')
-                msgsrc = rel_path + ":" + str(line)
-                _msgid = d.get("msg_raw")
-                if _msgid not in {'""', "''"}:
-                    # First, try the "multi-contexts" stuff!
-                    _msgctxts = tuple(d.get("ctxt_raw{}".format(i)) for i in range(settings.PYGETTEXT_MAX_MULTI_CTXT))
-                    if _msgctxts[0]:
-                        for _msgctxt in _msgctxts:
-                            if not _msgctxt:
-                                break
-                            msgctxt, msgid = process_entry(_msgctxt, _msgid)
-                            process_msg(msgs, msgctxt, msgid, msgsrc, reports, check_ctxt_src, settings)
-                            reports["src_messages"].append((msgctxt, msgid, msgsrc))
-                    else:
-                        _msgctxt = d.get("ctxt_raw", keyword.context_override)
-                        msgctxt, msgid = process_entry(_msgctxt, _msgid)
-                        process_msg(msgs, msgctxt, msgid, msgsrc, reports, check_ctxt_src, settings)
-                        reports["src_messages"].append((msgctxt, msgid, msgsrc))
 
-                pos = m.end()
-                line += data[m.start():pos].count('\n')
-                m = keyword.search(data, pos)
+    check_ctxt_src = None
+    if reports["check_ctxt"]:
+        check_ctxt = reports["check_ctxt"]
+        check_ctxt_src = {
+            "multi_lines": check_ctxt.get("multi_lines"),
+            "not_capitalized": check_ctxt.get("not_capitalized"),
+            "end_point": check_ctxt.get("end_point"),
+            "spell_checker": check_ctxt.get("spell_checker"),
+            "spell_errors": check_ctxt.get("spell_errors"),
+        }
 
     forbidden = set()
     forced = set()
@@ -918,10 +906,20 @@ def dump_src_messages(msgs, reports, settings):
                 continue
             elif rel_path not in forced:
                 forced.add(rel_path)
+    files = []
     for rel_path in sorted(forced):
         path = os.path.join(settings.SOURCE_DIR, rel_path)
         if os.path.exists(path):
-            dump_src_file(path, rel_path, msgs, reports, settings)
+            files.append((path, rel_path))
+
+    # Files are processed in worker processes (or taken from the cache), but messages are added
+    # in the same (sorted) order as if they were processed here.
+    for rel_path, messages, warnings in utils_extract.extract_src_files(files, contexts, settings, cache, num_jobs):
+        for warning in warnings:
+            print(warning)
+        for msgctxt, msgid, msgsrc in messages:
+            process_msg(msgs, msgctxt, msgid, msgsrc, reports, check_ctxt_src, settings)
+            reports["src_messages"].append((msgctxt, msgid, msgsrc))
 
 
 def dump_preset_messages(msgs, reports, settings):
@@ -1177,7 +1175,7 @@ def dump_extension_metadata(msgs, reports, settings):
 
 
 ##### Main functions! #####
-def dump_messages(do_messages, do_checks, settings):
+def dump_messages(do_messages, do_checks, settings, num_jobs=1):
     bl_ver = "Blender " + bpy.app.version_string
     bl_hash = bpy.app.build_hash
     bl_time = time.strptime(f"{bpy.app.build_date.decode()} {bpy.app.build_time.decode()} UTC", "%Y-%m-%d %H:%M:%S %Z")
@@ -1198,14 +1196,19 @@ def dump_messages(do_messages, do_checks, settings):
 
     reports = _gen_reports(_gen_check_ctxt(settings) if do_checks else None)
 
+    # Messages extracted from unchanged python and C source files are reused.
+    cache = utils_extract.ExtractCache(settings)
+
     # Get strings from RNA.
     dump_rna_messages(msgs, reports, settings)
 
     # Get strings from UI layout definitions text="..." args.
-    dump_py_messages(msgs, reports, addons, settings)
+    dump_py_messages(msgs, reports, addons, settings, cache=cache)
 
     # Get strings from C source code.
-    dump_src_messages(msgs, reports, settings)
+    dump_src_messages(msgs, reports, settings, cache=cache, num_jobs=num_jobs)
+
+    cache.save()
 
     # Get strings from presets.
     dump_preset_messages(msgs, reports, settings)
@@ -1338,7 +1341,9 @@ def dump_addon_messages(addon_module_name, do_checks, settings):
 
     # get strings from UI layout definitions text="..." args
     reports["check_ctxt"] = check_ctxt
-    dump_py_messages(msgs, reports, {addon}, settings, addons_only=True)
+    cache = utils_extract.ExtractCache(settings)
+    dump_py_messages(msgs, reports, {addon}, settings, addons_only=True, cache=cache)
+    cache.save()
 
     # Get strings from the addon's bl_info
     dump_addon_bl_info(msgs, reports, addon, settings)
@@ -1361,6 +1366,8 @@ def main():
     parser.add_argument('-c', '--no_checks', default=True, action="store_false", help="No checks over UI messages.")
     parser.add_argument('-m', '--no_messages', default=True, action="store_false", help="No export of UI messages.")
     parser.add_argument('-o', '--output', default=None, help="Output POT file path.")
+    parser.add_argument('-j', '--jobs', default=1, type=int,
+                        help="Number of worker processes used to extract messages from C source code.")
     parser.add_argument('-s', '--settings', default=None,
                         help="Override (some) default settings. Either a JSON file name, or a JSON string.")
     args = parser.parse_args(argv)
@@ -1371,7 +1378,7 @@ def main():
     if args.output:
         settings.FILE_NAME_POT = args.output
 
-    dump_messages(do_messages=args.no_messages, do_checks=args.no_checks, settings=settings)
+    dump_messages(do_messages=args.no_messages, do_checks=args.no_checks, settings=settings, num_jobs=args.jobs)
 
 
 if __name__ == "__main__":
@@ -66,6 +66,182 @@ def get_best_similar(data):
     return key, tmp
 
 
+class SimilarMsgids:
+    """
+    Index of a pool of msgids, to quickly find the best similar one to a given msgid.
+
+    Gives the exact same results as `get_best_similar` (including which msgid is returned when several ones have the
+    same ratio), but only runs the costly `difflib.SequenceMatcher.ratio` on the few msgids that may still beat the
+    best match found so far:
+    * An inverted index of rare trigrams gives the most likely matches, which are checked first so that a good
+      ratio is known early. Trigrams are only used to order the search, never to discard msgids, as two strings can
+      have a ratio above the usual thresholds without sharing any trigram.
+    * Msgids are sorted by length, the length ratio (`real_quick_ratio`) of the best ratio found so far then gives
+      the range of lengths that remain to be searched.
+    * An inverted index of characters (the n-th occurrence of a character in a msgid being a distinct entry) gives
+      the amount of common characters (`quick_ratio`) of all msgids in that range at once, only the msgids with
+      enough common characters are then checked.
+    """
+
+    __slots__ = (
+        "msgids",
+        "_order",
+        "_lengths",
+        "_chars",
+        "_trigrams",
+    )
+
+    # Trigrams shared by more msgids than this are too common to help finding the best candidates.
+    TRIGRAMS_MAX_USERS = 32
+    # Maximum amount of msgids found through the trigram index, which are checked first.
+    TRIGRAMS_MAX_CANDIDATES = 8
+
+    def __init__(self, msgids):
+        self.msgids = msgids = tuple(msgids)
+        # Indices of the msgids sorted by length, positions in this list are used in the characters index.
+        self._order = order = sorted(range(len(msgids)), key=lambda i: len(msgids[i]))
+        self._lengths = [len(msgids[i]) for i in order]
+
+        chars = {}
+        for pos, idx in enumerate(order):
+            for c, num in collections.Counter(msgids[idx]).items():
+                for n in range(num):
+                    chars.setdefault((c, n), []).append(pos)
+        self._chars = chars
+
+        trigrams = {}
+        for idx, msgid in enumerate(msgids):
+            for tri in {msgid[i:i + 3] for i in range(len(msgid) - 2)}:
+                trigrams.setdefault(tri, []).append(idx)
+        self._trigrams = {tri: users for tri, users in trigrams.items() if len(users) <= self.TRIGRAMS_MAX_USERS}
+
+    def _trigram_candidates(self, msgid):
+        trigrams = self._trigrams
+        hits = collections.Counter()
+        for tri in {msgid[i:i + 3] for i in range(len(msgid) - 2)}:
+            users = trigrams.get(tri)
+            if users is not None:
+                hits.update(users)
+        return [idx for idx, _ in hits.most_common(self.TRIGRAMS_MAX_CANDIDATES)]
+
+    def best_similar(self, msgid, use_similar):
+        """
+        Return the msgid from the pool most similar to the given one (with a ratio of at least use_similar),
+        or None. Same as `get_best_similar`.
+        """
+        import bisect
+        import difflib
+
+        msgids = self.msgids
+        order = self._order
+        lengths = self._lengths
+
+        s = difflib.SequenceMatcher()
+        s.set_seq2(msgid)
+        len_key = len(msgid)
+        min_len = len_key // 2
+        max_len = len_key * 2
+
+        # Best ratio and index in the pool (the last msgid of the pool wins when several have the same ratio).
+        best_ratio = use_similar
+        best_idx = -1
+
+        def check(idx, bound):
+            # Same tests as in `get_best_similar`, bounds being computed the same way as
+            # `real_quick_ratio` and `quick_ratio`, so that the floating point values compare the same.
+            nonlocal best_ratio, best_idx
+            if bound < best_ratio or (bound == best_ratio and idx < best_idx):
+                return
+            s.set_seq1(msgids[idx])
+            ratio = s.ratio()
+            if ratio > best_ratio or (ratio == best_ratio and idx > best_idx):
+                best_ratio = ratio
+                best_idx = idx
+
+        checked = set()
+        for idx in self._trigram_candidates(msgid):
+            len_x = len(msgids[idx])
+            if min_len < len_x < max_len:
+                checked.add(idx)
+                check(idx, 2.0 * min(len_x, len_key) / (len_x + len_key))
+
+        # Range of lengths that can still give a ratio of at least `best_ratio`
+        # (one more on each side, to avoid any rounding issue, the exact bounds are checked below anyway).
+        pos_start = bisect.bisect_right(lengths, max(min_len, int(len_key * best_ratio / (2.0 - best_ratio)) - 1))
+        pos_end = bisect.bisect_left(lengths, min(max_len, int(len_key * (2.0 - best_ratio) / best_ratio) + 2))
+        if pos_start >= pos_end:
+            return msgids[best_idx] if best_idx >= 0 else None
+
+        # Amount of common characters with all msgids in that range.
+        chars = self._chars
+        hits = collections.Counter()
+        for c, num in collections.Counter(msgid).items():
+            for n in range(num):
+                positions = chars.get((c, n))
+                if positions is None:
+                    break
+                hits.update(positions[bisect.bisect_left(positions, pos_start):bisect.bisect_left(positions, pos_end)])
+
+        len_min = lengths[pos_start]
+        for pos, matches in hits.most_common():
+            if 2.0 * matches / (len_min + len_key) < best_ratio:
+                # No remaining msgid has enough common characters.
+                break
+            idx = order[pos]
+            if idx in checked:
+                continue
+            len_x = lengths[pos]
+            if (
+                min_len < len_x < max_len and
+                2.0 * min(len_x, len_key) / (len_x + len_key) >= best_ratio
+            ):
+                check(idx, 2.0 * matches / (len_x + len_key))
+
+        return msgids[best_idx] if best_idx >= 0 else None
+
+
+# Index used by the worker processes of `get_best_similars`.
+_similar_msgids_worker = None
+
+
+def _similar_msgids_worker_init(similar_pool):
+    global _similar_msgids_worker
+    _similar_msgids_worker = SimilarMsgids(similar_pool)
+
+
+def _similar_msgids_worker_best(data):
+    key, use_similar = data
+    return key, _similar_msgids_worker.best_similar(key[1], use_similar)
+
+
+def get_best_similars(keys, use_similar, similar_pool, num_jobs=1):
+    """
+    Yield (key, msgid) pairs, msgid being the best similar one to the key's msgid from the similar_pool,
+    or None, see `get_best_similar`.
+
+    When num_jobs is greater than one, keys are matched by that many worker processes. Those only use this module,
+    so this is also usable from Blender on platforms where worker processes are spawned (not forked).
+    """
+    keys = tuple(keys)
+    if num_jobs <= 1 or len(keys) < num_jobs * 16:
+        similar_msgids = SimilarMsgids(similar_pool)
+        for key in keys:
+            yield key, similar_msgids.best_similar(key[1], use_similar)
+        return
+
+    import concurrent.futures
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=num_jobs,
+            initializer=_similar_msgids_worker_init,
+            initargs=(tuple(similar_pool),),
+    ) as executor:
+        yield from executor.map(
+            _similar_msgids_worker_best,
+            tuple((key, use_similar) for key in keys),
+            chunksize=max(1, len(keys) // (num_jobs * 8)),
+        )
+
+
 _locale_explode_re = re.compile(r"^([a-z]{2,})(?:_([A-Za-z]{2,}))?(?:@([a-z]{2,}))?$")
 
 
@@ -602,12 +778,12 @@ class I18nMessages:
                 sm.is_fuzzy = m.is_fuzzy
                 sm.comment_lines = m.comment_lines
 
-    def update(self, ref, use_similar=None, keep_old_commented=True):
+    def update(self, ref, use_similar=None, keep_old_commented=True, num_jobs=1):
         """
         Update this I18nMessage with the ref one. Translations from ref are never used. Source comments from ref
         completely replace current ones. If use_similar is not 0.0, it will try to match new messages in ref with an
-        existing one. Messages no more found in ref will be marked as commented if keep_old_commented is True,
-        or removed.
+        existing one (using num_jobs worker processes, see `get_best_similars`). Messages no more found in ref will be
+        marked as commented if keep_old_commented is True, or removed.
         """
         if use_similar is None:
             use_similar = self.settings.SIMILAR_MSGID_THRESHOLD
@@ -633,8 +809,7 @@ class I18nMessages:
 
         # Next process new keys.
         if use_similar > 0.0:
-            for key, msgid in map(get_best_similar,
-                                  tuple((nk, use_similar, tuple(similar_pool.keys())) for nk in new_keys)):
+            for key, msgid in get_best_similars(new_keys, use_similar, similar_pool.keys(), num_jobs=num_jobs):
                 if msgid:
                     # Try to get the same context, else just get one...
                     skey = (key[0], msgid)
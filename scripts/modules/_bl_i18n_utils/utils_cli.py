@@ -21,7 +21,7 @@ def update_po(args, settings):
     if os.path.isfile(args.dst):
         uid = os.path.splitext(os.path.basename(args.dst))[0]
         po = utils_i18n.I18nMessages(uid=uid, kind='PO', src=args.dst, settings=settings)
-        po.update(pot)
+        po.update(pot, num_jobs=args.jobs)
     else:
         po = pot
     po.write(kind="PO", dest=args.dst)
@@ -96,6 +96,10 @@ def main():
         help="The source pot file to use as template for the update.",
     )
     sub_parser.add_argument('--dst', metavar='dst.po', required=True, help="The destination po to update.")
+    sub_parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help="The number of worker processes used to find similar messages for the new ones (default: 1).",
+    )
     sub_parser.set_defaults(func=update_po)
 
     sub_parser = sub_parsers.add_parser(
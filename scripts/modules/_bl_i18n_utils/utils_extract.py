@@ -0,0 +1,221 @@
+# SPDX-FileCopyrightText: 2026 Blender Authors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Parts of the messages extraction (see `bl_extract_messages.py`) which do not need Blender:
+# extraction of messages from C/C++ source code (optionally in worker processes),
+# and the on-disk cache of per-file extraction results.
+
+import hashlib
+import os
+import pickle
+import re
+
+# Increment whenever the way messages are extracted, or the content of the cached results, changes.
+CACHE_VERSION = 2
+
+
+class ExtractCache:
+    """
+    On-disk cache of the messages extracted from source files, keyed by the hash of their content.
+
+    Results are stored per kind of extraction (like "src" or "py"), each with a fingerprint of all the other data used
+    by that extraction (regexes, translation contexts...). Results of a kind are discarded when its fingerprint
+    changes.
+    """
+
+    def __init__(self, settings):
+        self.path = settings.EXTRACT_CACHE
+        self.hash_type = settings.PARSER_CACHE_HASH
+        # {kind: (fingerprint, {file_id: (file_hash, result)})}
+        self.data = {}
+        if not self.path or not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                version, data = pickle.load(f)
+        except Exception as ex:
+            print("WARNING: Failed to read messages extraction cache {} ({})".format(self.path, str(ex)))
+            return
+        if version == CACHE_VERSION:
+            self.data = data
+
+    def save(self):
+        if not self.path:
+            return
+        path_tmp = self.path + ".tmp"
+        try:
+            with open(path_tmp, 'wb') as f:
+                pickle.dump((CACHE_VERSION, self.data), f)
+            os.replace(path_tmp, self.path)
+        except Exception as ex:
+            print("WARNING: Failed to write messages extraction cache {} ({})".format(self.path, str(ex)))
+
+    def fingerprint(self, data):
+        return hashlib.new(self.hash_type, repr(data).encode("utf8")).hexdigest()
+
+    def file_hash(self, path):
+        with open(path, 'rb') as f:
+            return hashlib.new(self.hash_type, f.read()).hexdigest()
+
+    def get(self, kind, fingerprint, file_id, file_hash):
+        kind_fingerprint, results = self.data.get(kind, (None, None))
+        if kind_fingerprint != fingerprint:
+            return None
+        file_hash_cached, result = results.get(file_id, (None, None))
+        return result if file_hash_cached == file_hash else None
+
+    def set(self, kind, fingerprint, file_id, file_hash, result):
+        kind_fingerprint, results = self.data.get(kind, (None, None))
+        if kind_fingerprint != fingerprint:
+            results = {}
+            self.data[kind] = (fingerprint, results)
+        results[file_id] = (file_hash, result)
+
+    def prune(self, kind, live_ids):
+        """Drop the results of `kind` for files which are not in `live_ids` (deleted or renamed files)."""
+        _kind_fingerprint, results = self.data.get(kind, (None, None))
+        if results is None:
+            return
+        live_ids = set(live_ids)
+        for file_id in [file_id for file_id in results if file_id not in live_ids]:
+            del results[file_id]
+
+
+##### C source code #####
+def extract_src_file(path, rel_path, contexts, settings):
+    """
+    Extract the messages of a C/C++ source file, using the `PYGETTEXT_KEYWORDS` regexes.
+
+    Return a tuple of found (msgctxt, msgid, msgsrc) messages (as written in the source, i.e. escaped),
+    and a tuple of warnings. contexts is the mapping {C_CTXT_NAME: ctxt_value}.
+    """
+    _clean_str = re.compile(settings.str_clean_re).finditer
+    messages = []
+    warnings = []
+
+    def clean_str(s):
+        # The encode/decode to/from 'raw_unicode_escape' allows to transform the C-type unicode hexadecimal escapes
+        # (like '\u00d7' for the '×' symbol) back into a proper unicode character.
+        return "".join(
+            m.group("clean") for m in _clean_str(s)
+        ).encode('raw_unicode_escape').decode('raw_unicode_escape')
+
+    def process_entry(_msgctxt, _msgid):
+        # Context.
+        msgctxt = settings.DEFAULT_CONTEXT
+        if _msgctxt:
+            if _msgctxt in contexts:
+                msgctxt = contexts[_msgctxt]
+            elif '"' in _msgctxt or "'" in _msgctxt:
+                msgctxt = clean_str(_msgctxt)
+            else:
+                warnings.append("WARNING: raw context “{}” couldn’t be resolved!".format(_msgctxt))
+        # Message.
+        msgid = ""
+        if _msgid:
+            if '"' in _msgid or "'" in _msgid:
+                msgid = clean_str(_msgid)
+            else:
+                warnings.append("WARNING: raw message “{}” couldn’t be resolved!".format(_msgid))
+        return msgctxt, msgid
+
+    data = ""
+    with open(path, encoding="utf8") as f:
+        data = f.read()
+
+    for keyword in settings.PYGETTEXT_KEYWORDS:
+        m = keyword.search(data)
+        line = pos = 0
+        while m:
+            d = m.groupdict()
+            # Line.
+            line += data[pos:m.start()].count('\n')
+            msgsrc = rel_path + ":" + str(line)
+            _msgid = d.get("msg_raw")
+            if _msgid not in {'""', "''"}:
+                # First, try the "multi-contexts" stuff!
+                _msgctxts = tuple(d.get("ctxt_raw{}".format(i)) for i in range(settings.PYGETTEXT_MAX_MULTI_CTXT))
+                if _msgctxts[0]:
+                    for _msgctxt in _msgctxts:
+                        if not _msgctxt:
+                            break
+                        messages.append((*process_entry(_msgctxt, _msgid), msgsrc))
+                else:
+                    _msgctxt = d.get("ctxt_raw", keyword.context_override)
+                    messages.append((*process_entry(_msgctxt, _msgid), msgsrc))
+
+            pos = m.end()
+            line += data[m.start():pos].count('\n')
+            m = keyword.search(data, pos)
+
+    return tuple(messages), tuple(warnings)
+
+
+# Arguments of `extract_src_file` shared by all files, in the worker processes of `extract_src_files`.
+_src_worker_args = None
+
+
+def _src_worker_init(contexts, settings):
+    global _src_worker_args
+    _src_worker_args = (contexts, settings)
+
+
+def _src_worker_extract(file):
+    path, rel_path = file
+    return extract_src_file(path, rel_path, *_src_worker_args)
+
+
+def extract_src_files(files, contexts, settings, cache=None, num_jobs=1):
+    """
+    Extract the messages of the given (path, rel_path) C/C++ source files, see `extract_src_file`.
+
+    Yield (rel_path, messages, warnings) tuples, in the order of the given files. Results of unchanged files are taken
+    from the cache if given, other files are processed by num_jobs worker processes.
+    """
+    files = tuple(files)
+    results = {}
+    todo = []
+    if cache is not None:
+        fingerprint = cache.fingerprint((
+            sorted(contexts.items()),
+            settings.DEFAULT_CONTEXT,
+            settings.PYGETTEXT_MAX_MULTI_CTXT,
+            settings.str_clean_re,
+            tuple((keyword.re_expr, keyword.context_override) for keyword in settings.PYGETTEXT_KEYWORDS),
+        ))
+        file_hashes = {}
+        for path, rel_path in files:
+            file_hash = file_hashes[rel_path] = cache.file_hash(path)
+            result = cache.get("src", fingerprint, rel_path, file_hash)
+            if result is None:
+                todo.append((path, rel_path))
+            else:
+                results[rel_path] = result
+    else:
+        todo = files
+
+    if num_jobs > 1 and len(todo) > 1:
+        import concurrent.futures
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=num_jobs,
+                initializer=_src_worker_init,
+                initargs=(contexts, settings),
+        ) as executor:
+            todo_results = tuple(executor.map(
+                _src_worker_extract,
+                todo,
+                chunksize=max(1, len(todo) // (num_jobs * 8)),
+            ))
+    else:
+        todo_results = tuple(extract_src_file(path, rel_path, contexts, settings) for path, rel_path in todo)
+
+    for (_path, rel_path), result in zip(todo, todo_results):
+        results[rel_path] = result
+        if cache is not None:
+            cache.set("src", fingerprint, rel_path, file_hashes[rel_path], result)
+    if cache is not None:
+        cache.prune("src", (rel_path for _path, rel_path in files))
+
+    for _path, rel_path in files:
+        yield (rel_path, *results[rel_path])
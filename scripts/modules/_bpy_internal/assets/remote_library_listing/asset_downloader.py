@@ -132,6 +132,7 @@ def download_preview(
             lambda x: None,  # on-update callback.
             _preview_download_done,
             lambda x: None,  # on-queue-empty callback.
+            download_priority=http_dl.DownloadPriority.PREVIEW,
         )
         downloader.start()
         _preview_downloaders[asset_library_url] = downloader
@@ -216,6 +217,7 @@ class AssetDownloader:
 
     _bg_downloader: http_dl.BackgroundDownloader | None
     _num_assets_pending: int
+    _download_priority: int
 
     _status: DownloadStatus
     _error_message: str
@@ -239,6 +241,8 @@ class AssetDownloader:
         on_update_callback: OnUpdateCallback,
         on_asset_done_callback: OnAssetDoneCallback,
         on_done_callback: OnDoneCallback,
+        *,
+        download_priority: int = http_dl.DownloadPriority.ASSET,
     ) -> None:
         """Create a downloader for assets of a specific asset library.
 
@@ -262,12 +266,16 @@ class AssetDownloader:
             AssetDownloader) when at least one new asset finished downloading
             and was put in its final location, ready to be picked up by the
             asset system.
+
+        :param download_priority: priority of the downloads queued by this
+            downloader, see `http_dl.DownloadPriority`.
         """
         self._locator = RemoteAssetListingLocator(remote_url, local_path)
 
         self._on_done_callback = on_done_callback
         self._on_update_callback = on_update_callback
         self._on_asset_done_callback = on_asset_done_callback
+        self._download_priority = download_priority
 
         self._num_assets_pending = 0
 
@@ -362,6 +370,7 @@ class AssetDownloader:
             remote_url,
             download_to_path,
             self._on_asset_done,
+            priority=self._download_priority,
         )
         return download_to_path
 
@@ -23,8 +23,9 @@ from typing import Any
 import cattrs.preconf.json
 
 from . import hashing, listing_asset_catalogs, listing_common, json_parsing
-from . import cli_listing_generator_asset_finder as asset_finder
+from . import cli_listing_generator_manifest as manifest
 from . import cli_listing_generator_pagination as pagination
+from . import cli_listing_generator_workers as workers
 from . import blender_asset_library_openapi as api_models
 
 SCHEMA_VERSION = "1.0.0"
@@ -50,6 +51,8 @@ class CLIArguments:
     repository: Path
     limit: int
     page_size: int
+    jobs: int
+    use_manifest: bool
 
 
 def cli_main(arguments_raw: argparse.Namespace) -> None:
@@ -64,31 +67,51 @@ def cli_main(arguments_raw: argparse.Namespace) -> None:
     meta_json_path = arguments.repository / listing_common.ASSET_TOP_METADATA_FILENAME
     toplevel_meta = _toplevel_meta_read(meta_json_path)
 
-    # Find all .blend files.
-    filepaths: list[Path] = []
+    # Find all .blend files. They are sorted, so that the assets always end up
+    # on the same page as long as the library doesn't change.
     logger.info("Traversing %s", arguments.repository)
-    for filepath in arguments.repository.rglob("*.blend"):
-        filepaths.append(filepath)
+    filepaths: list[Path] = sorted(arguments.repository.rglob("*.blend"))
 
     files_total = len(filepaths)
     logger.info(f"* {files_total} .blend files found.")
 
     limit = _total_files_to_process(arguments, files_total)
+    filepaths = filepaths[:limit]
+
+    # Reuse what was found in the files that didn't change since the last run.
+    manifest_path = arguments.repository / listing_common.api_versioned(manifest.MANIFEST_FILENAME)
+    if arguments.use_manifest:
+        old_manifest = manifest.load(manifest_path)
+    else:
+        old_manifest = manifest.empty()
+
+    new_manifest = manifest.empty()
+    filepaths_to_scan: list[Path] = []
+    for filepath in filepaths:
+        entry = manifest.lookup(old_manifest, filepath, arguments.repository)
+        if entry is None:
+            filepaths_to_scan.append(filepath)
+            continue
+        new_manifest.entries[entry.file.path] = entry
+    logger.info(f"* {limit - len(filepaths_to_scan)} files unchanged since the previous run.")
 
     # Find the assets in the blend files.
     logger.info("Parsing the files...")
+    num_to_scan = len(filepaths_to_scan)
+    entries = workers.scan_files(filepaths_to_scan, arguments.repository, arguments.jobs)
+    for i, entry in enumerate(entries):
+        logger.info(f"* {i + 1}/{num_to_scan}: {entry.file.path}")
+        new_manifest.entries[entry.file.path] = entry
+
     assets: list[api_models.AssetV1] = []
     files: list[api_models.FileV1] = []
-
-    for i, filepath in enumerate(filepaths[:limit]):
-        logger.info(f"* {i + 1}/{limit}: {filepath.relative_to(arguments.repository)}")
-
-        bfile_info, assets_in_file = asset_finder.list_assets(filepath, arguments.repository)
-        if not assets_in_file:
+    for filepath in filepaths:
+        entry = new_manifest.entries[filepath.relative_to(arguments.repository).as_posix()]
+        if not entry.assets:
             continue
 
-        assets.extend(assets_in_file)
-        files.append(bfile_info)
+        assets.extend(entry.assets)
+        files.append(entry.file)
 
     # Write the listing index and the pages:
     asset_index_pages = pagination.paginate_asset_list(assets, files, arguments.page_size)
@@ -103,6 +126,10 @@ def cli_main(arguments_raw: argparse.Namespace) -> None:
     )
     _save_json(toplevel_meta, meta_json_path)
 
+    # Only save the manifest after everything was written, so that an interrupted
+    # run doesn't cause files to be skipped in the next run.
+    manifest.save(new_manifest, manifest_path)
+
 
 def _toplevel_meta_read(meta_json_path: Path) -> api_models.AssetLibraryMeta:
     try:
@@ -125,27 +152,34 @@ def _write_json_files(
     outdir_root = arguments.repository
     outdir_versioned = outdir_root / listing_common.API_VERSIONED_SUBDIR
 
-    # Remove old pages, in case the number of assets per page was increased and
-    # so less page files are needed.
-    existing_pages = outdir_versioned.glob("assets-*.json")
-    for filepath in existing_pages:
-        filepath.unlink()
-
     # Library Index Page /_v1/assets-{page}.json
     #
     # Note that these paths are determined by the generator, and their URLs are
     # listed explicitly in the index file, so there is no need to have those in
     # the listing_common.py file.
+    #
+    # Pages that didn't change are not rewritten, so that their modification
+    # time (and thus any HTTP caching based on it) remains the same.
     page_infos: list[api_models.URLWithHash] = []
+    page_paths: set[Path] = set()
     for page_index, page in enumerate(asset_index_pages):
         page_relpath = listing_common.api_versioned(f"assets-{page_index:05}.json")
-        _save_json(page, outdir_root / page_relpath)
+        page_path = outdir_root / page_relpath
+        _save_json(page, page_path)
+        page_paths.add(page_path)
 
         page_infos.append(api_models.URLWithHash(
             url=urllib.parse.quote(page_relpath.as_posix()),
-            hash=hashing.hash_file(page_relpath),
+            hash=hashing.hash_file(page_path),
         ))
 
+    # Remove old pages, in case the number of assets per page was increased and
+    # so less page files are needed.
+    for filepath in outdir_versioned.glob("assets-*.json"):
+        if filepath not in page_paths:
+            logger.info("Removing %s", filepath)
+            filepath.unlink()
+
     # Library Index file /_v1/asset-index.json:
     total_asset_count = sum(page.asset_count for page in asset_index_pages)
     total_file_count = sum(page.file_count for page in asset_index_pages)
@@ -168,8 +202,17 @@ def _write_json_files(
 
 
 def _save_json(model: Any, json_path: Path) -> None:
+    """Write the model as JSON, unless the file already has that exact content."""
     as_json = _converter.dumps(model, indent=2)
 
+    try:
+        if json_path.read_text() == as_json:
+            logger.debug("Unchanged %s", json_path)
+            return
+    except (IOError, UnicodeDecodeError):
+        # The file will be (over)written below.
+        pass
+
     json_path.parent.mkdir(exist_ok=True, parents=True)
 
     logger.info("Writing %s", json_path)
@@ -236,6 +279,23 @@ def add_cli_parser(subparsers: argparse._SubParsersAction) -> None:  # type: ign
         help="Number of assets per JSON file, set to 0 to disable pagination",
     )
 
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        metavar="NUM_WORKERS",
+        type=int,
+        default=1,
+        help="Number of background Blender processes to parse the files with, "
+        "set to 1 to parse them in this process",
+    )
+
+    parser.add_argument(
+        "--no-manifest",
+        dest="use_manifest",
+        action="store_false",
+        help="Parse all files, instead of reusing what was found in unchanged files during the previous run",
+    )
+
 
 def _parse_cli_args(arguments_raw: argparse.Namespace) -> CLIArguments:
     """Make sure the passed arguments are valid."""
@@ -249,6 +309,8 @@ def _parse_cli_args(arguments_raw: argparse.Namespace) -> CLIArguments:
         repository=repository,
         limit=arguments_raw.limit or 0,
         page_size=arguments_raw.page or 0,
+        jobs=max(arguments_raw.jobs or 1, 1),
+        use_manifest=arguments_raw.use_manifest,
     )
 
     return arguments
@@ -0,0 +1,139 @@
+# SPDX-FileCopyrightText: 2026 Blender Authors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from __future__ import annotations
+
+"""Per-file manifest of the listing generator.
+
+The manifest remembers, for every blend file, what the generator found in it
+the last time it ran. Files whose size and modification time did not change (or
+whose content hash did not change) reuse their previous entry, instead of being
+opened by Blender again.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import cattrs
+
+from . import blender_asset_library_openapi as api_models
+from . import hashing, json_parsing
+
+MANIFEST_VERSION = 1
+"""Version of the manifest data.
+
+Increment this whenever the way assets are found in blend files changes, so that
+manifests written by older versions are discarded.
+"""
+
+MANIFEST_FILENAME = ".listing-generator-manifest.json"
+"""Filename of the manifest, stored in the `API_VERSIONED_SUBDIR`."""
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class ManifestEntryV1:
+    mtime_ns: int
+    file: api_models.FileV1
+    assets: list[api_models.AssetV1]
+
+
+@dataclass
+class ManifestV1:
+    # This field has no default, so that it is always written to the JSON file.
+    manifest_version: int
+    entries: dict[str, ManifestEntryV1]
+    """Mapping from the file path (as in `FileV1.path`) to its entry."""
+
+
+def empty() -> ManifestV1:
+    return ManifestV1(manifest_version=MANIFEST_VERSION, entries={})
+
+
+def load(manifest_path: Path) -> ManifestV1:
+    """Load the manifest file.
+
+    Returns an empty manifest when the file does not exist, cannot be parsed, or
+    was written by another version of the generator.
+    """
+    try:
+        json_data = manifest_path.read_bytes()
+    except IOError:
+        # The file not existing is normal when generating the listing for the first time.
+        return empty()
+
+    parser = json_parsing.ValidatingParser()
+    try:
+        manifest = parser.parse_and_validate(ManifestV1, json_data)
+    except (json.JSONDecodeError, cattrs.errors.ClassValidationError) as ex:
+        log.warning("Manifest file %s could not be parsed, ignoring it: %s", manifest_path, ex)
+        return empty()
+
+    if manifest.manifest_version != MANIFEST_VERSION:
+        log.info("Manifest file %s has version %d, expected %d, ignoring it",
+                 manifest_path, manifest.manifest_version, MANIFEST_VERSION)
+        return empty()
+
+    return manifest
+
+
+def save(manifest: ManifestV1, manifest_path: Path) -> None:
+    parser = json_parsing.ValidatingParser()
+    as_json = parser.dumps(manifest)
+
+    manifest_path.parent.mkdir(exist_ok=True, parents=True)
+
+    # Write to a temporary file first, so that an interrupted run never leaves a
+    # half-written manifest behind.
+    manifest_path_tmp = manifest_path.with_name(manifest_path.name + ".tmp")
+    manifest_path_tmp.write_text(as_json)
+    os.replace(manifest_path_tmp, manifest_path)
+
+
+def lookup(manifest: ManifestV1, blendfile: Path, asset_library_root: Path) -> ManifestEntryV1 | None:
+    """Return the manifest entry of the blend file, if it is still up to date.
+
+    Returns None when the file is not in the manifest, or when it has changed
+    since the entry was created.
+    """
+    relative_posix = blendfile.relative_to(asset_library_root).as_posix()
+    entry = manifest.entries.get(relative_posix)
+    if entry is None:
+        return None
+
+    stat = blendfile.stat()
+    if stat.st_size != entry.file.size_in_bytes:
+        return None
+    if stat.st_mtime_ns == entry.mtime_ns:
+        return entry
+
+    # The file was touched, but that doesn't mean its contents changed.
+    if hashing.hash_file(blendfile) != entry.file.hash:
+        return None
+
+    entry.mtime_ns = stat.st_mtime_ns
+    return entry
+
+
+def scan_file(blendfile: Path, asset_library_root: Path) -> ManifestEntryV1:
+    """Find the assets in the blend file, and return them as manifest entry.
+
+    This uses the current Blender process to open the file.
+    """
+    from . import cli_listing_generator_asset_finder as asset_finder
+
+    # Get the modification time before the file is read, so that any change
+    # while reading it is detected the next time.
+    mtime_ns = blendfile.stat().st_mtime_ns
+
+    bfile_info, assets_in_file = asset_finder.list_assets(blendfile, asset_library_root)
+    return ManifestEntryV1(
+        mtime_ns=mtime_ns,
+        file=bfile_info,
+        assets=assets_in_file,
+    )
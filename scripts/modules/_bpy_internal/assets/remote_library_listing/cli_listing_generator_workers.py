@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: 2026 Blender Authors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from __future__ import annotations
+
+"""Worker pool for the listing generator.
+
+Finding the assets requires opening each blend file in Blender, which can only
+open one file at a time. To use more than one CPU core, the blend files are
+split into batches, and each batch is handed to a background Blender process.
+"""
+
+import concurrent.futures
+import logging
+import math
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Iterator
+
+from . import cli_listing_generator_manifest as manifest
+
+log = logging.getLogger(__name__)
+
+MAX_BATCH_SIZE = 32
+"""Maximum number of blend files handled by a single worker process.
+
+Larger batches amortize the startup time of Blender better, smaller batches
+spread the work more evenly over the workers.
+"""
+
+_WORKER_PYTHON_EXPR = (
+    "from _bpy_internal.assets.remote_library_listing import cli_listing_generator_workers; "
+    "cli_listing_generator_workers.worker_main()"
+)
+
+
+def scan_files(
+    blendfiles: list[Path],
+    asset_library_root: Path,
+    num_jobs: int,
+) -> Iterator[manifest.ManifestEntryV1]:
+    """Find the assets in the blend files, yielding a manifest entry per file.
+
+    With `num_jobs <= 1` the files are opened in this Blender process, one after
+    the other, in the given order. Otherwise they are handed to `num_jobs`
+    background Blender processes, and the entries are yielded in the order in
+    which they become available.
+    """
+
+    if num_jobs <= 1 or len(blendfiles) <= 1:
+        for blendfile in blendfiles:
+            yield manifest.scan_file(blendfile, asset_library_root)
+        return
+
+    # Aim for a few batches per worker, so that a worker getting a batch of
+    # large files doesn't keep the others waiting at the end.
+    batch_size = min(MAX_BATCH_SIZE, math.ceil(len(blendfiles) / (num_jobs * 4)))
+    batches = [blendfiles[i:i + batch_size] for i in range(0, len(blendfiles), batch_size)]
+    log.info("Parsing in %d batches of at most %d files, using %d workers", len(batches), batch_size, num_jobs)
+
+    with tempfile.TemporaryDirectory(prefix="blender-asset-listing-") as tempdir:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=num_jobs, thread_name_prefix="worker")
+        try:
+            futures = [
+                executor.submit(_run_worker, batch, asset_library_root, Path(tempdir) / f"batch-{batch_index:05}.json")
+                for batch_index, batch in enumerate(batches)
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                yield from future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _run_worker(
+    blendfiles: list[Path],
+    asset_library_root: Path,
+    result_path: Path,
+) -> list[manifest.ManifestEntryV1]:
+    """Run a background Blender process to find the assets in the blend files."""
+    import bpy
+
+    cmd = [
+        bpy.app.binary_path,
+        "--background",
+        "--factory-startup",
+        "--python-exit-code", "1",
+        "--python-expr", _WORKER_PYTHON_EXPR,
+        "--",
+        str(asset_library_root),
+        str(result_path),
+        *(str(blendfile) for blendfile in blendfiles),
+    ]
+
+    log.debug("Starting worker for %d files: %s", len(blendfiles), blendfiles[0])
+    proc = subprocess.run(cmd, stdin=subprocess.DEVNULL, capture_output=True, text=True, errors='replace')
+    if proc.returncode != 0 or not result_path.exists():
+        log.error("Worker failed with exit code %d, its output was:\n%s%s", proc.returncode, proc.stdout, proc.stderr)
+        raise RuntimeError(f"Worker failed to parse the batch of files starting at {blendfiles[0]}")
+    log.debug("Worker output:\n%s%s", proc.stdout, proc.stderr)
+
+    result = manifest.load(result_path)
+    if len(result.entries) != len(blendfiles):
+        raise RuntimeError(f"Worker returned {len(result.entries)} results for {len(blendfiles)} files")
+    return list(result.entries.values())
+
+
+def worker_main() -> None:
+    """Entry point of the worker processes, see `_run_worker()`.
+
+    Writes the found assets as manifest file, as that is already a convenient
+    format to transfer the entries back to the main process.
+    """
+    argv = sys.argv[sys.argv.index("--") + 1:]
+    asset_library_root = Path(argv[0])
+    result_path = Path(argv[1])
+    blendfiles = [Path(arg) for arg in argv[2:]]
+
+    result = manifest.empty()
+    for blendfile in blendfiles:
+        entry = manifest.scan_file(blendfile, asset_library_root)
+        result.entries[entry.file.path] = entry
+
+    manifest.save(result, result_path)
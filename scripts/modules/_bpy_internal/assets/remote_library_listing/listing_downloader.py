@@ -633,7 +633,12 @@ class RemoteAssetListingDownloader:
         remote_url = urllib.parse.urljoin(self._locator.remote_url, relative_url)
         download_to_path = self._locator.local_path / download_to_path
 
-        self._bg_downloader.queue_download(remote_url, download_to_path, on_done)
+        self._bg_downloader.queue_download(
+            remote_url,
+            download_to_path,
+            on_done,
+            priority=http_dl.DownloadPriority.LISTING,
+        )
 
         return download_to_path
 
@@ -12,12 +12,15 @@ import contextlib
 import datetime
 import sqlite3
 from pathlib import Path
-from typing import Iterator, Callable
+from typing import Iterable, Iterator, Callable, Sequence
 
 from . import types
 
 
 DB_TIMEOUT_MSEC = 5000  # SQLite busy timeout in milliseconds.
+# Maximum number of paths per query of fetch_hashes(). Older SQLite versions
+# do not allow more than 999 parameters in a single query.
+DB_MAX_PATHS_PER_QUERY = 900
 DB_SCHEMA_VERSION = 1
 CREATE_SCHEMA_V1 = """
 BEGIN EXCLUSIVE;
@@ -147,6 +150,33 @@ class SQLiteBackend:
             file_stat_mtime=mtime,
         )
 
+    def fetch_hashes(self, filepaths: Sequence[Path], hash_algorithm: str) -> dict[Path, types.FileHashInfo]:
+        """Return the cached hash info of the given files.
+
+        Files for which no info is cached are not included in the returned dictionary.
+        """
+
+        path_to_filepath = {str(filepath): filepath for filepath in filepaths}
+        paths = list(path_to_filepath)
+        hash_infos: dict[Path, types.FileHashInfo] = {}
+
+        with self._transaction_ro() as db:
+            for start in range(0, len(paths), DB_MAX_PATHS_PER_QUERY):
+                paths_chunk = paths[start:start + DB_MAX_PATHS_PER_QUERY]
+                cursor = db.execute(
+                    "SELECT f.path, h.size_in_bytes, h.hexdigest, h.file_stat_mtime " +
+                    "FROM files f INNER JOIN hashes h USING (file_id) " +
+                    "WHERE h.hash_algo=? AND f.path IN ({:s})".format(",".join("?" * len(paths_chunk))),
+                    (hash_algorithm, *paths_chunk))
+                for path, size, hex, mtime in cursor:
+                    hash_infos[path_to_filepath[path]] = types.FileHashInfo(
+                        hexhash=hex,
+                        file_size_bytes=size,
+                        file_stat_mtime=mtime,
+                    )
+
+        return hash_infos
+
     def store_hash(
             self,
             filepath: Path,
@@ -161,32 +191,52 @@ class SQLiteBackend:
             if pre_write_callback is not None:
                 pre_write_callback()
 
-            # The 'RETURNING file_id' ensures that we know which file ID was
-            # referenced. We can't rely on last_insert_rowid() or
-            # cursor.lastrowid, as that only works on actual INSERT and not on
-            # the 'ON CONFLICT' part. The 'DO UPDATE SET file_id=file_id' is
-            # senseless, but an update is necessary to get the `RETURNING
-            # file_id` to work (it won't return with `ON CONFLICT DO NOTHING`).
-            cursor = db.execute(
-                "INSERT INTO files (path) values (?) ON CONFLICT DO UPDATE SET file_id=file_id RETURNING file_id",
-                (str(filepath),),
-            )
-            file_id = cursor.fetchone()[0]
-            assert file_id, "file_id={!r}".format(file_id)
+            self._store_hash(db, filepath, hash_algorithm, hash_info, now)
 
-            db.execute(
-                "INSERT INTO hashes " +
-                "(file_id, hash_algo, hexdigest, size_in_bytes, file_stat_mtime, last_checked) " +
-                "VALUES (:file_id, :hash_algo, :hex, :size, :mtime, :now) ON CONFLICT DO UPDATE " +
-                "SET hexdigest=:hex, size_in_bytes=:size, file_stat_mtime=:mtime, last_checked=:now", {
-                    "file_id": file_id,
-                    "hash_algo": hash_algorithm,
-                    "hex": hash_info.hexhash,
-                    "size": hash_info.file_size_bytes,
-                    "mtime": hash_info.file_stat_mtime,
-                    "now": now,
-                },
-            )
+    def store_hashes(self, hash_infos: Iterable[tuple[Path, types.FileHashInfo]], hash_algorithm: str) -> None:
+        """Store pre-computed hashes for the given file paths, in a single transaction."""
+        now = self._now_string()
+
+        with self._transaction_rw() as db:
+            for filepath, hash_info in hash_infos:
+                self._store_hash(db, filepath, hash_algorithm, hash_info, now)
+
+    def _store_hash(
+            self,
+            db: sqlite3.Connection,
+            filepath: Path,
+            hash_algorithm: str,
+            hash_info: types.FileHashInfo,
+            now: str,
+    ) -> None:
+        """Store a hash, must be called from within a read-write transaction."""
+
+        # The 'RETURNING file_id' ensures that we know which file ID was
+        # referenced. We can't rely on last_insert_rowid() or
+        # cursor.lastrowid, as that only works on actual INSERT and not on
+        # the 'ON CONFLICT' part. The 'DO UPDATE SET file_id=file_id' is
+        # senseless, but an update is necessary to get the `RETURNING
+        # file_id` to work (it won't return with `ON CONFLICT DO NOTHING`).
+        cursor = db.execute(
+            "INSERT INTO files (path) values (?) ON CONFLICT DO UPDATE SET file_id=file_id RETURNING file_id",
+            (str(filepath),),
+        )
+        file_id = cursor.fetchone()[0]
+        assert file_id, "file_id={!r}".format(file_id)
+
+        db.execute(
+            "INSERT INTO hashes " +
+            "(file_id, hash_algo, hexdigest, size_in_bytes, file_stat_mtime, last_checked) " +
+            "VALUES (:file_id, :hash_algo, :hex, :size, :mtime, :now) ON CONFLICT DO UPDATE " +
+            "SET hexdigest=:hex, size_in_bytes=:size, file_stat_mtime=:mtime, last_checked=:now", {
+                "file_id": file_id,
+                "hash_algo": hash_algorithm,
+                "hex": hash_info.hexhash,
+                "size": hash_info.file_size_bytes,
+                "mtime": hash_info.file_stat_mtime,
+                "now": now,
+            },
+        )
 
     def mark_hash_as_fresh(self, filepath: Path, hash_algorithm: str) -> None:
         """Store that the hash is still considered 'fresh'.
@@ -201,6 +251,19 @@ class SQLiteBackend:
                 "WHERE file_id = (SELECT file_id FROM files WHERE path=?) AND hash_algo=?",
                 (now, str(filepath), hash_algorithm))
 
+    def mark_hashes_as_fresh(self, filepaths: Iterable[Path], hash_algorithm: str) -> None:
+        """Store that the hashes of these files are still considered 'fresh', in a single transaction.
+
+        See `remove_older_than()`.
+        """
+
+        now = self._now_string()
+        with self._transaction_rw() as db:
+            db.executemany(
+                "UPDATE hashes SET last_checked=? " +
+                "WHERE file_id = (SELECT file_id FROM files WHERE path=?) AND hash_algo=?",
+                ((now, str(filepath), hash_algorithm) for filepath in filepaths))
+
     def remove_older_than(self, *, days: int) -> None:
         """Remove all hash entries that are older than this many days.
 
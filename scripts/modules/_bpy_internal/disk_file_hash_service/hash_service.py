@@ -4,15 +4,27 @@
 
 from __future__ import annotations
 
+import concurrent.futures
 import hashlib
+import mmap
+import os
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterable
 
 from . import types
 
 # Chunk size of the hashing process, in bytes.
 HASH_BLOCK_SIZE = 1024 * 1024
 
+# Files of at least this size are hashed via a memory map instead of being read
+# block by block. This avoids copying the file into Python buffers, and hashes it
+# in one call that releases the GIL. Set to 0 to disable memory-mapping.
+HASH_MMAP_MIN_SIZE = 16 * 1024 * 1024
+
+# Maximum number of threads used to hash files in get_hashes() and files_match().
+# The hashing functions of hashlib release the GIL, so files can be hashed in parallel.
+HASH_MAX_THREADS = min(8, os.cpu_count() or 1)
+
 # Hashes that have not been 'used' in this many days are removed from the database.
 # A 'use' means actually storing/updating the hash itself, or seeing that the
 # stats (file size & mtime) still match the file on disk.
@@ -65,6 +77,41 @@ class DiskFileHashService:
         self.backend.store_hash(filepath, hash_algorithm, fresh_info)
         return fresh_info.hexhash
 
+    def get_hashes(self, filepaths: Iterable[Path], hash_algorithm: str) -> dict[Path, str]:
+        """Return the hashes of multiple files on disk.
+
+        This is equivalent to calling `get_hash()` for each file, but accesses
+        the back-end only a few times for all files together, and hashes the
+        files that have no fresh cached hash on multiple threads.
+
+        :raises FileNotFoundError: if one of the files does not exist.
+        """
+        filepaths = list(dict.fromkeys(filepaths))
+        cached_infos = self.backend.fetch_hashes(filepaths, hash_algorithm)
+
+        hashes: dict[Path, str] = {}
+        fresh_filepaths: list[Path] = []
+        stale_filepaths: list[Path] = []
+        for filepath in filepaths:
+            cached_info = cached_infos.get(filepath)
+            if cached_info and self._file_stat_matches(
+                    filepath, cached_info.file_size_bytes, cached_info.file_stat_mtime):
+                hashes[filepath] = cached_info.hexhash
+                fresh_filepaths.append(filepath)
+            else:
+                stale_filepaths.append(filepath)
+
+        if fresh_filepaths:
+            self.backend.mark_hashes_as_fresh(fresh_filepaths, hash_algorithm)
+
+        if stale_filepaths:
+            fresh_infos = self._hash_files(stale_filepaths, hash_algorithm)
+            self.backend.store_hashes(zip(stale_filepaths, fresh_infos), hash_algorithm)
+            for filepath, fresh_info in zip(stale_filepaths, fresh_infos):
+                hashes[filepath] = fresh_info.hexhash
+
+        return hashes
+
     def store_hash(
             self,
             filepath: Path,
@@ -122,6 +169,45 @@ class DiskFileHashService:
         actual_hash = self.get_hash(filepath, hash_algorithm)
         return actual_hash == hexhash
 
+    def files_match(self, items: Iterable[tuple[Path, str, int]], hash_algorithm: str) -> list[bool]:
+        """Check multiple files on disk, to see if they match the given properties.
+
+        :param items: tuples (filepath, hexhash, size_in_bytes), in the same
+            form as the parameters of `file_matches()`.
+        :returns: for each item, whether the file matches. Contrary to
+            `file_matches()`, files that do not exist or cannot be read are
+            reported as not matching, instead of raising an exception.
+        """
+        items = list(items)
+
+        # Check the file sizes first, only the files of the right size have to be hashed.
+        size_matches: list[bool] = []
+        for filepath, _, size_in_bytes in items:
+            try:
+                stat = filepath.stat()
+            except OSError:
+                size_matches.append(False)
+                continue
+            size_matches.append(stat.st_size == size_in_bytes)
+
+        to_hash = [filepath for (filepath, _, _), size_match in zip(items, size_matches) if size_match]
+        actual_hashes: dict[Path, str | None]
+        try:
+            actual_hashes = dict(self.get_hashes(to_hash, hash_algorithm))
+        except OSError:
+            # A file disappeared (or became unreadable) after its size was checked.
+            # Hash the files one by one, to only report the affected ones as not matching.
+            actual_hashes = {}
+            for filepath in to_hash:
+                try:
+                    actual_hashes[filepath] = self.get_hash(filepath, hash_algorithm)
+                except OSError:
+                    actual_hashes[filepath] = None
+        return [
+            size_match and actual_hashes[filepath] == hexhash
+            for (filepath, hexhash, _), size_match in zip(items, size_matches)
+        ]
+
     def _file_stat_matches(self, filepath: Path, size_in_bytes: int, file_stat_mtime: float) -> bool:
         """Check whether the file on disk matches this size & timestamp."""
         try:
@@ -135,8 +221,12 @@ class DiskFileHashService:
 
         hasher = self._get_hasher(hash_algorithm)
         with filepath.open(mode="rb") as infile:
-            while block := infile.read(HASH_BLOCK_SIZE):
-                hasher.update(block)
+            if HASH_MMAP_MIN_SIZE and stat.st_size >= HASH_MMAP_MIN_SIZE:
+                with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    hasher.update(mapped)
+            else:
+                while block := infile.read(HASH_BLOCK_SIZE):
+                    hasher.update(block)
 
         return types.FileHashInfo(
             hexhash=hasher.hexdigest(),
@@ -144,6 +234,20 @@ class DiskFileHashService:
             file_stat_mtime=stat.st_mtime,
         )
 
+    def _hash_files(self, filepaths: list[Path], hash_algorithm: str) -> list[types.FileHashInfo]:
+        """Hash the files, on multiple threads if there is more than one."""
+
+        # Construct a hasher before starting any thread, so that an unavailable
+        # hash algorithm is reported once, and without hashing anything.
+        self._get_hasher(hash_algorithm)
+
+        if len(filepaths) == 1 or HASH_MAX_THREADS <= 1:
+            return [self._hash_file(filepath, hash_algorithm) for filepath in filepaths]
+
+        num_threads = min(HASH_MAX_THREADS, len(filepaths))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
+            return list(executor.map(lambda filepath: self._hash_file(filepath, hash_algorithm), filepaths))
+
     def _get_hasher(self, algorithm: str) -> hashlib._Hash:
         """Construct a hasher for the given hash algorithm.
 
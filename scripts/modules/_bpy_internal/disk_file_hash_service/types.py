@@ -3,7 +3,7 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 
 from pathlib import Path
-from typing import Protocol, Callable
+from typing import Protocol, Callable, Iterable, Sequence
 import dataclasses
 
 
@@ -36,6 +36,13 @@ class DiskFileHashBackend(Protocol):
         If no info is cached for this path/algorithm combo, returns None.
         """
 
+    def fetch_hashes(self, filepaths: Sequence[Path], hash_algorithm: str) -> dict[Path, FileHashInfo]:
+        """Return the cached hash info of the given files.
+
+        Files for which no info is cached for this algorithm are not included in
+        the returned dictionary.
+        """
+
     def store_hash(
         self,
         filepath: Path,
@@ -48,12 +55,21 @@ class DiskFileHashBackend(Protocol):
         See DiskFileHashService.store_hash() for an explanation of the parameters.
         """
 
+    def store_hashes(self, hash_infos: Iterable[tuple[Path, FileHashInfo]], hash_algorithm: str) -> None:
+        """Store pre-computed hashes for the given file paths, in one go."""
+
     def mark_hash_as_fresh(self, filepath: Path, hash_algorithm: str) -> None:
         """Store that the hash is still considered 'fresh'.
 
         See `remove_older_than()`.
         """
 
+    def mark_hashes_as_fresh(self, filepaths: Iterable[Path], hash_algorithm: str) -> None:
+        """Store that the hashes of these files are still considered 'fresh'.
+
+        See `remove_older_than()`.
+        """
+
     def remove_older_than(self, *, days: int) -> None:
         """Remove all hash entries that are older than this many days.
 
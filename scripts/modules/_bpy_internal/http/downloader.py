@@ -8,6 +8,7 @@ __all__ = (
     "ConditionalDownloader",
     "DownloaderOptions",
     "BackgroundDownloader",
+    "DownloadPriority",
     "DownloadReporter",
     "QueueingReporter",
     "MetadataProvider",
@@ -28,13 +29,18 @@ import contextlib
 import dataclasses
 import enum
 import hashlib
+import heapq
+import itertools
 import logging
 import multiprocessing
 import multiprocessing.connection
 import multiprocessing.process
 import os
+import queue
 import sys
+import threading
 import time
+import urllib.parse
 import zlib  # For streaming gzip decompression.
 from collections.abc import Callable
 from pathlib import Path
@@ -390,6 +396,16 @@ class DownloaderOptions:
     """
     http_headers: dict[str, str] = dataclasses.field(default_factory=dict)
 
+    max_concurrent_downloads: int = 6
+    """Number of downloads the background process performs simultaneously."""
+
+    max_downloads_per_host: int = 6
+    """Maximum number of simultaneous downloads from the same host.
+
+    All downloads share the HTTP connection pool of a single `requests.Session`,
+    so this is also the maximum number of connections kept open to each host.
+    """
+
     def __post_init__(self) -> None:
         self._ensure_user_agent()
 
@@ -425,6 +441,23 @@ class DownloaderOptions:
         self.http_headers['user-agent'] = user_agent
 
 
+class DownloadPriority(enum.IntEnum):
+    """Priorities of queued downloads, lower values are downloaded first.
+
+    Any integer can be used as priority, these are the ones used for remote
+    asset libraries.
+    """
+
+    LISTING = 0
+    """Listing files, which are needed to know what else to download."""
+
+    PREVIEW = 10
+    """Preview images."""
+
+    ASSET = 20
+    """Asset files, also the default priority."""
+
+
 class BackgroundDownloader:
     """Wrapper for a ConditionalDownloader + reporters.
 
@@ -446,8 +479,8 @@ class BackgroundDownloader:
     # VSCode) doesn't fully grasp the `from __future__ import annotations` yet.
     # Or at least so it seems - it shows these lines in error, while both mypy
     # is fine with it and at runtime it works.
-    QueuedDownload: TypeAlias = tuple['RequestDescription', Path]
-    """Tuple of URL to download, and path to download it to."""
+    QueuedDownload: TypeAlias = tuple['RequestDescription', Path, int]
+    """Tuple of URL to download, path to download it to, and download priority."""
 
     # Keep track of which callback to call on the completion of which HTTP request.
     # This assumes that RequestDescriptions are unique, and not queued up
@@ -500,8 +533,14 @@ class BackgroundDownloader:
                        on_download_done: DownloadDoneCallback | None = None,
                        *,
                        http_method: str = 'GET',
+                       priority: int = DownloadPriority.ASSET,
                        ) -> None:
-        """Queue up a download of some URL to a location on disk."""
+        """Queue up a download of some URL to a location on disk.
+
+        Queued downloads with a lower priority value are started first, see
+        `DownloadPriority`. Downloads with the same priority are started in the
+        order they were queued.
+        """
 
         if self._shutdown_event.is_set():
             raise RuntimeError("BackgroundDownloader is shutting down, cannot queue new downloads")
@@ -517,7 +556,7 @@ class BackgroundDownloader:
 
         self._connection.send(PipeMessage(
             msgtype=PipeMsgType.QUEUE_DOWNLOAD,
-            payload=(http_req_descr, local_path),
+            payload=(http_req_descr, local_path, int(priority)),
         ))
 
     @property
@@ -769,6 +808,97 @@ class PipeMessage:
     payload: Any
 
 
+class _DownloadScheduler:
+    """Thread-safe queue of downloads, ordered by priority.
+
+    Limits the number of simultaneous downloads per host, and never runs two
+    downloads to the same local path simultaneously.
+    """
+
+    # Per host, heap of (priority, sequence number, queued download).
+    _queued_per_host: dict[str, list[tuple[int, int, BackgroundDownloader.QueuedDownload]]]
+    _num_active_per_host: collections.Counter[str]
+    _active_local_paths: set[Path]
+    # Downloads postponed because a download to the same path was running.
+    _postponed: list[tuple[int, int, BackgroundDownloader.QueuedDownload]]
+
+    def __init__(self, max_downloads_per_host: int) -> None:
+        self._max_downloads_per_host = max(1, max_downloads_per_host)
+        self._queued_per_host = collections.defaultdict(list)
+        self._num_active_per_host = collections.Counter()
+        self._active_local_paths = set()
+        self._postponed = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._is_shut_down = False
+
+    @staticmethod
+    def _host(queued_download: BackgroundDownloader.QueuedDownload) -> str:
+        return urllib.parse.urlsplit(queued_download[0].url).netloc
+
+    def put(self, queued_download: BackgroundDownloader.QueuedDownload) -> None:
+        priority = queued_download[2]
+        with self._condition:
+            heapq.heappush(
+                self._queued_per_host[self._host(queued_download)],
+                (priority, next(self._sequence), queued_download),
+            )
+            self._condition.notify()
+
+    def get(self) -> BackgroundDownloader.QueuedDownload | None:
+        """Block until a download can be started, and return it.
+
+        Return None when the scheduler is shut down. The caller must call
+        `done()` when the returned download is finished.
+        """
+        with self._condition:
+            while True:
+                if self._is_shut_down:
+                    return None
+                queued_download = self._pop_startable()
+                if queued_download is not None:
+                    break
+                self._condition.wait()
+
+            self._num_active_per_host[self._host(queued_download)] += 1
+            self._active_local_paths.add(queued_download[1])
+            return queued_download
+
+    def _pop_startable(self) -> BackgroundDownloader.QueuedDownload | None:
+        """Pop the highest priority download that can be started now."""
+        while True:
+            best_heap = None
+            for host, heap in self._queued_per_host.items():
+                if not heap or self._num_active_per_host[host] >= self._max_downloads_per_host:
+                    continue
+                if best_heap is None or heap[0] < best_heap[0]:
+                    best_heap = heap
+            if best_heap is None:
+                return None
+
+            item = heapq.heappop(best_heap)
+            queued_download = item[2]
+            if queued_download[1] not in self._active_local_paths:
+                return queued_download
+            # Retried when the download to the same path is done.
+            self._postponed.append(item)
+
+    def done(self, queued_download: BackgroundDownloader.QueuedDownload) -> None:
+        with self._condition:
+            self._num_active_per_host[self._host(queued_download)] -= 1
+            self._active_local_paths.discard(queued_download[1])
+            for item in self._postponed:
+                heapq.heappush(self._queued_per_host[self._host(item[2])], item)
+            self._postponed.clear()
+            self._condition.notify_all()
+
+    def shutdown(self) -> None:
+        """Make all current and future `get()` calls return None."""
+        with self._condition:
+            self._is_shut_down = True
+            self._condition.notify_all()
+
+
 def _download_queued_items(
         connection: multiprocessing.connection.Connection,
         options: DownloaderOptions,
@@ -776,9 +906,12 @@ def _download_queued_items(
     """Runs in a daemon process to download stuff.
 
     Managed by the BackgroundDownloader class above.
+
+    Incoming messages are handled by an RX thread, and reports are sent back by
+    a TX thread. Downloads are performed by a pool of worker threads, taking
+    their work from a _DownloadScheduler. All threads block until they have
+    something to do, instead of polling.
     """
-    import queue
-    import threading
 
     # logging.basicConfig(
     #     format="%(asctime)-15s %(processName)22s %(levelname)8s %(name)s %(message)s",
@@ -787,50 +920,44 @@ def _download_queued_items(
     log = logger.getChild('background_process')
     log.info('Downloader background process starting')
 
-    # Local queue for incoming messages.
-    rx_queue: queue.Queue[PipeMessage] = queue.Queue()
-
-    # Local queue of stuff to download.
-    download_queue: collections.deque[BackgroundDownloader.QueuedDownload] = collections.deque()
+    scheduler = _DownloadScheduler(options.max_downloads_per_host)
 
     # Local queue of reports to send back to the main process.
-    reporter = QueueingReporter()
+    reporter = _BlockingQueueingReporter()
 
     do_shutdown = threading.Event()
 
     def rx_thread_func() -> None:
         """Process incoming messages."""
         while not do_shutdown.is_set():
-            # Always keep receiving messages while they're coming in,
-            # to prevent the remote end hanging on their send() call.
-            # Only once that's done should we check the do_shutdown event.
-            while connection.poll():
-                try:
-                    received_msg: PipeMessage = connection.recv()
-                except (EOFError, OSError):
-                    # The Python documentation mentions EOFError, but in
-                    # practice I (Sybren) have also seen a ConnectionResetError
-                    # being raised when Blender shuts down uncleanly. The
-                    # implementation of .send() shows that it can also raise an
-                    # OSError, which is the superclass of ConnectionResetError
-                    # as well, so that's why that's caught here.
-                    log.warning("Blender is no longer running, shutting down the downloader process")
-                    do_shutdown.set()
-                    return
+            try:
+                received_msg: PipeMessage = connection.recv()
+            except (EOFError, OSError):
+                # The Python documentation mentions EOFError, but in
+                # practice I (Sybren) have also seen a ConnectionResetError
+                # being raised when Blender shuts down uncleanly. The
+                # implementation of .send() shows that it can also raise an
+                # OSError, which is the superclass of ConnectionResetError
+                # as well, so that's why that's caught here.
+                log.warning("Blender is no longer running, shutting down the downloader process")
+                do_shutdown.set()
+                return
 
-                log.info("received message: %s", received_msg)
-                rx_queue.put(received_msg)
+            log.info("received message: %s", received_msg)
+            match received_msg.msgtype:
+                case PipeMsgType.CANCEL:
+                    do_shutdown.set()
+                case PipeMsgType.QUEUE_DOWNLOAD:
+                    scheduler.put(received_msg.payload)
+                case PipeMsgType.REPORT:
+                    # Reports are sent by us, not by the other side.
+                    pass
 
     def tx_thread_func() -> None:
         """Send queued reports back to the main process."""
-        while not do_shutdown.is_set():
-            try:
-                queued_call = reporter.pop()
-            except IndexError:
-                # Not having anything to do is fine.
-                time.sleep(0.01)
-                continue
-
+        # Keep sending until woken up at shutdown, so that the reports of
+        # cancelled downloads also reach the main process.
+        while (queued_call := reporter.pop_blocking()) is not None:
             queued_msg = PipeMessage(
                 msgtype=PipeMsgType.REPORT,
                 payload=queued_call,
@@ -848,57 +975,34 @@ def _download_queued_items(
                 do_shutdown.set()
                 return
 
-    rx_thread = threading.Thread(target=rx_thread_func)
-    tx_thread = threading.Thread(target=tx_thread_func)
-
-    rx_thread.start()
-    tx_thread.start()
-
     def periodic_check() -> bool:
-        """Handle received messages, and return whether we can keep running.
+        """Return whether downloads can keep running.
 
-        Called periodically by this function, as well as by the downloader.
+        Called periodically by the downloaders.
         """
-
-        while not do_shutdown.is_set():
-            try:
-                received_msg: PipeMessage = rx_queue.get(block=False)
-            except queue.Empty:
-                # Not receiving anything is fine.
-                return not do_shutdown.is_set()
-
-            match received_msg.msgtype:
-                case PipeMsgType.CANCEL:
-                    do_shutdown.set()
-                case PipeMsgType.QUEUE_DOWNLOAD:
-                    download_queue.append(received_msg.payload)
-                case PipeMsgType.REPORT:
-                    # Reports are sent by us, not by the other side.
-                    pass
-
         return not do_shutdown.is_set()
 
-    # Construct a ConditionalDownloader. Unfortunately this is necessary, as
-    # not all its properties can be pickled, and as a result, it cannot be
-    # used to send across process boundaries via the multiprocessing module.
-    downloader = ConditionalDownloader(
-        metadata_provider=options.metadata_provider,
-    )
-    downloader.http_session.headers.update(options.http_headers)
-    downloader.add_reporter(reporter)
-    downloader.periodic_check = periodic_check
-    downloader.timeout = options.timeout
+    # A single session for all downloads, so that they share its connection pool.
+    session = http_session(pool_maxsize=options.max_downloads_per_host)
+    session.headers.update(options.http_headers)
 
-    try:
-        while periodic_check():
-            # Pop an item off the front of the queue.
-            try:
-                queued_download = download_queue.popleft()
-            except IndexError:
-                time.sleep(0.1)
-                continue
+    def worker_thread_func() -> None:
+        """Download queued items until shutdown."""
 
-            http_req_descr, local_path = queued_download
+        # Construct a ConditionalDownloader. Unfortunately this is necessary, as
+        # not all its properties can be pickled, and as a result, it cannot be
+        # used to send across process boundaries via the multiprocessing module.
+        downloader = ConditionalDownloader(
+            metadata_provider=options.metadata_provider,
+        )
+        downloader.http_session.close()
+        downloader.http_session = session
+        downloader.add_reporter(reporter)
+        downloader.periodic_check = periodic_check
+        downloader.timeout = options.timeout
+
+        while (queued_download := scheduler.get()) is not None:
+            http_req_descr, local_path, _priority = queued_download
 
             # Try and download it.
             try:
@@ -925,21 +1029,44 @@ def _download_queued_items(
                 # Unexpected errors should really be logged here, as they may
                 # indicate bugs (typos, dependencies not found, etc).
                 log.exception("unexpected error downloading %s: %s", http_req_descr, ex)
+            finally:
+                scheduler.done(queued_download)
+
+    # The RX thread is a daemon thread, as it can be blocked on receiving
+    # messages when the process shuts down.
+    rx_thread = threading.Thread(target=rx_thread_func, daemon=True)
+    tx_thread = threading.Thread(target=tx_thread_func)
+    worker_threads = [
+        threading.Thread(target=worker_thread_func, name="download-worker-{:d}".format(index))
+        for index in range(max(1, options.max_concurrent_downloads))
+    ]
 
+    rx_thread.start()
+    tx_thread.start()
+    for worker_thread in worker_threads:
+        worker_thread.start()
+
+    try:
+        do_shutdown.wait()
     except KeyboardInterrupt:
         log.warning("Keyboard interrupt received, shutting down the downloader process")
         do_shutdown.set()
 
-    try:
-        rx_thread.join(timeout=1.0)
-    except RuntimeError:
-        log.exception("joining RX thread")
+    # Running downloads stop at their next periodic_check() call.
+    scheduler.shutdown()
+    for worker_thread in worker_threads:
+        try:
+            worker_thread.join(timeout=1.0)
+        except RuntimeError:
+            log.exception("joining worker thread")
 
+    reporter.wake()
     try:
         tx_thread.join(timeout=1.0)
     except RuntimeError:
         log.exception("joining TX thread")
 
+    session.close()
     log.debug("download process shutting down")
 
 
@@ -1110,6 +1237,41 @@ class QueueingReporter(DownloadReporter):
         self._queue.append((function_name, function_args))
 
 
+class _BlockingQueueingReporter(QueueingReporter):
+    """QueueingReporter that can be used from multiple threads, and waited on."""
+
+    _calls: queue.SimpleQueue[QueueingReporter.FunctionCall | None]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._calls = queue.SimpleQueue()
+
+    def pop(self) -> QueueingReporter.FunctionCall:
+        """Pops an item off the queue and returns it.
+
+        Raises IndexError if the queue is empty.
+        """
+        try:
+            call = self._calls.get(block=False)
+        except queue.Empty:
+            raise IndexError("pop from an empty queue") from None
+        if call is None:
+            raise IndexError("pop from an empty queue")
+        return call
+
+    def pop_blocking(self) -> QueueingReporter.FunctionCall | None:
+        """Wait for a queued call and return it, or return None after `wake()` was called."""
+        return self._calls.get()
+
+    def wake(self) -> None:
+        """Make a waiting `pop_blocking()` call return None."""
+        self._calls.put(None)
+
+    def _queue_call(self, function_name: str, *function_args: Any) -> None:
+        self._logger.debug("%s%s", function_name, function_args)
+        self._calls.put((function_name, function_args))
+
+
 class MetadataProvider(Protocol):
     """Protocol for the metadata necessary for conditional downloading.
 
@@ -1403,8 +1565,11 @@ class BackgroundProcessNotRunningError(Exception):
     """
 
 
-def http_session() -> requests.Session:
-    """Construct a requests.Session for HTTP requests."""
+def http_session(pool_maxsize: int = requests.adapters.DEFAULT_POOLSIZE) -> requests.Session:
+    """Construct a requests.Session for HTTP requests.
+
+    :param pool_maxsize: maximum number of connections kept open per host.
+    """
 
     # TODO: expose these as function parameters?
     http_retries = urllib3.util.retry.Retry(
@@ -1412,7 +1577,7 @@ def http_session() -> requests.Session:
         backoff_factor=0.05,
     )
     # TODO: add default timeouts as well?
-    http_adapter = requests.adapters.HTTPAdapter(max_retries=http_retries)
+    http_adapter = requests.adapters.HTTPAdapter(max_retries=http_retries, pool_maxsize=pool_maxsize)
     session = requests.session()
     session.mount("https://", http_adapter)
     session.mount("http://", http_adapter)
@@ -128,6 +128,13 @@ def get_console(console_id):
 
         consoles[console_id] = console, stdout, stderr
 
+        # Index the modules which can be imported, so auto-completing imports doesn't stall.
+        import os
+        from _bl_console_utils.autocomplete import complete_import
+        complete_import.module_index_update_in_background(
+            os.path.join(bpy.utils.user_resource('CONFIG'), "console-modules.json"),
+        )
+
     return console, stdout, stderr
 
 
@@ -25,6 +25,10 @@ error_encoding = False
 error_duplicates = []
 addons_fake_modules = {}
 
+# Meta-data of add-ons stored on disk, see `_addons_meta_cache_ensure`.
+# `{mod_path: (mod_name, metadata_time, metadata_size, mod_time, bl_info), ...}`
+_addons_meta_cache = None
+
 # Global cached extensions, set before loading extensions on startup.
 # `{addon_module_name: "Reason for incompatibility", ...}`
 _extensions_incompatible = {}
@@ -192,9 +196,14 @@ def modules_refresh(*, module_cache=addons_fake_modules):
 
     modules_stale = set(module_cache.keys())
 
+    meta_cache = _addons_meta_cache_ensure()
+    meta_cache_stale = set(meta_cache.keys())
+    meta_cache_changed = False
+
     for path, pkg_id in _paths_with_extension_repos():
         for mod_name, mod_path in _bpy.path.module_names(path, package=pkg_id):
             modules_stale.discard(mod_name)
+            meta_cache_stale.discard(mod_path)
             mod = module_cache.get(mod_name)
             if mod is not None:
                 if mod.__file__ != mod_path:
@@ -215,10 +224,18 @@ def modules_refresh(*, module_cache=addons_fake_modules):
                     mod = None
 
             if mod is None:
-                mod = _fake_module(
-                    mod_name,
-                    mod_path,
-                )
+                # Only parse the add-on when its meta-data can't be taken from the cache.
+                metadata_stat = _addons_meta_cache_stat(mod_name, mod_path)
+                mod = _fake_module_from_meta_cache(mod_name, mod_path, metadata_stat, meta_cache)
+                if mod is None:
+                    mod = _fake_module(
+                        mod_name,
+                        mod_path,
+                    )
+                    if mod and (metadata_stat is not None):
+                        # Copy as `module_bl_info` adds its defaults to the modules `bl_info`.
+                        meta_cache[mod_path] = (mod_name, *metadata_stat, mod.__time__, dict(mod.bl_info))
+                        meta_cache_changed = True
                 if mod:
                     module_cache[mod_name] = mod
 
@@ -227,6 +244,16 @@ def modules_refresh(*, module_cache=addons_fake_modules):
         del module_cache[mod_stale]
     del modules_stale
 
+    # Add-ons which were removed (or are no longer in an enabled repository).
+    if meta_cache_stale:
+        for mod_path in meta_cache_stale:
+            del meta_cache[mod_path]
+        meta_cache_changed = True
+    del meta_cache_stale
+
+    if meta_cache_changed:
+        _addons_meta_cache_write(meta_cache)
+
 
 def modules(*, module_cache=addons_fake_modules, refresh=True):
     if refresh or ((module_cache is addons_fake_modules) and modules._is_first):
@@ -248,6 +275,133 @@ def modules(*, module_cache=addons_fake_modules, refresh=True):
 modules._is_first = True
 
 
+# -----------------------------------------------------------------------------
+# Add-on Meta-Data Cache
+#
+# Notes:
+# - Reading the `bl_info` of every add-on (and the manifest of every extension)
+#   is slow with many add-ons, especially on network storage.
+#   Store the meta-data on disk so new Blender processes can list add-ons without parsing them.
+# - Entries are validated using the time-stamp & size of the file the meta-data was read from
+#   (the add-on itself or the extensions manifest), so this costs a single `stat` per add-on.
+# - Failure to load will simply ignore the file and regenerate the file as needed.
+# - File locking isn't used, when multiple Blender instances write the cache at the same time,
+#   the file written last is used (which is always complete as it's renamed into place).
+#
+# Format:
+#
+# - The cache is ZLIB compressed pickled Python dictionary.
+# - The dictionary keys are as follows:
+#   `"blender": (bpy.app.version, python_version, magic_number)`
+#   `"modules": {mod_path: (mod_name, metadata_time, metadata_size, mod_time, bl_info), ...}`
+#
+
+# Increment when the meta-data extracted by `_fake_module` changes.
+_addons_meta_cache_magic = 1
+
+
+def _addons_meta_cache_filepath():
+    import os
+    return os.path.join(_bpy.utils.user_resource('CONFIG'), "addons-meta.dat")
+
+
+def _addons_meta_cache_blender_id():
+    import sys
+    return (_bpy.app.version, sys.version_info[0:2], _addons_meta_cache_magic)
+
+
+def _addons_meta_cache_ensure():
+    # Load the cache once, it's kept up to date by `modules_refresh` afterwards.
+    global _addons_meta_cache
+    if _addons_meta_cache is None:
+        _addons_meta_cache = _addons_meta_cache_read()
+    return _addons_meta_cache
+
+
+def _addons_meta_cache_read():
+    filepath = _addons_meta_cache_filepath()
+    try:
+        cache_data = _pickle_zlib_file_read(filepath)
+    except FileNotFoundError:
+        return {}
+    except Exception as ex:
+        print("Error reading add-on meta-data cache:", repr(filepath), str(ex))
+        return {}
+
+    if type(cache_data) is not dict or cache_data.get("blender") != _addons_meta_cache_blender_id():
+        return {}
+    if type(meta_cache := cache_data.get("modules")) is not dict:
+        return {}
+    return meta_cache
+
+
+def _addons_meta_cache_write(meta_cache):
+    import os
+
+    filepath = _addons_meta_cache_filepath()
+    # Don't create the users configuration directory as a side effect of listing add-ons.
+    if not os.path.isdir(os.path.dirname(filepath)):
+        return
+
+    # Write to a temporary file first, so other Blender instances never read a partially written cache.
+    filepath_temp = "{:s}.{:d}.tmp".format(filepath, os.getpid())
+    try:
+        _pickle_zlib_file_write(filepath_temp, {
+            "blender": _addons_meta_cache_blender_id(),
+            "modules": meta_cache,
+        })
+        os.replace(filepath_temp, filepath)
+    except Exception as ex:
+        print("Error writing add-on meta-data cache:", repr(filepath), str(ex))
+        try:
+            os.remove(filepath_temp)
+        except OSError:
+            pass
+
+
+def _addons_meta_cache_stat(mod_name, mod_path):
+    # Return the `(time, size)` of the file the add-ons meta-data is read from, None when it can't be accessed.
+    import os
+
+    if mod_name.startswith(_ext_base_pkg_idname_with_dot):
+        metadata_path = os.path.join(os.path.dirname(mod_path), _ext_manifest_filename_toml)
+    else:
+        metadata_path = mod_path
+    try:
+        statinfo = os.stat(metadata_path)
+    except OSError:
+        return None
+    return statinfo.st_mtime, statinfo.st_size
+
+
+def _fake_module_from_meta_cache(mod_name, mod_path, metadata_stat, meta_cache):
+    # Return a fake module from the cached meta-data or None when the cache is out of date.
+    import os
+
+    if metadata_stat is None:
+        return None
+    if (entry := meta_cache.get(mod_path)) is None:
+        return None
+    cache_mod_name, cache_metadata_time, cache_metadata_size, cache_mod_time, cache_bl_info = entry
+    if (cache_mod_name, cache_metadata_time, cache_metadata_size) != (mod_name, *metadata_stat):
+        return None
+
+    if _bpy.app.debug_python:
+        print("fake_module (cached)", mod_path, mod_name)
+
+    ModuleType = type(os)
+    mod = ModuleType(mod_name)
+    # Copy as `module_bl_info` adds its defaults to the modules `bl_info`.
+    mod.bl_info = dict(cache_bl_info)
+    mod.__file__ = mod_path
+    mod.__time__ = cache_mod_time
+
+    if mod_name.startswith(_ext_base_pkg_idname_with_dot):
+        mod.__file_manifest__ = os.path.join(os.path.dirname(mod_path), _ext_manifest_filename_toml)
+        mod.__time_manifest__ = cache_metadata_time
+    return mod
+
+
 def check(module_name):
     """
     Returns the loaded state of the addon.
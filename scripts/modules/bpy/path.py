@@ -379,7 +379,13 @@ def module_names(path, *, recursive=False, package=""):
 
     package_prefix = (package + ".") if package else ""
 
-    for filename in sorted(_os.listdir(path)):
+    # Use `scandir` so the entry type is known without a `stat` call for every entry,
+    # only directories need to be checked for an `__init__.py`.
+    with _os.scandir(path) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+
+    for entry in entries:
+        filename = entry.name
         if (filename == "modules") and (not package_prefix):
             pass  # XXX, hard coded exception.
         elif filename.endswith(".py") and filename != "__init__.py":
@@ -387,6 +393,8 @@ def module_names(path, *, recursive=False, package=""):
             modules.append((package_prefix + filename[0:-3], fullpath))
         elif not filename.startswith("."):
             # Skip hidden files since they are used for version control.
+            if not entry.is_dir():
+                continue
             directory = join(path, filename)
             fullpath = join(directory, "__init__.py")
             if isfile(fullpath):
@@ -31,52 +31,60 @@ def mesh_linked_uv_islands(mesh):
             "Use bmesh and bpy_extras.bmesh_utils.bmesh_linked_uv_islands instead."
         )
 
-    uv_loops = [luv.uv[:] for luv in mesh.uv_layers.active.data]
-    poly_loops = [poly.loop_indices for poly in mesh.polygons]
+    from array import array
+
+    polys_len = len(mesh.polygons)
+    loop_starts = array('i', [0]) * polys_len
+    loop_totals = array('i', [0]) * polys_len
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+
+    uv_layer_data = mesh.uv_layers.active.data
+    uv_coords = array('f', [0.0]) * (len(uv_layer_data) * 2)
+    uv_layer_data.foreach_get("uv", uv_coords)
+
+    # Loops with the same UV coordinate share a hub,
+    # each hub holds the polygons using that coordinate.
     luv_hash = {}
-    luv_hash_get = luv_hash.get
-    luv_hash_ls = [None] * len(uv_loops)
-    for pi, poly_indices in enumerate(poly_loops):
-        for li in poly_indices:
-            uv = uv_loops[li]
-            uv_hub = luv_hash_get(uv)
-            if uv_hub is None:
-                uv_hub = luv_hash[uv] = [pi]
+    luv_hash_setdefault = luv_hash.setdefault
+    hub_polys = []
+    loop_hub = [0] * len(uv_layer_data)
+    for pi in range(polys_len):
+        loop_start = loop_starts[pi]
+        for li in range(loop_start, loop_start + loop_totals[pi]):
+            hub_index = luv_hash_setdefault((uv_coords[li * 2], uv_coords[li * 2 + 1]), len(hub_polys))
+            if hub_index == len(hub_polys):
+                hub_polys.append([pi])
             else:
-                uv_hub.append(pi)
-            luv_hash_ls[li] = uv_hub
+                hub_polys[hub_index].append(pi)
+            loop_hub[li] = hub_index
+    del luv_hash
 
     poly_islands = []
 
-    # 0 = none, 1 = added, 2 = searched
-    poly_tag = [0] * len(poly_loops)
-
-    while True:
-        poly_index = -1
-        for i in range(len(poly_loops)):
-            if poly_tag[i] == 0:
-                poly_index = i
-                break
-
-        if poly_index != -1:
-            island = [poly_index]
-            poly_tag[poly_index] = 1
-            poly_islands.append(island)
-        else:
-            break  # we're done
-
-        added = True
-        while added:
-            added = False
-            for poly_index in island[:]:
-                if poly_tag[poly_index] == 1:
-                    for li in poly_loops[poly_index]:
-                        for poly_index_shared in luv_hash_ls[li]:
-                            if poly_tag[poly_index_shared] == 0:
-                                added = True
-                                poly_tag[poly_index_shared] = 1
-                                island.append(poly_index_shared)
-                    poly_tag[poly_index] = 2
+    poly_tag = [False] * polys_len
+    hub_tag = [False] * len(hub_polys)
+
+    for poly_index in range(polys_len):
+        if poly_tag[poly_index]:
+            continue
+
+        island = [poly_index]
+        poly_tag[poly_index] = True
+        poly_islands.append(island)
+
+        # The island grows while iterating over it, so all polygons are visited in the order they were added.
+        for poly_index_island in island:
+            loop_start = loop_starts[poly_index_island]
+            for li in range(loop_start, loop_start + loop_totals[poly_index_island]):
+                hub_index = loop_hub[li]
+                if hub_tag[hub_index]:
+                    continue
+                hub_tag[hub_index] = True
+                for poly_index_shared in hub_polys[hub_index]:
+                    if not poly_tag[poly_index_shared]:
+                        poly_tag[poly_index_shared] = True
+                        island.append(poly_index_shared)
 
     return poly_islands
 
@@ -92,49 +100,47 @@ def mesh_linked_triangles(mesh):
     :rtype: list[list[:class:`bpy.types.MeshLoopTriangle`]]
     """
 
-    # Build vert face connectivity
-    vert_tris = [[] for i in range(len(mesh.vertices))]
-    for t in mesh.loop_triangles:
-        for v in t.vertices:
-            vert_tris[v].append(t)
-
-    # sort triangles into connectivity groups
-    tri_groups = [[t] for t in mesh.loop_triangles]
-    # map old, new tri location
-    tri_mapping = list(range(len(mesh.loop_triangles)))
-
-    # Now clump triangles iteratively
-    ok = True
-    while ok:
-        ok = False
-
-        for t in mesh.loop_triangles:
-            mapped_index = tri_mapping[t.index]
-            mapped_group = tri_groups[mapped_index]
-
-            for v in t.vertices:
-                for nxt_t in vert_tris[v]:
-                    if nxt_t != t:
-                        nxt_mapped_index = tri_mapping[nxt_t.index]
-
-                        # We are not a part of the same group
-                        if mapped_index != nxt_mapped_index:
-                            ok = True
-
-                            # Assign mapping to this group so they
-                            # all map to this group
-                            for grp_t in tri_groups[nxt_mapped_index]:
-                                tri_mapping[grp_t.index] = mapped_index
-
-                            # Move triangles into this group
-                            mapped_group.extend(tri_groups[nxt_mapped_index])
-
-                            # remove reference to the list
-                            tri_groups[nxt_mapped_index] = None
+    from array import array
+
+    loop_triangles = mesh.loop_triangles[:]
+    tris_len = len(loop_triangles)
+    tri_verts = array('i', [0]) * (tris_len * 3)
+    mesh.loop_triangles.foreach_get("vertices", tri_verts)
+
+    # Union triangles sharing a vertex, using the first triangle found for each vertex.
+    tri_parent = list(range(tris_len))
+    vert_tri = [-1] * len(mesh.vertices)
+
+    def tri_root(t):
+        while tri_parent[t] != t:
+            tri_parent[t] = t = tri_parent[tri_parent[t]]
+        return t
+
+    for i, v in enumerate(tri_verts):
+        t = i // 3
+        t_other = vert_tri[v]
+        if t_other == -1:
+            vert_tri[v] = t
+            continue
+        t_root = tri_root(t)
+        t_other_root = tri_root(t_other)
+        if t_root != t_other_root:
+            # Keep the lowest index as root, so groups are ordered by their first triangle.
+            if t_root < t_other_root:
+                tri_parent[t_other_root] = t_root
+            else:
+                tri_parent[t_root] = t_other_root
+
+    # Lists of triangles that are connected, in order of their first triangle.
+    tri_groups = {}
+    for t, tri in enumerate(loop_triangles):
+        t_root = tri_root(t)
+        if t_root == t:
+            tri_groups[t] = [tri]
+        else:
+            tri_groups[t_root].append(tri)
 
-    # return all tri groups that are not null
-    # this is all the triangles that are connected in their own lists.
-    return [tg for tg in tri_groups if tg]
+    return list(tri_groups.values())
 
 
 def edge_face_count_dict(mesh):
@@ -186,54 +192,82 @@ def edge_loops_from_edges(mesh, edges=None):
     :return: A list of edge loops, each a list of vertex indices.
     :rtype: list[list[int]]
     """
-    line_polys = []
+    from array import array
+    from bisect import bisect_left
 
-    # Get edges not used by a face
     if edges is None:
-        edges = mesh.edges
+        edge_verts_flat = array('i', [0]) * (len(mesh.edges) * 2)
+        mesh.edges.foreach_get("vertices", edge_verts_flat)
+        edge_verts = list(zip(edge_verts_flat[0::2], edge_verts_flat[1::2]))
+        del edge_verts_flat
+    else:
+        edge_verts = [tuple(ed.vertices) for ed in edges]
+
+    # Ordered indices of the remaining edges using each vertex.
+    vert_edges = {}
+    for i, (v1, v2) in enumerate(edge_verts):
+        vert_edges.setdefault(v1, []).append(i)
+        if v2 != v1:
+            vert_edges.setdefault(v2, []).append(i)
+
+    edge_used = [False] * len(edge_verts)
+
+    def edge_use(i):
+        edge_used[i] = True
+        for v in set(edge_verts[i]):
+            v_edges = vert_edges[v]
+            del v_edges[bisect_left(v_edges, i)]
+
+    def edge_find_before(i, v1, v2):
+        # The last remaining edge before `i` using either vertex.
+        i_found = -1
+        for v in (v1, v2):
+            v_edges = vert_edges[v]
+            k = bisect_left(v_edges, i)
+            if k:
+                i_found = max(i_found, v_edges[k - 1])
+        return i_found
+
+    line_polys = []
 
-    if not hasattr(edges, "pop"):
-        edges = edges[:]
+    # Edges are taken from the end, further edges are searched for from the end too (to give the same loops
+    # as searching through the list of remaining edges). Vertices are added to one of the lists depending on
+    # the side of the loop they're added to.
+    i_current = len(edge_verts)
+    while True:
+        i_current -= 1
+        while i_current >= 0 and edge_used[i_current]:
+            i_current -= 1
+        if i_current < 0:
+            break
 
-    while edges:
-        current_edge = edges.pop()
-        vert_end, vert_start = current_edge.vertices[:]
-        line_poly = [vert_start, vert_end]
+        edge_use(i_current)
+        vert_end, vert_start = edge_verts[i_current]
+        line_poly_start = [vert_start]
+        line_poly_end = [vert_end]
 
         ok = True
         while ok:
             ok = False
-            # for i, ed in enumerate(edges):
-            i = len(edges)
-            while i:
-                i -= 1
-                ed = edges[i]
-                v1, v2 = ed.vertices
+            i = i_current
+            while (i := edge_find_before(i, vert_end, vert_start)) != -1:
+                edge_use(i)
+                v1, v2 = edge_verts[i]
                 if v1 == vert_end:
-                    line_poly.append(v2)
-                    vert_end = line_poly[-1]
-                    ok = 1
-                    del edges[i]
-                    # break
+                    line_poly_end.append(v2)
+                    vert_end = v2
                 elif v2 == vert_end:
-                    line_poly.append(v1)
-                    vert_end = line_poly[-1]
-                    ok = 1
-                    del edges[i]
-                    # break
+                    line_poly_end.append(v1)
+                    vert_end = v1
                 elif v1 == vert_start:
-                    line_poly.insert(0, v2)
-                    vert_start = line_poly[0]
-                    ok = 1
-                    del edges[i]
-                    # break
-                elif v2 == vert_start:
-                    line_poly.insert(0, v1)
-                    vert_start = line_poly[0]
-                    ok = 1
-                    del edges[i]
-                    # break
-        line_polys.append(line_poly)
+                    line_poly_start.append(v2)
+                    vert_start = v2
+                else:
+                    line_poly_start.append(v1)
+                    vert_start = v1
+                ok = True
+        line_poly_start.reverse()
+        line_polys.append(line_poly_start + line_poly_end)
 
     return line_polys
 
@@ -101,9 +101,207 @@ import bpy
 if bpy.app.build_options.freestyle:
     _modules.append("properties_freestyle")
 
-__import__(name=__name__, fromlist=_modules)
+
+# -----------------------------------------------------------------------------
+# Lazy Loading
+#
+# Importing & registering all user interface modules is slow and only useful when they are drawn.
+# When `$BLENDER_LAZY_UI` is set in background mode, modules which only define user interface types
+# are imported & registered once one of their types is accessed from `bpy.types`.
+#
+# Notes:
+# - Modules defining operators are always loaded as operators can be called by name
+#   without accessing `bpy.types`.
+# - The tool-system modules are always loaded as tools are looked up from their classes
+#   (see `ToolSelectPanelHelper.__subclasses__()`) and from C code, without accessing `bpy.types`.
+# - Operators looking up menus & panels by name from C code (`wm.call_menu` for example)
+#   load the module defining the type they look up when called from `bpy.ops`, see `_lazy_ops_type_name_props`.
+# - Accessing a type which isn't found in the sources (created at run-time for example)
+#   loads all remaining modules.
+# - Other look-ups by name from C code which don't access `bpy.types` are not handled,
+#   these only happen when drawing the user interface, which background mode doesn't do.
+
+# Modules which are never loaded lazily.
+_modules_lazy_exclude = {
+    "space_toolsystem_common",
+    "space_toolsystem_toolbar",
+}
+
+# Operators which look up user interface types by name from C code:
+# `{(ops_module, ops_function): property_name, ...}`.
+_lazy_ops_type_name_props = {
+    ("wm", "call_menu"): "name",
+    ("wm", "call_menu_pie"): "name",
+    ("wm", "call_panel"): "name",
+    ("wm", "call_asset_shelf_popover"): "name",
+    ("wm", "search_single_menu"): "menu_idname",
+}
+
+
+def _lazy_registry_from_source(module_names):
+    # Return `{type_name: module_name, ...}` for modules which can be loaded lazily.
+    # Scanning the source is much faster than importing the modules.
+    import os
+    import re
+
+    re_class = re.compile(r"^class\s+(\w+)\(([^)]*)\)", re.MULTILINE)
+    re_idname = re.compile(r"^\s+bl_idname\s*=\s*[\"'](\w+)[\"']", re.MULTILINE)
+
+    dirpath = os.path.dirname(__file__)
+    registry = {}
+    for module_name in module_names:
+        try:
+            with open(os.path.join(dirpath, module_name + ".py"), "r", encoding="utf-8") as fh:
+                data = fh.read()
+        except OSError:
+            continue
+
+        class_items = re_class.findall(data)
+        if any("Operator" in bases for _name, bases in class_items):
+            continue
+        for name, _bases in class_items:
+            registry[name] = module_name
+        for name in re_idname.findall(data):
+            registry[name] = module_name
+    return registry
+
+
+def _lazy_load(module_names):
+    import importlib
+    from bpy.utils import register_class
+
+    for module_name in module_names:
+        try:
+            _modules_lazy.remove(module_name)
+        except ValueError:
+            continue
+
+        if bpy.app.debug_python:
+            print("bl_ui: lazy loading", repr(module_name))
+        try:
+            mod = importlib.import_module("." + module_name, __name__)
+            _modules_loaded.append(mod)
+            for cls in mod.classes:
+                register_class(cls)
+        except Exception:
+            import traceback
+            traceback.print_exc()
+
+    if not _modules_lazy:
+        _lazy_hooks_remove()
+
+
+def _lazy_types_getattr(name):
+    # Replaces `bpy.types.__getattr__` while there are modules to load.
+    try:
+        return _lazy_types_getattr_orig(name)
+    except AttributeError:
+        # Private names are only used for introspection, never load modules for them.
+        if name.startswith("_") or (not _modules_lazy):
+            raise
+
+    if (module_name := _lazy_registry.get(name)) is not None:
+        _lazy_load((module_name,))
+        try:
+            return _lazy_types_getattr_orig(name)
+        except AttributeError:
+            pass
+
+    _lazy_load(_modules_lazy.copy())
+    return _lazy_types_getattr_orig(name)
+
+
+class _LazyOpsCallable:
+    # Wraps an operator function, loading the type it looks up by name before calling it.
+    __slots__ = (
+        "_op",
+        "_prop",
+    )
+
+    def __init__(self, op, prop):
+        self._op = op
+        self._prop = prop
+
+    def __call__(self, *args, **kw):
+        if _modules_lazy and (name := kw.get(self._prop)):
+            getattr(bpy.types, name, None)
+        return self._op(*args, **kw)
+
+    def __getattr__(self, attr):
+        return getattr(self._op, attr)
+
+    def __repr__(self):
+        return repr(self._op)
+
+    def __str__(self):
+        return str(self._op)
+
+
+def _lazy_ops_submodule_getattr(module, func):
+    # Replaces `bpy.ops._bpy_ops_submodule__getattr__` while there are modules to load.
+    op = _lazy_ops_submodule_getattr_orig(module, func)
+    if (prop := _lazy_ops_type_name_props.get((module, func))) is not None:
+        op = _LazyOpsCallable(op, prop)
+    return op
+
+
+def _lazy_register_class(cls):
+    # Replaces `bpy.utils.register_class` while there are modules to load,
+    # since add-ons may register sub-panels of panels which have not been loaded yet.
+    if parent_id := getattr(cls, "bl_parent_id", ""):
+        getattr(bpy.types, parent_id, None)
+    _lazy_register_class_orig(cls)
+
+
+_lazy_types_getattr_orig = None
+_lazy_ops_submodule_getattr_orig = None
+_lazy_register_class_orig = None
+
+
+def _lazy_hooks_install():
+    global _lazy_types_getattr_orig, _lazy_ops_submodule_getattr_orig, _lazy_register_class_orig
+    if bpy.types.__getattr__ is not _lazy_types_getattr:
+        _lazy_types_getattr_orig = bpy.types.__getattr__
+        bpy.types.__getattr__ = _lazy_types_getattr
+    if bpy.ops._bpy_ops_submodule__getattr__ is not _lazy_ops_submodule_getattr:
+        _lazy_ops_submodule_getattr_orig = bpy.ops._bpy_ops_submodule__getattr__
+        bpy.ops._bpy_ops_submodule__getattr__ = _lazy_ops_submodule_getattr
+    if bpy.utils.register_class is not _lazy_register_class:
+        _lazy_register_class_orig = bpy.utils.register_class
+        bpy.utils.register_class = _lazy_register_class
+
+
+def _lazy_hooks_remove():
+    # NOTE: the replacement functions must keep working after removal
+    # as add-ons may have imported them.
+    if bpy.types.__getattr__ is _lazy_types_getattr:
+        bpy.types.__getattr__ = _lazy_types_getattr_orig
+    if bpy.ops._bpy_ops_submodule__getattr__ is _lazy_ops_submodule_getattr:
+        bpy.ops._bpy_ops_submodule__getattr__ = _lazy_ops_submodule_getattr_orig
+    if bpy.utils.register_class is _lazy_register_class:
+        bpy.utils.register_class = _lazy_register_class_orig
+
+
+def __getattr__(name):
+    # Lazily loaded modules can be accessed as attributes of this package (without registering their types).
+    if name in _modules_lazy:
+        import importlib
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+# `{type_name: module_name, ...}` for the types of lazily loaded modules.
+_lazy_registry = (
+    _lazy_registry_from_source([name for name in _modules if name not in _modules_lazy_exclude])
+    if (bpy.app.background and __import__("os").environ.get("BLENDER_LAZY_UI")) else
+    {}
+)
+# Names of modules which have not been loaded yet.
+_modules_lazy = [name for name in _modules if name in set(_lazy_registry.values())]
+
+__import__(name=__name__, fromlist=[name for name in _modules if name not in _modules_lazy])
 _namespace = globals()
-_modules_loaded = [_namespace[name] for name in _modules]
+_modules_loaded = [_namespace[name] for name in _modules if name not in _modules_lazy]
 del _namespace
 
 
@@ -115,7 +313,14 @@ def translation_update(_):
 
 
 def register():
+    if _modules_lazy:
+        _lazy_hooks_install()
+
     from bpy.utils import register_class
+    from . import (
+        properties_paint_common,
+        space_filebrowser,
+    )
     for cls in classes:
         register_class(cls)
     for mod in _modules_loaded:
@@ -186,6 +391,7 @@ def register():
 
 def unregister():
     from bpy.utils import unregister_class
+    from . import properties_paint_common
 
     properties_paint_common.unregister()
 
@@ -202,6 +408,8 @@ def unregister():
     except ValueError:
         pass
 
+    _lazy_hooks_remove()
+
 # Define a default UIList, when a list does not need any custom drawing...
 # Keep in sync with its #defined name in UI_interface.hh
 
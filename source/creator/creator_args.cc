@@ -898,6 +898,8 @@ static void print_help(bArgs *ba, bool all)
   PRINT("  $BLENDER_CUSTOM_SPLASH     Full path to an image that replaces the splash screen.\n");
   PRINT(
       "  $BLENDER_CUSTOM_SPLASH_BANNER Full path to an image to overlay on the splash screen.\n");
+  PRINT(
+      "  $BLENDER_LAZY_UI           Load interface scripts on demand (background mode only).\n");
 
   if (defs.with_opencolorio) {
     PRINT(
@@ -91,6 +91,24 @@ class SQLiteBackendTest(unittest.TestCase):
         self.assertEqual(hash_info_1, cached_info_1)
         self.assertEqual(hash_info_2, cached_info_2)
 
+    def test_store_fetch_multiple_files(self) -> None:
+        hash_infos = [
+            (Path(f"file-{index}.blend"), types.FileHashInfo(
+                hexhash=f"hash {index}",
+                file_size_bytes=index,
+                file_stat_mtime=47.327 + index,
+            ))
+            for index in range(2000)  # More than fit in a single SQLite query.
+        ]
+        self.backend.store_hashes(hash_infos, "sha256")
+
+        filepaths = [filepath for filepath, _ in hash_infos] + [Path("unknown-file.blend")]
+        fetched_infos = self.backend.fetch_hashes(filepaths, "sha256")
+        self.assertEqual(dict(hash_infos), fetched_infos)
+
+        # Other hash algorithms should not be returned.
+        self.assertEqual({}, self.backend.fetch_hashes(filepaths, "sha1"))
+
     def test_mark_as_fresh(self) -> None:
         # Monkeypatch the backend so that it thinks it's the past, so that the hash we store is back-dated.
         orig_now = self.backend._now
@@ -118,6 +136,30 @@ class SQLiteBackendTest(unittest.TestCase):
         cached_hash_info = self.backend.fetch_hash(filepath, "sha256")
         self.assertEqual(fake_hash_info, cached_hash_info)
 
+    def test_mark_multiple_as_fresh(self) -> None:
+        # Monkeypatch the backend so that it thinks it's the past, so that the hash we store is back-dated.
+        orig_now = self.backend._now
+        self.backend._now = lambda: datetime.datetime(
+            year=2024, month=1, day=1, hour=0, minute=0, second=0, tzinfo=datetime.timezone.utc)
+
+        fake_hash_info = types.FileHashInfo(
+            hexhash="fake hash",
+            file_size_bytes=100,
+            file_stat_mtime=47.327,
+        )
+        filepaths = [Path("old-file-1.blend"), Path("old-file-2.blend"), Path("old-file-3.blend")]
+        self.backend.store_hashes(((filepath, fake_hash_info) for filepath in filepaths), "sha256")
+
+        # Restore the 'now' function for the backend.
+        self.backend._now = orig_now
+
+        # Mark only the first two hashes as 'fresh', and remove outdated hashes.
+        self.backend.mark_hashes_as_fresh(filepaths[:2], "sha256")
+        self.backend.remove_older_than(days=5)
+
+        cached_infos = self.backend.fetch_hashes(filepaths, "sha256")
+        self.assertEqual({filepaths[0]: fake_hash_info, filepaths[1]: fake_hash_info}, cached_infos)
+
     def test_remove_older_than(self) -> None:
         # Monkeypatch the backend so that it thinks it's the past, so that the hash we store is back-dated.
         orig_now = self.backend._now
@@ -292,6 +334,73 @@ class DiskFileHashServiceTest(unittest.TestCase):
         assert backend_info is not None
         self.assertEqual("43231d711ce5992cd9090ffa5cbb8779148e291bc1472353cdeebd040bef0b93", backend_info.hexhash)
 
+    def test_get_hashes(self) -> None:
+        other_path = self.filepath.with_stem("other-file-to-hash")
+        other_path.write_text("New Content 😿")
+
+        # Tell the back-end to store a fake hash, which is still fresh.
+        stat = self.filepath.stat()
+        self.backend.store_hash(self.filepath, "sha256", types.FileHashInfo(
+            hexhash="fake hash", file_size_bytes=stat.st_size, file_stat_mtime=stat.st_mtime))
+
+        hashes = self.service.get_hashes([self.filepath, other_path], "sha256")
+        self.assertEqual({
+            self.filepath: "fake hash",
+            other_path: "49a02e79cb4c68a5f1626d34a05a021b60cbd0b22f9485dcd4026ab3e9201b5a",
+        }, hashes)
+
+        # The hash of the other file should have been stored.
+        backend_info = self.backend.fetch_hash(other_path, "sha256")
+        assert backend_info is not None
+        self.assertEqual("49a02e79cb4c68a5f1626d34a05a021b60cbd0b22f9485dcd4026ab3e9201b5a", backend_info.hexhash)
+
+        # Non-existent files should be reported in the same way as get_hash() does.
+        with self.assertRaises(FileNotFoundError):
+            self.service.get_hashes([self.filepath, scratch_dir / "nonexistent.txt"], "sha256")
+
+    def test_get_hashes_memory_mapped(self) -> None:
+        orig_mmap_min_size = hash_service.HASH_MMAP_MIN_SIZE
+        hash_service.HASH_MMAP_MIN_SIZE = 1
+        try:
+            hashes = self.service.get_hashes([self.filepath], "sha256")
+        finally:
+            hash_service.HASH_MMAP_MIN_SIZE = orig_mmap_min_size
+        self.assertEqual({self.filepath: "43231d711ce5992cd9090ffa5cbb8779148e291bc1472353cdeebd040bef0b93"}, hashes)
+
+    def test_files_match(self) -> None:
+        other_path = self.filepath.with_stem("other-file-to-hash")
+        other_path.write_text("New Content 😿")
+        other_size = other_path.stat().st_size
+
+        size = self.filepath.stat().st_size
+        matches = self.service.files_match([
+            (self.filepath, "43231d711ce5992cd9090ffa5cbb8779148e291bc1472353cdeebd040bef0b93", size),
+            (other_path, "49a02e79cb4c68a5f1626d34a05a021b60cbd0b22f9485dcd4026ab3e9201b5a", other_size + 5),
+            (other_path, "fake hash", other_size),
+            (scratch_dir / "nonexistent.txt", "fake hash", 0),
+        ], "sha256")
+        self.assertEqual([True, False, False, False], matches)
+
+    def test_files_match_vanishing_file(self) -> None:
+        other_path = self.filepath.with_stem("other-file-to-hash")
+        other_path.write_text("New Content 😿")
+        other_size = other_path.stat().st_size
+        size = self.filepath.stat().st_size
+
+        # Remove the other file after its size has been checked, but before it is hashed.
+        orig_get_hashes = self.service.get_hashes
+
+        def get_hashes_after_unlink(filepaths: list[Path], hash_algorithm: str) -> dict[Path, str]:
+            other_path.unlink()
+            return orig_get_hashes(filepaths, hash_algorithm)
+
+        self.service.get_hashes = get_hashes_after_unlink  # type: ignore[method-assign]
+        matches = self.service.files_match([
+            (self.filepath, "43231d711ce5992cd9090ffa5cbb8779148e291bc1472353cdeebd040bef0b93", size),
+            (other_path, "49a02e79cb4c68a5f1626d34a05a021b60cbd0b22f9485dcd4026ab3e9201b5a", other_size),
+        ], "sha256")
+        self.assertEqual([True, False], matches)
+
     def test_cleanup_on_close(self) -> None:
         # Monkeypatch the backend so that it thinks it's the past, so that the hash we store is back-dated.
         orig_now = self.backend._now
@@ -119,6 +119,70 @@ class BackgroundDownloaderProcessTest(unittest.TestCase):
         self.assertFalse(downloader.is_subprocess_alive)
 
 
+class DownloadSchedulerTest(unittest.TestCase):
+    """Test the ordering of downloads in the background process, without doing any HTTP requests."""
+
+    @staticmethod
+    def _queued(url: str, priority: int, local_path: str = "") -> tuple:
+        from _bpy_internal.http import downloader as http_dl
+
+        http_req_descr = http_dl.RequestDescription(http_method="GET", url=url)
+        return (http_req_descr, output_dir / (local_path or url.rsplit("/", 1)[-1]), priority)
+
+    def test_priorities(self) -> None:
+        from _bpy_internal.http import downloader as http_dl
+
+        scheduler = http_dl._DownloadScheduler(max_downloads_per_host=10)
+        asset = self._queued("https://example.com/asset", http_dl.DownloadPriority.ASSET)
+        preview1 = self._queued("https://example.com/preview1", http_dl.DownloadPriority.PREVIEW)
+        preview2 = self._queued("https://example.com/preview2", http_dl.DownloadPriority.PREVIEW)
+        listing = self._queued("https://example.com/listing", http_dl.DownloadPriority.LISTING)
+        for queued in (asset, preview1, preview2, listing):
+            scheduler.put(queued)
+
+        self.assertEqual([listing, preview1, preview2, asset], [scheduler.get() for _ in range(4)])
+
+    def test_per_host_limit(self) -> None:
+        from _bpy_internal.http import downloader as http_dl
+
+        scheduler = http_dl._DownloadScheduler(max_downloads_per_host=1)
+        first = self._queued("https://example.com/first", http_dl.DownloadPriority.LISTING)
+        second = self._queued("https://example.com/second", http_dl.DownloadPriority.LISTING)
+        other_host = self._queued("https://example.org/other", http_dl.DownloadPriority.ASSET)
+        for queued in (first, second, other_host):
+            scheduler.put(queued)
+
+        self.assertEqual(first, scheduler.get())
+        # example.com is busy, so the lower priority download from another host goes first.
+        self.assertEqual(other_host, scheduler.get())
+        scheduler.done(first)
+        self.assertEqual(second, scheduler.get())
+
+    def test_same_local_path(self) -> None:
+        from _bpy_internal.http import downloader as http_dl
+
+        scheduler = http_dl._DownloadScheduler(max_downloads_per_host=10)
+        first = self._queued("https://example.com/first", http_dl.DownloadPriority.LISTING, "file")
+        second = self._queued("https://example.com/second", http_dl.DownloadPriority.LISTING, "file")
+        other = self._queued("https://example.com/other", http_dl.DownloadPriority.ASSET)
+        for queued in (first, second, other):
+            scheduler.put(queued)
+
+        self.assertEqual(first, scheduler.get())
+        # Never download to the same file simultaneously.
+        self.assertEqual(other, scheduler.get())
+        scheduler.done(first)
+        self.assertEqual(second, scheduler.get())
+
+    def test_shutdown(self) -> None:
+        from _bpy_internal.http import downloader as http_dl
+
+        scheduler = http_dl._DownloadScheduler(max_downloads_per_host=10)
+        scheduler.put(self._queued("https://example.com/file", http_dl.DownloadPriority.ASSET))
+        scheduler.shutdown()
+        self.assertIsNone(scheduler.get())
+
+
 def main() -> None:
     global output_dir
 
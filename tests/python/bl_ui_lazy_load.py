@@ -0,0 +1,75 @@
+# SPDX-FileCopyrightText: 2026 Blender Authors
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# Test user interface types are available when loading `bl_ui` modules on demand,
+# including when they're looked up by name without accessing `bpy.types`.
+#
+# BLENDER_LAZY_UI=1 ./blender.bin --background --python tests/python/bl_ui_lazy_load.py -- --verbose
+
+__all__ = (
+    "main",
+)
+
+import unittest
+
+import bpy
+
+
+def registered_type_names(base):
+    # Types of modules which haven't been loaded yet are not sub-classes of their base.
+    # Unlike `bpy.types`, this doesn't cause modules to be loaded.
+    names = set()
+    classes = [base]
+    while classes:
+        cls = classes.pop()
+        for subcls in cls.__subclasses__():
+            if "bl_rna" in subcls.__dict__:
+                names.add(subcls.__name__)
+                names.add(getattr(subcls, "bl_idname", subcls.__name__))
+            classes.append(subcls)
+    return names
+
+
+class LazyLoadTest(unittest.TestCase):
+
+    def test_lazy_loading_enabled(self):
+        import bl_ui
+        self.assertNotEqual({}, bl_ui._lazy_registry, "Expected $BLENDER_LAZY_UI to be set")
+
+    def test_tool_set_by_id(self):
+        result = bpy.ops.wm.tool_set_by_id(name="builtin.move", space_type='VIEW_3D')
+        self.assertEqual({'FINISHED'}, result)
+        tool = bpy.context.workspace.tools.from_space_view3d_mode(bpy.context.mode)
+        self.assertEqual("builtin.move", tool.idname)
+
+    def test_tool_set_by_id_cycle(self):
+        result = bpy.ops.wm.tool_set_by_id(name="builtin.select_box", space_type='VIEW_3D', cycle=True)
+        self.assertEqual({'FINISHED'}, result)
+
+    def test_call_menu(self):
+        self._test_call_by_name(bpy.ops.wm.call_menu, bpy.types.Menu, "VIEW3D_MT_object")
+
+    def test_call_panel(self):
+        self._test_call_by_name(bpy.ops.wm.call_panel, bpy.types.Panel, "IMAGE_PT_view_display")
+
+    def _test_call_by_name(self, op, base, name):
+        import bl_ui
+        if name not in registered_type_names(base):
+            self.assertIn(bl_ui._lazy_registry.get(name), bl_ui._modules_lazy)
+        try:
+            op(name=name)
+        except RuntimeError:
+            # There is no window in background mode, the type only has to be found.
+            pass
+        self.assertIn(name, registered_type_names(base))
+
+
+def main():
+    import sys
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
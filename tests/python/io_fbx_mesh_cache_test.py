@@ -0,0 +1,64 @@
+# SPDX-FileCopyrightText: 2026 Blender Authors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ./blender.bin --background --python tests/python/io_fbx_mesh_cache_test.py -- --verbose
+
+import os
+import sys
+import tempfile
+import unittest
+
+import bpy
+
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, "scripts", "addons_core"))
+
+from io_scene_fbx.fbx_utils_cache import FBXMeshCache
+
+
+def mesh_from_faces(name, face_sizes):
+    # Build the mesh without edges, so it only differs from others by how corners are grouped into faces.
+    me = bpy.data.meshes.new(name)
+    num_loops = sum(face_sizes)
+    me.vertices.add(num_loops)
+    me.vertices.foreach_set("co", [float(i) for i in range(num_loops * 3)])
+    me.loops.add(num_loops)
+    me.loops.foreach_set("vertex_index", range(num_loops))
+    me.polygons.add(len(face_sizes))
+    loop_starts = []
+    loop_start = 0
+    for face_size in face_sizes:
+        loop_starts.append(loop_start)
+        loop_start += face_size
+    me.polygons.foreach_set("loop_start", loop_starts)
+    me.update()
+    return me
+
+
+class FBXMeshCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = FBXMeshCache(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_mesh_key_face_sizes(self):
+        me_quads = mesh_from_faces("quads", (4, 4))
+        me_tri_pentagon = mesh_from_faces("tri_pentagon", (3, 5))
+        self.assertEqual(len(me_quads.loops), len(me_tri_pentagon.loops))
+        self.assertNotEqual(self.cache.mesh_key(me_quads, ()), self.cache.mesh_key(me_tri_pentagon, ()))
+
+    def test_mesh_key_same_mesh(self):
+        me_a = mesh_from_faces("a", (4, 4))
+        me_b = mesh_from_faces("b", (4, 4))
+        self.assertEqual(self.cache.mesh_key(me_a, ()), self.cache.mesh_key(me_b, ()))
+
+
+def main():
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()